@@ -0,0 +1,24 @@
+import numpy as np
+from numba import njit, prange
+
+@njit(parallel=True, fastmath=True, cache=True)
+def cosmat(X, Y, out):
+    """
+    Write the dot product of every row of X with every row of Y into out
+
+    Embeddings are L2-normalized before they reach here, so this is their cosine similarity.
+
+    Args:
+        X: Job embeddings, shape (n_jobs, dim)
+        Y: Candidate embeddings, shape (n_candidates, dim)
+        out: float32 array of shape (n_jobs, n_candidates) receiving the result
+    """
+    for i in prange(X.shape[0]):
+        for j in range(Y.shape[0]):
+            s = 0.0
+            for k in range(X.shape[1]):
+                s += X[i, k] * Y[j, k]
+            out[i, j] = s
+
+# Compile the float32 kernel at import instead of on the first request
+cosmat(np.zeros((1, 1), dtype=np.float32), np.zeros((1, 1), dtype=np.float32), np.zeros((1, 1), dtype=np.float32))
@@ -1,14 +1,38 @@
-import json
+import orjson
 import os
+import re
+import asyncio
 import logging
-from typing import Dict, List, Optional, Any, Tuple, TypedDict, Annotated, Literal
+import hashlib
+import functools
+from typing import Dict, List, Optional, Any, Tuple, TypedDict, Annotated, Literal, Iterator
 from datetime import datetime, timedelta
 
+import httpx
+import numpy as np
+import requests
+from diskcache import Cache
 from langchain_core.messages import AIMessage, HumanMessage
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
+from langchain_core.exceptions import OutputParserException
+from langchain_core.runnables import RunnableLambda
+from langchain_core.globals import set_llm_cache
+from langchain_community.cache import SQLiteCache
 from langchain_ollama import ChatOllama
-from pydantic import BaseModel, Field
+from ollama import ResponseError
+from pydantic import BaseModel, Field, ValidationError
+
+# SimSIMD is optional; similarity matrices fall back to Numba, then numpy, without it
+try:
+    import simsimd
+except ImportError:
+    simsimd = None
+
+try:
+    from _similarity_numba import cosmat
+except ImportError:
+    cosmat = None
 
 # Import langgraph directly
 import langgraph.graph as graph
@@ -22,9 +46,25 @@ logger = logging.getLogger("recruitment_system")
 DEFAULT_MODEL = "phi4-mini"
 VISION_MODEL = "granite3.2-vision"
 
-def get_chat_model(model_name: str = DEFAULT_MODEL):
-    """Get an Ollama chat model instance"""
-    return ChatOllama(model=model_name)
+# Maximum number of workflow runs in flight for batch methods; keep in line with OLLAMA_NUM_PARALLEL
+RECRUIT_CONCURRENCY = int(os.environ.get("RECRUIT_CONCURRENCY", "8"))
+
+# Stored candidate vectors use half precision: half the memory traffic, ~1e-3 similarity drift
+EMBEDDING_STORAGE_DTYPE = np.float16
+
+# Cache LLM responses so repeated identical prompts skip model inference
+LLM_CACHE_PATH = os.environ.get("LLM_CACHE_PATH", ".langchain_cache.db")
+set_llm_cache(SQLiteCache(database_path=LLM_CACHE_PATH))
+
+# Parsed CVs and job summaries, keyed on a hash of their input so resubmissions skip the workflow
+PARSE_CACHE_DIR = os.environ.get("PARSE_CACHE_DIR", ".parse_cache")
+_PARSE_CACHE = Cache(PARSE_CACHE_DIR)
+
+@functools.lru_cache(maxsize=4)
+def get_chat_model(model_name: str = DEFAULT_MODEL, num_predict: Optional[int] = None):
+    """Get a shared Ollama chat model instance (one client and connection pool per model and output limit)"""
+    # Deterministic sampling keeps cached responses valid for repeated prompts
+    return ChatOllama(model=model_name, temperature=0, num_predict=num_predict)
 
 # Define data models
 class JobSummary(BaseModel):
@@ -41,6 +81,13 @@ class CandidateProfile(BaseModel):
     skills: List[str] = Field(description="List of candidate's skills")
     certifications: List[str] = Field(description="List of certifications")
 
+class CVSection(BaseModel):
+    name: Optional[str] = Field(default=None, description="Candidate's full name, if it appears in this section")
+    education: List[Dict[str, str]] = Field(default_factory=list, description="Education history with institution, degree, field, and years")
+    work_experience: List[Dict[str, str]] = Field(default_factory=list, description="Work experience with company, role, years, and description")
+    skills: List[str] = Field(default_factory=list, description="List of candidate's skills")
+    certifications: List[str] = Field(default_factory=list, description="List of certifications")
+
 class MatchResult(BaseModel):
     score: float = Field(description="Overall match score between 0 and 1")
     skills_match: Dict[str, Any] = Field(description="Skills match details")
@@ -48,6 +95,24 @@ class MatchResult(BaseModel):
     education_match: Dict[str, Any] = Field(description="Education match details")
     explanation: str = Field(description="Explanation of the match score")
 
+class MatchBreakdown(BaseModel):
+    score: float = Field(description="Overall match score between 0 and 1, weighted skills 40%, experience 40%, education 20%")
+    skills_match: Dict[str, Any] = Field(description="Share of required skills the candidate has: score between 0 and 1 and explanation")
+    experience_match: Dict[str, Any] = Field(description="Fit of experience type and years: score between 0 and 1 and explanation")
+    education_match: Dict[str, Any] = Field(description="Fit of education with the job: score between 0 and 1 and explanation")
+    explanation: str = Field(description="Overall explanation of the match result")
+
+class MatchScore(BaseModel):
+    score: float = Field(description="Overall match score between 0 and 1, weighted skills 40%, experience 40%, education 20%")
+
+class MatchBreakdownBatch(BaseModel):
+    results: List[MatchBreakdown] = Field(description="One match breakdown per candidate, in candidate order")
+
+class PreparedJob(BaseModel):
+    job_summary: JobSummary = Field(description="Job details")
+    embedding: Optional[List[float]] = Field(description="Job embedding, None if it is unavailable")
+    prompt_fields: Dict[str, Any] = Field(description="Job fields formatted for the match prompts")
+
 class InterviewSchedule(BaseModel):
     candidate_id: int = Field(description="Candidate ID")
     job_id: int = Field(description="Job ID")
@@ -87,6 +152,7 @@ class MatchingState(TypedDict):
     education_match: Optional[Dict[str, Any]]
     explanation: Optional[str]
     error: Optional[str]
+    prepared_job: Optional[PreparedJob]
 
 # Interview Scheduling Workflow State
 class SchedulingState(TypedDict):
@@ -97,55 +163,82 @@ class SchedulingState(TypedDict):
     email_template: Optional[str]
     error: Optional[str]
 
+# ===== NODE ERRORS =====
+
+# Failures a node reports in its error state: model/API errors and invalid model output.
+# Anything else (bugs, interrupts) propagates instead of being turned into an error result.
+NODE_ERRORS = (httpx.HTTPError, ResponseError, OutputParserException, ValidationError, ValueError)
+
+# The CV node also reads and extracts the uploaded file
+CV_NODE_ERRORS = NODE_ERRORS + (OSError, requests.RequestException)
+
+JD_ERROR = "Error extracting job summary: {}"
+CV_ERROR = "Error parsing CV: {}"
+MATCH_ERROR = "Error calculating match score: {}"
+EMAIL_ERROR = "Error generating email template: {}"
+
 # ===== JOB DESCRIPTION PROCESSING WORKFLOW =====
 
+# Prompts are kept terse: field names and descriptions reach the model through the structured output schema
+JD_TEMPLATE = """Analyze this job description.
+
+Job Title: {title}
+
+Job Description:
+{description}
+
+Return JSON matching the schema.
+"""
+
+# Chains are built once at import and shared by every node invocation
+def _build_chain(template: str, schema: Optional[type] = None, num_predict: Optional[int] = None):
+    """
+    Build a chain for a template
+    
+    Args:
+        template: Prompt template
+        schema: Pydantic model the model output is bound to (plain text if omitted)
+        num_predict: Maximum number of tokens the model may generate (no limit if omitted)
+        
+    Returns:
+        Runnable returning a validated schema instance, or a string
+    """
+    prompt = ChatPromptTemplate.from_template(template)
+    model = get_chat_model(DEFAULT_MODEL, num_predict)
+    if schema is not None:
+        return prompt | model.with_structured_output(schema)
+    return prompt | model | StrOutputParser()
+
+_JD_CHAIN = _build_chain(JD_TEMPLATE, JobSummary)
+
+def _job_summary_update(result: JobSummary) -> Dict[str, Any]:
+    """State update for the JobDescription workflow from the model response"""
+    return {
+        "summary": result.summary,
+        "required_skills": result.required_skills,
+        "required_experience": result.required_experience,
+        "responsibilities": result.responsibilities,
+        "error": None
+    }
+
 # Node functions for JobDescription workflow
-def extract_job_summary(state: JobDescriptionState) -> JobDescriptionState:
+def extract_job_summary(state: JobDescriptionState) -> Dict[str, Any]:
     """Process a job description and extract key information"""
     try:
-        # Create prompt template
-        template = """You are a professional job description analyzer.
-        Extract the key information from the following job description and format it according to the requirements.
-        
-        Job Title: {title}
-        
-        Job Description:
-        {description}
-        
-        Provide a clear analysis focusing on:
-        1. A brief summary of the position
-        2. Required skills (as a list)
-        3. Required experience level and type
-        4. Key responsibilities (as a list)
-        
-        Format your response as a JSON object with these fields: summary, required_skills, required_experience, responsibilities.
-        Make sure all lists are properly formatted as JSON arrays.
-        """
-        
-        prompt = ChatPromptTemplate.from_template(template)
-        model = get_chat_model()
-        chain = prompt | model | StrOutputParser()
-        
-        result = chain.invoke({"title": state["title"], "description": state["description"]})
-        
-        # Parse the JSON response
-        json_result = json.loads(result)
-        
-        # Update state with extracted information
-        return {
-            **state,
-            "summary": json_result.get("summary", ""),
-            "required_skills": json_result.get("required_skills", []),
-            "required_experience": json_result.get("required_experience", ""),
-            "responsibilities": json_result.get("responsibilities", []),
-            "error": None
-        }
-    except Exception as e:
+        result = _JD_CHAIN.invoke({"title": state["title"], "description": state["description"]})
+        return _job_summary_update(result)
+    except NODE_ERRORS as e:
         # Handle errors
-        return {
-            **state,
-            "error": f"Error extracting job summary: {str(e)}"
-        }
+        return {"error": JD_ERROR.format(e)}
+
+async def aextract_job_summary(state: JobDescriptionState) -> Dict[str, Any]:
+    """Async variant of extract_job_summary"""
+    try:
+        result = await _JD_CHAIN.ainvoke({"title": state["title"], "description": state["description"]})
+        return _job_summary_update(result)
+    except NODE_ERRORS as e:
+        # Handle errors
+        return {"error": JD_ERROR.format(e)}
 
 # Create JobDescription workflow using LangGraph StateGraph
 def create_job_description_workflow():
@@ -153,8 +246,8 @@ def create_job_description_workflow():
     # Define workflow using LangGraph StateGraph
     workflow = StateGraph(JobDescriptionState)
     
-    # Add the node
-    workflow.add_node("extract_job_summary", extract_job_summary)
+    # Add the node - the sync and async implementations back the same node
+    workflow.add_node("extract_job_summary", RunnableLambda(extract_job_summary, afunc=aextract_job_summary))
     
     # Define the edge - use END as the target instead of None
     workflow.set_entry_point("extract_job_summary")
@@ -166,71 +259,172 @@ def create_job_description_workflow():
     # Compile the workflow
     return workflow.compile()
 
+# Compiled graphs are stateless and shared by every agent instance
+_JD_WORKFLOW = create_job_description_workflow()
+
 # ===== CV PROCESSING WORKFLOW =====
 
+CV_TEMPLATE = """Extract the candidate's information from this CV.
+
+CV Text:
+{cv_text}
+
+Return JSON matching the schema.
+"""
+
+_CV_CHAIN = _build_chain(CV_TEMPLATE, CandidateProfile)
+
+# Per-section extraction: each call only sees the part of the CV it needs
+CV_SECTION_TEMPLATE = """Extract the candidate's information from this {section} section of a CV.
+
+Section Text:
+{text}
+
+Return JSON matching the schema; leave fields this section does not contain empty.
+"""
+
+_CV_SECTION_CHAIN = _build_chain(CV_SECTION_TEMPLATE, CVSection)
+
+# Number of CV sections extracted in parallel
+CV_SECTION_CONCURRENCY = 4
+
+# Common CV headings and the section they belong to; None marks boilerplate that is not sent to the model
+CV_SECTION_HEADINGS = {
+    "education": "education",
+    "academic background": "education",
+    "qualifications": "education",
+    "work experience": "experience",
+    "professional experience": "experience",
+    "experience": "experience",
+    "employment history": "experience",
+    "employment": "experience",
+    "skills": "skills",
+    "technical skills": "skills",
+    "certifications": "certifications",
+    "certificates": "certifications",
+    "licenses": "certifications",
+    "references": None,
+    "hobbies": None,
+    "interests": None
+}
+
+_CV_HEADING_PATTERN = re.compile(
+    r"^[ \t#*]*(" + "|".join(sorted(CV_SECTION_HEADINGS, key=len, reverse=True)) + r")[ \t]*:?[ \t*]*$",
+    re.IGNORECASE | re.MULTILINE
+)
+
+def split_cv_sections(text: str) -> Dict[str, str]:
+    """
+    Split CV text into sections on common headings
+    
+    Args:
+        text: Full CV text
+        
+    Returns:
+        Dict mapping section name (profile, education, experience, skills,
+        certifications) to its text; the profile section is the text before the
+        first heading. Empty if no heading is found.
+    """
+    headings = list(_CV_HEADING_PATTERN.finditer(text))
+    if not headings:
+        return {}
+    
+    sections: Dict[str, str] = {}
+    preamble = text[:headings[0].start()].strip()
+    if preamble:
+        sections["profile"] = preamble
+    
+    for heading, next_heading in zip(headings, headings[1:] + [None]):
+        section = CV_SECTION_HEADINGS[heading.group(1).lower()]
+        body = text[heading.end():next_heading.start() if next_heading else len(text)].strip()
+        if section is None or not body:
+            continue
+        # Repeated headings are merged into one section
+        sections[section] = f"{sections[section]}\n{body}" if section in sections else body
+    
+    return sections
+
+def _merge_cv_sections(results: List[CVSection]) -> CandidateProfile:
+    """Union the per-section extraction results into one profile"""
+    def unique(items: List[str]) -> List[str]:
+        return list(dict.fromkeys(item for item in items if item))
+    
+    return CandidateProfile(
+        name=next((result.name for result in results if result.name), "Unknown"),
+        education=[entry for result in results for entry in result.education],
+        work_experience=[entry for result in results for entry in result.work_experience],
+        skills=unique([skill for result in results for skill in result.skills]),
+        certifications=unique([cert for result in results for cert in result.certifications])
+    )
+
+def _cv_section_inputs(sections: Dict[str, str]) -> List[Dict[str, str]]:
+    """Prepare the prompt inputs for the section chain"""
+    return [{"section": name, "text": body} for name, body in sections.items()]
+
+def _extract_cv_profile(cv_text: str) -> CandidateProfile:
+    """Extract a profile section by section, or from the whole text if no sections are recognized"""
+    sections = split_cv_sections(cv_text)
+    if not sections:
+        return _CV_CHAIN.invoke({"cv_text": cv_text})
+    
+    results = _CV_SECTION_CHAIN.batch(
+        _cv_section_inputs(sections), config={"max_concurrency": CV_SECTION_CONCURRENCY}
+    )
+    return _merge_cv_sections(results)
+
+async def _aextract_cv_profile(cv_text: str) -> CandidateProfile:
+    """Async variant of _extract_cv_profile"""
+    sections = split_cv_sections(cv_text)
+    if not sections:
+        return await _CV_CHAIN.ainvoke({"cv_text": cv_text})
+    
+    results = await _CV_SECTION_CHAIN.abatch(
+        _cv_section_inputs(sections), config={"max_concurrency": CV_SECTION_CONCURRENCY}
+    )
+    return _merge_cv_sections(results)
+
+def _load_cv_text(state: CVProcessingState) -> str:
+    """Return the CV text from the state, reading it from the CV file if it is not available yet"""
+    if state.get("cv_text"):
+        return state["cv_text"]
+    
+    from utils import extract_text
+    
+    # Every file type is reduced to plain text and goes through the same parsing prompt
+    return extract_text(state["cv_path"], VISION_MODEL)
+
+def _cv_profile_update(cv_text: str, result: CandidateProfile) -> Dict[str, Any]:
+    """State update for the CV Processing workflow from the model response"""
+    return {
+        "cv_text": cv_text,
+        "name": result.name,
+        "education": result.education,
+        "work_experience": result.work_experience,
+        "skills": result.skills,
+        "certifications": result.certifications,
+        "error": None
+    }
+
 # Node functions for CV Processing workflow
-def parse_cv_text(state: CVProcessingState) -> CVProcessingState:
+def parse_cv_text(state: CVProcessingState) -> Dict[str, Any]:
     """Parse CV text to extract candidate information"""
     try:
-        # If cv_text is not available yet, attempt to extract it
-        if "cv_text" not in state or not state["cv_text"]:
-            cv_path = state["cv_path"]
-            
-            # For text files, read and process the content
-            if cv_path.lower().endswith(('.txt', '.docx')):
-                with open(cv_path, 'r', encoding='utf-8') as file:
-                    cv_text = file.read()
-            # For other file types (in a real implementation we'd use proper extractors)
-            else:
-                cv_text = f"Placeholder text extracted from {cv_path}"
-                
-            state = {**state, "cv_text": cv_text}
-        
-        # Create prompt template for CV parsing
-        template = """You are a professional CV/resume analyzer.
-        Extract key information from the following CV and format it according to the requirements.
-        
-        CV Text:
-        {cv_text}
-        
-        Extract the following information:
-        1. Candidate's full name
-        2. Education history (institution, degree, field, years)
-        3. Work experience (company, role, years, brief description)
-        4. Skills
-        5. Certifications
-        
-        Format your response as a JSON object with these fields: name, education, work_experience, skills, certifications.
-        Each education entry should have institution, degree, field, and years fields.
-        Each work experience entry should have company, role, years, and description fields.
-        Skills and certifications should be arrays of strings.
-        """
-        
-        prompt = ChatPromptTemplate.from_template(template)
-        model = get_chat_model()
-        chain = prompt | model | StrOutputParser()
-        
-        result = chain.invoke({"cv_text": state["cv_text"]})
-        
-        # Parse the JSON response
-        json_result = json.loads(result)
-        
-        # Update state with extracted information
-        return {
-            **state,
-            "name": json_result.get("name", ""),
-            "education": json_result.get("education", []),
-            "work_experience": json_result.get("work_experience", []),
-            "skills": json_result.get("skills", []),
-            "certifications": json_result.get("certifications", []),
-            "error": None
-        }
-    except Exception as e:
+        cv_text = _load_cv_text(state)
+        result = _extract_cv_profile(cv_text)
+        return _cv_profile_update(cv_text, result)
+    except CV_NODE_ERRORS as e:
         # Handle errors
-        return {
-            **state,
-            "error": f"Error parsing CV: {str(e)}"
-        }
+        return {"error": CV_ERROR.format(e)}
+
+async def aparse_cv_text(state: CVProcessingState) -> Dict[str, Any]:
+    """Async variant of parse_cv_text"""
+    try:
+        cv_text = await asyncio.to_thread(_load_cv_text, state)
+        result = await _aextract_cv_profile(cv_text)
+        return _cv_profile_update(cv_text, result)
+    except CV_NODE_ERRORS as e:
+        # Handle errors
+        return {"error": CV_ERROR.format(e)}
 
 # Create CV Processing workflow
 def create_cv_processing_workflow():
@@ -238,8 +432,8 @@ def create_cv_processing_workflow():
     # Define workflow using LangGraph StateGraph
     workflow = StateGraph(CVProcessingState)
     
-    # Add the node
-    workflow.add_node("parse_cv_text", parse_cv_text)
+    # Add the node - the sync and async implementations back the same node
+    workflow.add_node("parse_cv_text", RunnableLambda(parse_cv_text, afunc=aparse_cv_text))
     
     # Define the edge - use END as the target instead of None
     workflow.set_entry_point("parse_cv_text")
@@ -250,207 +444,287 @@ def create_cv_processing_workflow():
     # Compile the workflow
     return workflow.compile()
 
+_CV_WORKFLOW = create_cv_processing_workflow()
+
 # ===== MATCHING WORKFLOW =====
 
+# Single prompt producing the overall score and the component breakdown in one call
+MATCH_TEMPLATE = """Score how well the candidate matches the job.
+{semantic_hint}
+Job: {job_title}
+Summary: {job_summary}
+Required Skills: {required_skills}
+Required Experience: {required_experience}
+Responsibilities: {responsibilities}
+
+Candidate: {candidate_name}
+Education: {education}
+Work Experience: {work_experience}
+Skills: {skills}
+Certifications: {certifications}
+
+Return JSON matching the schema.
+"""
+
+_MATCH_CHAIN = _build_chain(MATCH_TEMPLATE, MatchBreakdown)
+
+def _job_embedding_text(job_summary: JobSummary) -> str:
+    """Text embedded to represent a job for semantic matching"""
+    return job_summary.summary + "\n" + ", ".join(job_summary.required_skills)
+
+def _candidate_embedding_text(candidate_profile: CandidateProfile) -> str:
+    """Text embedded to represent a candidate for semantic matching"""
+    return (
+        ", ".join(candidate_profile.skills) + "\n" + 
+        str(candidate_profile.work_experience) + "\n" +
+        str(candidate_profile.education)
+    )
+
+def _similarity_percent(job_embedding: Optional[List[float]], candidate_embedding: Optional[List[float]]) -> Optional[float]:
+    """Convert a job and candidate embedding pair to a 0-100 similarity, None if either is unavailable"""
+    from utils import cosine_similarity
+    
+    if not (job_embedding and candidate_embedding):
+        logger.warning("Using fallback LLM evaluation for match calculation")
+        return None
+    
+    similarity_score = cosine_similarity(job_embedding, candidate_embedding)
+    # Convert to percentage score (0-100)
+    return min(1.0, similarity_score) * 100
+
+def _semantic_match_score(job_summary: JobSummary, candidate_profile: CandidateProfile) -> Optional[float]:
+    """Return the embedding similarity (0-100) of a job and a candidate, or None if embeddings are unavailable"""
+    from utils import generate_embeddings_batch
+    
+    # Generate both embeddings with one request
+    return _similarity_percent(*generate_embeddings_batch([
+        _job_embedding_text(job_summary),
+        _candidate_embedding_text(candidate_profile)
+    ]))
+
+async def _asemantic_match_score(job_summary: JobSummary, candidate_profile: CandidateProfile) -> Optional[float]:
+    """Async variant of _semantic_match_score"""
+    from utils import agenerate_embeddings_batch
+    
+    return _similarity_percent(*await agenerate_embeddings_batch([
+        _job_embedding_text(job_summary),
+        _candidate_embedding_text(candidate_profile)
+    ]))
+
+def _state_semantic_score(state: MatchingState) -> Optional[float]:
+    """Semantic score for a matching state, embedding only the candidate when the job is prepared"""
+    from utils import generate_embedding
+    
+    prepared_job = state.get("prepared_job")
+    if prepared_job is None:
+        return _semantic_match_score(state["job_summary"], state["candidate_profile"])
+    return _similarity_percent(
+        prepared_job.embedding, generate_embedding(_candidate_embedding_text(state["candidate_profile"]))
+    )
+
+async def _astate_semantic_score(state: MatchingState) -> Optional[float]:
+    """Async variant of _state_semantic_score"""
+    from utils import agenerate_embedding
+    
+    prepared_job = state.get("prepared_job")
+    if prepared_job is None:
+        return await _asemantic_match_score(state["job_summary"], state["candidate_profile"])
+    return _similarity_percent(
+        prepared_job.embedding, await agenerate_embedding(_candidate_embedding_text(state["candidate_profile"]))
+    )
+
+def _job_prompt_fields(job_summary: JobSummary) -> Dict[str, Any]:
+    """Format the job fields used by the match prompts"""
+    return {
+        "job_title": job_summary.title,
+        "job_summary": job_summary.summary,
+        "required_skills": ", ".join(job_summary.required_skills),
+        "required_experience": job_summary.required_experience,
+        "responsibilities": ", ".join(job_summary.responsibilities)
+    }
+
+def _candidate_prompt_fields(candidate_profile: CandidateProfile) -> Dict[str, Any]:
+    """Format the candidate fields used by the match prompts"""
+    return {
+        "candidate_name": candidate_profile.name,
+        "education": orjson.dumps(candidate_profile.education).decode(),
+        "work_experience": orjson.dumps(candidate_profile.work_experience).decode(),
+        "skills": ", ".join(candidate_profile.skills),
+        "certifications": ", ".join(candidate_profile.certifications)
+    }
+
+def _match_input(state: MatchingState, semantic_score: Optional[float]) -> Dict[str, Any]:
+    """Prepare the prompt input for the match chain"""
+    semantic_hint = ""
+    if semantic_score is not None:
+        semantic_hint = f"The semantic similarity between this job and candidate is {round(semantic_score, 1)}%.\n"
+    
+    prepared_job = state.get("prepared_job")
+    return {
+        "semantic_hint": semantic_hint,
+        **(prepared_job.prompt_fields if prepared_job else _job_prompt_fields(state["job_summary"])),
+        **_candidate_prompt_fields(state["candidate_profile"])
+    }
+
+def _fallback_breakdown(error: Exception, semantic_score: Optional[float]) -> MatchBreakdown:
+    """Create generic explanations around the semantic score when the breakdown call fails"""
+    # Without embeddings there is nothing to fall back on
+    if semantic_score is None:
+        raise error
+    
+    logger.error(f"Error generating component breakdowns: {str(error)}")
+    return MatchBreakdown(
+        score=semantic_score / 100,
+        explanation=f"The candidate's profile has an overall semantic match score of {round(semantic_score, 1)}% with the job requirements.",
+        skills_match={"score": 0.7, "explanation": "Skills were semantically analyzed."},
+        experience_match={"score": 0.7, "explanation": "Experience was semantically analyzed."},
+        education_match={"score": 0.7, "explanation": "Education was semantically analyzed."}
+    )
+
+# A required skill counts as matched when a candidate skill's embedding is at least this similar
+SKILL_MATCH_THRESHOLD = float(os.environ.get("SKILL_MATCH_THRESHOLD", "0.8"))
+
+def _with_skill_match(update: Dict[str, Any], skill_match: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Replace the model's skills score in a state update with the embedding-based one, keeping its explanation"""
+    if skill_match is None or update.get("error"):
+        return update
+    return {**update, "skills_match": {**(update.get("skills_match") or {}), **skill_match}}
+
+def _match_update(breakdown: MatchBreakdown, semantic_score: Optional[float]) -> Dict[str, Any]:
+    """State update for the Matching workflow from the breakdown and the overall score"""
+    # Prefer the semantic score; otherwise use the LLM score (0-1)
+    if semantic_score is not None:
+        match_score = semantic_score
+    else:
+        match_score = breakdown.score * 100
+    
+    # Update state with match results
+    return {
+        "match_score": match_score / 100,  # Convert back to 0-1 scale for internal use
+        "skills_match": breakdown.skills_match,
+        "experience_match": breakdown.experience_match,
+        "education_match": breakdown.education_match,
+        "explanation": breakdown.explanation,
+        "error": None
+    }
+
+def _explain(state: MatchingState, semantic_score: Optional[float]) -> MatchBreakdown:
+    """Generate the full score and component breakdown for one job/candidate pair"""
+    # One model round-trip yields both the score and the component breakdown
+    try:
+        return _MATCH_CHAIN.invoke(_match_input(state, semantic_score))
+    except NODE_ERRORS as e:
+        return _fallback_breakdown(e, semantic_score)
+
 # Node functions for Matching workflow
-def calculate_match_score(state: MatchingState) -> MatchingState:
+def calculate_match_score(state: MatchingState) -> Dict[str, Any]:
     """Calculate match score between job and candidate using semantic embeddings"""
     try:
-        job_summary = state["job_summary"]
-        candidate_profile = state["candidate_profile"]
-        
-        # Import utilities for embedding generation and similarity calculation
-        from utils import generate_embedding, cosine_similarity, combine_text_for_matching
-        
-        # Convert job and candidate information to dictionaries
-        job_dict = {
-            "title": job_summary.title,
-            "summary": job_summary.summary,
-            "required_skills": job_summary.required_skills,
-            "required_experience": job_summary.required_experience,
-            "responsibilities": job_summary.responsibilities
-        }
-        
-        candidate_dict = {
-            "name": candidate_profile.name,
-            "education": candidate_profile.education,
-            "work_experience": candidate_profile.work_experience,
-            "skills": candidate_profile.skills,
-            "certifications": candidate_profile.certifications
-        }
-        
-        # Combine text for semantic matching
-        combined_text = combine_text_for_matching(job_dict, candidate_dict)
+        semantic_score = _state_semantic_score(state)
+        breakdown = _explain(state, semantic_score)
+        return _match_update(breakdown, semantic_score)
+    except NODE_ERRORS as e:
+        # Handle errors
+        return {"error": MATCH_ERROR.format(e)}
+
+async def acalculate_match_score(state: MatchingState) -> Dict[str, Any]:
+    """Async variant of calculate_match_score"""
+    try:
+        semantic_score = await _astate_semantic_score(state)
         
-        # Generate embeddings
-        job_embedding = generate_embedding(job_summary.summary + "\n" + ", ".join(job_summary.required_skills))
-        candidate_embedding = generate_embedding(
-            ", ".join(candidate_profile.skills) + "\n" + 
-            str(candidate_profile.work_experience) + "\n" +
-            str(candidate_profile.education)
-        )
+        try:
+            breakdown = await _MATCH_CHAIN.ainvoke(_match_input(state, semantic_score))
+        except NODE_ERRORS as e:
+            breakdown = _fallback_breakdown(e, semantic_score)
         
-        # If embeddings were successfully generated, calculate similarity score
-        if job_embedding and candidate_embedding:
-            similarity_score = cosine_similarity(job_embedding, candidate_embedding)
-            # Convert to percentage score (0-100)
-            match_score = min(1.0, similarity_score) * 100
-        else:
-            # Fallback to old method with LLM evaluation
-            logger.warning("Using fallback LLM evaluation for match calculation")
-            
-            # Create prompt template for matching
-            template = """You are a professional recruiting match analyzer.
-            Calculate the match score between the job requirements and the candidate's profile.
-            
-            Job Information:
-            Title: {job_title}
-            Summary: {job_summary}
-            Required Skills: {required_skills}
-            Required Experience: {required_experience}
-            Responsibilities: {responsibilities}
-            
-            Candidate Information:
-            Name: {candidate_name}
-            Education: {education}
-            Work Experience: {work_experience}
-            Skills: {skills}
-            Certifications: {certifications}
-            
-            Analyze the match in these categories:
-            1. Skills match: How many required skills does the candidate have? Assign a score from 0-1.
-            2. Experience match: Does the candidate have the required experience type and years? Assign a score from 0-1.
-            3. Education match: Does the candidate's education align with the job requirements? Assign a score from 0-1.
-            
-            Calculate an overall score as a weighted average (skills: 40%, experience: 40%, education: 20%).
-            
-            Format your response as a JSON object with these fields:
-            - score (overall score from 0-1)
-            - skills_match (object with score and details)
-            - experience_match (object with score and details)
-            - education_match (object with score and details)
-            - explanation (text explaining the match result)
-            """
-            
-            prompt = ChatPromptTemplate.from_template(template)
-            model = get_chat_model()
-            chain = prompt | model | StrOutputParser()
-            
-            # Prepare input for the prompt
-            input_data = {
-                "job_title": job_summary.title,
-                "job_summary": job_summary.summary,
-                "required_skills": ", ".join(job_summary.required_skills),
-                "required_experience": job_summary.required_experience,
-                "responsibilities": ", ".join(job_summary.responsibilities),
-                "candidate_name": candidate_profile.name,
-                "education": json.dumps(candidate_profile.education),
-                "work_experience": json.dumps(candidate_profile.work_experience),
-                "skills": ", ".join(candidate_profile.skills),
-                "certifications": ", ".join(candidate_profile.certifications)
-            }
-            
-            result = chain.invoke(input_data)
-            
-            # Parse the JSON response
-            json_result = json.loads(result)
-            
-            # Get the match score from LLM result (0-1)
-            match_score = json_result.get("score", 0.0) * 100
-            
-            # Use the component scores from LLM evaluation
-            skills_match = json_result.get("skills_match", {})
-            experience_match = json_result.get("experience_match", {})
-            education_match = json_result.get("education_match", {})
-            explanation = json_result.get("explanation", "")
-        
-        # Calculate semantic component matches regardless of which method is used
-        # If we used embeddings, we'll use a secondary LLM call to provide explanations
-        if job_embedding and candidate_embedding:
-            # Use the faster model to analyze the component matches
-            template = """You are a professional recruiting match analyzer.
-            The overall match score between this job and candidate is {match_score}%.
-            
-            Job Information:
-            Title: {job_title}
-            Summary: {job_summary}
-            Required Skills: {required_skills}
-            Required Experience: {required_experience}
-            Responsibilities: {responsibilities}
-            
-            Candidate Information:
-            Name: {candidate_name}
-            Education: {education}
-            Work Experience: {work_experience}
-            Skills: {skills}
-            Certifications: {certifications}
-            
-            Provide a component breakdown of the match score into these categories:
-            1. Skills match: Analyze the candidate's skills against the required skills. 
-            2. Experience match: Analyze the candidate's experience against the required experience.
-            3. Education match: Analyze the candidate's education against the implied job requirements.
-            
-            Format your response as a JSON object with these fields:
-            - skills_match (object with score between 0-1 and explanation)
-            - experience_match (object with score between 0-1 and explanation)
-            - education_match (object with score between 0-1 and explanation)
-            - explanation (overall text explaining the match result)
-            """
-            
-            prompt = ChatPromptTemplate.from_template(template)
-            model = get_chat_model()
-            chain = prompt | model | StrOutputParser()
-            
-            # Prepare input for the prompt
-            input_data = {
-                "match_score": round(match_score, 1),
-                "job_title": job_summary.title,
-                "job_summary": job_summary.summary,
-                "required_skills": ", ".join(job_summary.required_skills),
-                "required_experience": job_summary.required_experience,
-                "responsibilities": ", ".join(job_summary.responsibilities),
-                "candidate_name": candidate_profile.name,
-                "education": json.dumps(candidate_profile.education),
-                "work_experience": json.dumps(candidate_profile.work_experience),
-                "skills": ", ".join(candidate_profile.skills),
-                "certifications": ", ".join(candidate_profile.certifications)
-            }
-            
-            try:
-                result = chain.invoke(input_data)
-                
-                # Parse the JSON response
-                json_result = json.loads(result)
-                
-                # Extract the component scores and explanation
-                skills_match = json_result.get("skills_match", {})
-                experience_match = json_result.get("experience_match", {})
-                education_match = json_result.get("education_match", {})
-                explanation = json_result.get("explanation", "")
-            except Exception as e:
-                # If there's an error, create generic explanations
-                logger.error(f"Error generating component breakdowns: {str(e)}")
-                explanation = f"The candidate's profile has an overall semantic match score of {round(match_score, 1)}% with the job requirements."
-                skills_match = {"score": 0.7, "explanation": "Skills were semantically analyzed."}
-                experience_match = {"score": 0.7, "explanation": "Experience was semantically analyzed."}
-                education_match = {"score": 0.7, "explanation": "Education was semantically analyzed."}
-                
-        # Update state with match results
-        return {
-            **state,
-            "match_score": match_score / 100,  # Convert back to 0-1 scale for internal use
-            "skills_match": skills_match,
-            "experience_match": experience_match,
-            "education_match": education_match,
-            "explanation": explanation,
-            "error": None
-        }
-    except Exception as e:
+        return _match_update(breakdown, semantic_score)
+    except NODE_ERRORS as e:
         # Handle errors
-        return {
-            **state,
-            "error": f"Error calculating match score: {str(e)}"
-        }
+        return {"error": MATCH_ERROR.format(e)}
+
+# ===== BATCHED MATCHING =====
+
+# Number of candidates scored per prompt; small enough to stay inside phi4-mini's context
+MATCH_BATCH_SIZE = int(os.environ.get("MATCH_BATCH_SIZE", "5"))
+
+# Scores several candidates against one job in a single call
+MATCH_BATCH_TEMPLATE = """Score how well each candidate matches the job.
+
+Job: {job_title}
+Summary: {job_summary}
+Required Skills: {required_skills}
+Required Experience: {required_experience}
+Responsibilities: {responsibilities}
+
+{candidates}
+
+Return JSON matching the schema, with one result per candidate in order: the first for Candidate[1], the second for Candidate[2], and so on.
+"""
+
+_MATCH_BATCH_CHAIN = _build_chain(MATCH_BATCH_TEMPLATE, MatchBreakdownBatch)
+
+def _candidate_block(index: int, candidate_profile: CandidateProfile, semantic_score: Optional[float]) -> str:
+    """Format one candidate for the batch prompt using its [index] position identifier"""
+    fields = _candidate_prompt_fields(candidate_profile)
+    block = (
+        f"Candidate[{index}]:\n"
+        f"Name: {fields['candidate_name']}\n"
+        f"Education: {fields['education']}\n"
+        f"Work Experience: {fields['work_experience']}\n"
+        f"Skills: {fields['skills']}\n"
+        f"Certifications: {fields['certifications']}"
+    )
+    if semantic_score is not None:
+        block += f"\nSemantic similarity with the job: {round(semantic_score, 1)}%"
+    return block
+
+# ===== SCORE-ONLY RANKING =====
+
+# Number of top-ranked candidates that get a full breakdown from MatchingAgent.rank
+MATCH_EXPLAIN_TOP_K = int(os.environ.get("MATCH_EXPLAIN_TOP_K", "10"))
+
+# Minimal prompt for ranking: the answer is a single number, so generation is capped at a few tokens
+SCORE_TEMPLATE = """Score how well the candidate matches the job.
+
+Job: {job_title}
+Summary: {job_summary}
+Required Skills: {required_skills}
+Required Experience: {required_experience}
+
+Candidate: {candidate_name}
+Education: {education}
+Work Experience: {work_experience}
+Skills: {skills}
+Certifications: {certifications}
+
+Return JSON matching the schema.
+"""
+
+_SCORE_CHAIN = _build_chain(SCORE_TEMPLATE, MatchScore, num_predict=20)
+
+def _score_input(job_summary: JobSummary, candidate_profile: CandidateProfile) -> Dict[str, Any]:
+    """Prepare the prompt input for the score-only chain"""
+    return {
+        **_job_prompt_fields(job_summary),
+        **_candidate_prompt_fields(candidate_profile)
+    }
+
+def _score_only(job_summary: JobSummary, candidate_profiles: List[CandidateProfile]) -> List[float]:
+    """Score candidates (0-1) with the score-only prompt, 0.0 where the call fails"""
+    results = _SCORE_CHAIN.batch(
+        [_score_input(job_summary, profile) for profile in candidate_profiles],
+        config={"max_concurrency": RECRUIT_CONCURRENCY},
+        return_exceptions=True
+    )
+    
+    scores = []
+    for result in results:
+        if isinstance(result, Exception):
+            logger.error(f"Error scoring candidate: {str(result)}")
+            scores.append(0.0)
+        else:
+            scores.append(min(1.0, max(0.0, result.score)))
+    return scores
 
 # Create Matching workflow
 def create_matching_workflow():
@@ -458,8 +732,8 @@ def create_matching_workflow():
     # Define workflow using LangGraph StateGraph
     workflow = StateGraph(MatchingState)
     
-    # Add the node
-    workflow.add_node("calculate_match_score", calculate_match_score)
+    # Add the node - the sync and async implementations back the same node
+    workflow.add_node("calculate_match_score", RunnableLambda(calculate_match_score, afunc=acalculate_match_score))
     
     # Define the edge - use END as the target instead of None
     workflow.set_entry_point("calculate_match_score")
@@ -470,76 +744,85 @@ def create_matching_workflow():
     # Compile the workflow
     return workflow.compile()
 
+_MATCH_WORKFLOW = create_matching_workflow()
+
 # ===== INTERVIEW SCHEDULING WORKFLOW =====
 
+EMAIL_TEMPLATE = """You are a professional recruiter.
+Create a personalized interview request email for the following candidate.
+
+Job Information:
+Title: {job_title}
+Summary: {job_summary}
+
+Candidate Information:
+Name: {candidate_name}
+
+Match Analysis:
+Score: {match_score}
+Explanation: {match_explanation}
+
+Available Interview Slots:
+{interview_slots}
+
+Create a professional, friendly email that:
+1. Addresses the candidate by name
+2. Expresses interest based on their qualifications
+3. Briefly describes the position
+4. Lists the available interview slots
+5. Provides next steps
+
+Format your response as just the email text, without any additional formatting or explanation.
+"""
+
+_EMAIL_CHAIN = _build_chain(EMAIL_TEMPLATE)
+
+def _email_input(state: SchedulingState) -> Dict[str, Any]:
+    """Prepare the prompt input for the email chain"""
+    job_summary = state["job_summary"]
+    candidate_profile = state["candidate_profile"]
+    match_result = state["match_result"]
+    
+    # Format interview slots for the prompt
+    slots_text = "\n".join([f"- {slot['display']}" for slot in state["interview_slots"]])
+    
+    return {
+        "job_title": job_summary.title,
+        "job_summary": job_summary.summary,
+        "candidate_name": candidate_profile.name,
+        "match_score": match_result.score,
+        "match_explanation": match_result.explanation,
+        "interview_slots": slots_text
+    }
+
 # Node functions for Scheduling workflow
-def generate_email_template(state: SchedulingState) -> SchedulingState:
+def generate_email_template(state: SchedulingState) -> Dict[str, Any]:
     """Generate a personalized interview request email"""
     try:
-        job_summary = state["job_summary"]
-        candidate_profile = state["candidate_profile"]
-        match_result = state["match_result"]
-        interview_slots = state["interview_slots"]
-        
-        # Create prompt template for email generation
-        template = """You are a professional recruiter.
-        Create a personalized interview request email for the following candidate.
-        
-        Job Information:
-        Title: {job_title}
-        Summary: {job_summary}
-        
-        Candidate Information:
-        Name: {candidate_name}
-        
-        Match Analysis:
-        Score: {match_score}
-        Explanation: {match_explanation}
-        
-        Available Interview Slots:
-        {interview_slots}
-        
-        Create a professional, friendly email that:
-        1. Addresses the candidate by name
-        2. Expresses interest based on their qualifications
-        3. Briefly describes the position
-        4. Lists the available interview slots
-        5. Provides next steps
-        
-        Format your response as just the email text, without any additional formatting or explanation.
-        """
-        
-        prompt = ChatPromptTemplate.from_template(template)
-        model = get_chat_model()
-        chain = prompt | model | StrOutputParser()
-        
-        # Format interview slots for the prompt
-        slots_text = "\n".join([f"- {slot['display']}" for slot in interview_slots])
-        
-        # Prepare input for the prompt
-        input_data = {
-            "job_title": job_summary.title,
-            "job_summary": job_summary.summary,
-            "candidate_name": candidate_profile.name,
-            "match_score": match_result.score,
-            "match_explanation": match_result.explanation,
-            "interview_slots": slots_text
-        }
-        
-        email_template = chain.invoke(input_data)
+        email_template = _EMAIL_CHAIN.invoke(_email_input(state))
         
         # Update state with email template
         return {
-            **state,
             "email_template": email_template,
             "error": None
         }
-    except Exception as e:
+    except NODE_ERRORS as e:
         # Handle errors
+        return {"error": EMAIL_ERROR.format(e)}
+
+async def agenerate_email_template(state: SchedulingState) -> Dict[str, Any]:
+    """Async variant of generate_email_template"""
+    try:
+        email_template = await _EMAIL_CHAIN.ainvoke(_email_input(state))
+        
+        # Update state with email template
         return {
-            **state,
-            "error": f"Error generating email template: {str(e)}"
+            "email_template": email_template,
+            "error": None
         }
+    except NODE_ERRORS as e:
+        # Handle errors
+        return {"error": EMAIL_ERROR.format(e)}
 
 # Create Scheduling workflow
 def create_scheduling_workflow():
@@ -547,8 +830,8 @@ def create_scheduling_workflow():
     # Define workflow using LangGraph StateGraph
     workflow = StateGraph(SchedulingState)
     
-    # Add the node
-    workflow.add_node("generate_email_template", generate_email_template)
+    # Add the node - the sync and async implementations back the same node
+    workflow.add_node("generate_email_template", RunnableLambda(generate_email_template, afunc=agenerate_email_template))
     
     # Define the edge - use END as the target instead of None
     workflow.set_entry_point("generate_email_template")
@@ -559,6 +842,17 @@ def create_scheduling_workflow():
     # Compile the workflow
     return workflow.compile()
 
+_SCHEDULING_WORKFLOW = create_scheduling_workflow()
+
+# Business hours slots (9 AM - 5 PM)
+INTERVIEW_HOURS = [9, 11, 13, 15, 17]  # 9 AM, 11 AM, 1 PM, 3 PM, 5 PM
+
+def _add_business_days(weekday: int, n_days: int) -> int:
+    """Number of calendar days spanned by moving n_days business days forward from a weekday (0-4)"""
+    weeks, remainder = divmod(n_days, 5)
+    # Crossing a weekend adds Saturday and Sunday
+    return weeks * 7 + remainder + (2 if weekday + remainder >= 5 else 0)
+
 # Utility function for generating interview slots
 def generate_interview_slots(n_slots: int = 3, start_date: Optional[datetime] = None) -> List[Dict[str, Any]]:
     """
@@ -577,38 +871,54 @@ def generate_interview_slots(n_slots: int = 3, start_date: Optional[datetime] =
         # Normalize to 9 AM
         start_date = start_date.replace(hour=9, minute=0, second=0, microsecond=0)
     
-    slots = []
-    current_date = start_date
+    # Skip a starting weekend in one step (5 = Saturday, 6 = Sunday)
+    weekday = start_date.weekday()
+    first_day = start_date + timedelta(days=7 - weekday) if weekday >= 5 else start_date
+    first_weekday = first_day.weekday()
     
-    # Generate business hours slots (9 AM - 5 PM)
-    hours = [9, 11, 13, 15, 17]  # 9 AM, 11 AM, 1 PM, 3 PM, 5 PM
+    slots = []
     
-    for i in range(n_slots):
-        # Skip weekends
-        while current_date.weekday() >= 5:  # 5 = Saturday, 6 = Sunday
-            current_date += timedelta(days=1)
-        
-        hour = hours[i % len(hours)]
-        slot_time = current_date.replace(hour=hour)
-        
-        slots.append({
-            "datetime": slot_time.isoformat(),
-            "display": slot_time.strftime("%A, %B %d, %Y at %I:%M %p")
-        })
+    # Each business day holds one slot per hour; compute each day's offset directly
+    for day_index in range(-(-n_slots // len(INTERVIEW_HOURS))):
+        day = first_day + timedelta(days=_add_business_days(first_weekday, day_index))
         
-        # Move to next day after we've used all hours in a day
-        if (i + 1) % len(hours) == 0:
-            current_date += timedelta(days=1)
+        for hour in INTERVIEW_HOURS[:n_slots - day_index * len(INTERVIEW_HOURS)]:
+            slot_time = day.replace(hour=hour)
+            slots.append({
+                "datetime": slot_time.isoformat(),
+                "display": slot_time.strftime("%A, %B %d, %Y at %I:%M %p")
+            })
     
     return slots
 
 # Main agent classes that use LangGraph workflows
 
+def _jd_cache_key(title: str, description: str) -> str:
+    """Parse cache key for a job description"""
+    digest = hashlib.sha256(f"{title}\n{description}".encode("utf-8")).hexdigest()
+    return f"jd:{DEFAULT_MODEL}:{digest}"
+
+def _cv_cache_key(cv_path: str) -> str:
+    """Parse cache key for a CV file, based on the file contents rather than its path"""
+    with open(cv_path, 'rb') as file:
+        digest = hashlib.sha256(file.read()).hexdigest()
+    return f"cv:{DEFAULT_MODEL}:{digest}"
+
+def _dot_matrix(left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    """Dot product of every row of left with every row of right, as float32"""
+    if simsimd is not None:
+        return np.asarray(simsimd.cdist(np.ascontiguousarray(left), np.ascontiguousarray(right), metric="dot"), dtype=np.float32)
+    if cosmat is not None:
+        out = np.empty((left.shape[0], right.shape[0]), dtype=np.float32)
+        cosmat(np.ascontiguousarray(left), np.ascontiguousarray(right), out)
+        return out
+    return np.einsum("ij,kj->ik", left, right)
+
 class JobDescriptionAgent:
     """Agent for processing job descriptions and extracting key information"""
     
     def __init__(self):
-        self.workflow = create_job_description_workflow()
+        self.workflow = _JD_WORKFLOW
     
     def process_jd(self, title: str, description: str) -> JobSummary:
         """
@@ -621,12 +931,67 @@ class JobDescriptionAgent:
         Returns:
             JobSummary object with extracted details
         """
+        cache_key = _jd_cache_key(title, description)
+        cached = _PARSE_CACHE.get(cache_key)
+        if cached is not None:
+            return JobSummary.model_validate_json(cached)
+        
         # Set up the initial state
         initial_state = {"title": title, "description": description}
         
         # Run the workflow
         result = self.workflow.invoke(initial_state)
         
+        return self._store_job_summary(cache_key, title, result)
+    
+    async def aprocess_jd(self, title: str, description: str) -> JobSummary:
+        """Async variant of process_jd"""
+        cache_key = _jd_cache_key(title, description)
+        cached = _PARSE_CACHE.get(cache_key)
+        if cached is not None:
+            return JobSummary.model_validate_json(cached)
+        
+        result = await self.workflow.ainvoke({"title": title, "description": description})
+        return self._store_job_summary(cache_key, title, result)
+    
+    def batch_process_jd(self, jobs: List[Tuple[str, str]]) -> List[JobSummary]:
+        """
+        Process several job descriptions concurrently
+        
+        Args:
+            jobs: List of (title, description) pairs
+            
+        Returns:
+            List of JobSummary objects in the same order as the input
+        """
+        cache_keys = [_jd_cache_key(title, description) for title, description in jobs]
+        summaries: List[Optional[JobSummary]] = []
+        for cache_key in cache_keys:
+            cached = _PARSE_CACHE.get(cache_key)
+            summaries.append(None if cached is None else JobSummary.model_validate_json(cached))
+        
+        # Only uncached jobs go through the workflow
+        pending = [i for i, summary in enumerate(summaries) if summary is None]
+        initial_states = [{"title": jobs[i][0], "description": jobs[i][1]} for i in pending]
+        
+        # Fan the workflow runs out to Ollama
+        results = self.workflow.batch(initial_states, config={"max_concurrency": RECRUIT_CONCURRENCY})
+        
+        for i, result in zip(pending, results):
+            summaries[i] = self._store_job_summary(cache_keys[i], jobs[i][0], result)
+        
+        return summaries
+    
+    def _store_job_summary(self, cache_key: str, title: str, result: Dict[str, Any]) -> JobSummary:
+        """Create a JobSummary from a workflow result and cache it if parsing succeeded"""
+        summary = self._to_job_summary(title, result)
+        if not result.get("error"):
+            _PARSE_CACHE.set(cache_key, summary.model_dump_json())
+        return summary
+    
+    @staticmethod
+    def _to_job_summary(title: str, result: Dict[str, Any]) -> JobSummary:
+        """Create a JobSummary object from a workflow result"""
         # Check for errors
         if result.get("error"):
             return JobSummary(
@@ -637,7 +1002,6 @@ class JobDescriptionAgent:
                 responsibilities=[]
             )
         
-        # Create JobSummary object from workflow result
         return JobSummary(
             title=title,
             summary=result.get("summary", ""),
@@ -650,7 +1014,7 @@ class RecruitingAgent:
     """Agent for processing candidate CVs and extracting relevant information"""
     
     def __init__(self):
-        self.workflow = create_cv_processing_workflow()
+        self.workflow = _CV_WORKFLOW
     
     def process_cv_file(self, cv_path: str) -> CandidateProfile:
         """
@@ -662,73 +1026,88 @@ class RecruitingAgent:
         Returns:
             CandidateProfile with extracted information
         """
-        # For image files, we'd use vision models in a real implementation
-        if cv_path.lower().endswith(('.png', '.jpg', '.jpeg')):
-            # Placeholder for vision model processing
-            return CandidateProfile(
-                name="John Doe",
-                education=[
-                    {"institution": "Example University", "degree": "Bachelor", "field": "Computer Science", "years": "2015-2019"}
-                ],
-                work_experience=[
-                    {"company": "Tech Corp", "role": "Software Engineer", "years": "2019-Present", 
-                     "description": "Developed web applications using modern frameworks"}
-                ],
-                skills=["Python", "JavaScript", "SQL", "Machine Learning"],
-                certifications=["AWS Certified Developer"]
-            )
+        cache_key = _cv_cache_key(cv_path)
+        cached = _PARSE_CACHE.get(cache_key)
+        if cached is not None:
+            return CandidateProfile.model_validate_json(cached)
         
-        # For PDF files (in a real implementation, we'd extract text properly)
-        elif cv_path.lower().endswith('.pdf'):
-            # Placeholder for PDF extraction
-            return CandidateProfile(
-                name="Jane Smith",
-                education=[
-                    {"institution": "Tech University", "degree": "Master", "field": "Data Science", "years": "2017-2019"},
-                    {"institution": "State College", "degree": "Bachelor", "field": "Mathematics", "years": "2013-2017"}
-                ],
-                work_experience=[
-                    {"company": "Data Analytics Inc", "role": "Data Scientist", "years": "2019-Present", 
-                     "description": "Implemented machine learning solutions for business problems"},
-                    {"company": "Research Lab", "role": "Research Assistant", "years": "2017-2019", 
-                     "description": "Assisted in data analysis and visualization"}
-                ],
-                skills=["Python", "R", "TensorFlow", "SQL", "Tableau"],
-                certifications=["Google Data Analytics", "Microsoft Azure Data Scientist"]
-            )
+        # Set up the initial state
+        initial_state = {"cv_path": cv_path}
         
-        # For text files, use the workflow
-        else:
-            # Set up the initial state
-            initial_state = {"cv_path": cv_path}
-            
-            # Run the workflow
-            result = self.workflow.invoke(initial_state)
-            
-            # Check for errors
-            if result.get("error"):
-                return CandidateProfile(
-                    name="Unknown",
-                    education=[],
-                    work_experience=[],
-                    skills=[],
-                    certifications=[]
-                )
+        # Run the workflow
+        result = self.workflow.invoke(initial_state)
+        
+        return self._store_candidate_profile(cache_key, result)
+    
+    async def aprocess_cv_file(self, cv_path: str) -> CandidateProfile:
+        """Async variant of process_cv_file"""
+        cache_key = await asyncio.to_thread(_cv_cache_key, cv_path)
+        cached = _PARSE_CACHE.get(cache_key)
+        if cached is not None:
+            return CandidateProfile.model_validate_json(cached)
+        
+        result = await self.workflow.ainvoke({"cv_path": cv_path})
+        return self._store_candidate_profile(cache_key, result)
+    
+    def batch_process_cv_files(self, cv_paths: List[str]) -> List[CandidateProfile]:
+        """
+        Process several CV files concurrently
+        
+        Args:
+            cv_paths: Paths to the CV files
             
-            # Create CandidateProfile object from workflow result
+        Returns:
+            List of CandidateProfile objects in the same order as the input
+        """
+        cache_keys = [_cv_cache_key(path) for path in cv_paths]
+        profiles: List[Optional[CandidateProfile]] = []
+        for cache_key in cache_keys:
+            cached = _PARSE_CACHE.get(cache_key)
+            profiles.append(None if cached is None else CandidateProfile.model_validate_json(cached))
+        
+        # Only files without a cached profile go through the workflow
+        pending = [i for i, profile in enumerate(profiles) if profile is None]
+        initial_states = [{"cv_path": cv_paths[i]} for i in pending]
+        results = self.workflow.batch(initial_states, config={"max_concurrency": RECRUIT_CONCURRENCY})
+        
+        for i, result in zip(pending, results):
+            profiles[i] = self._store_candidate_profile(cache_keys[i], result)
+        
+        return profiles
+    
+    def _store_candidate_profile(self, cache_key: str, result: Dict[str, Any]) -> CandidateProfile:
+        """Create a CandidateProfile from a workflow result and cache it if parsing succeeded"""
+        profile = self._to_candidate_profile(result)
+        if not result.get("error"):
+            _PARSE_CACHE.set(cache_key, profile.model_dump_json())
+        return profile
+    
+    @staticmethod
+    def _to_candidate_profile(result: Dict[str, Any]) -> CandidateProfile:
+        """Create a CandidateProfile object from a workflow result"""
+        # Check for errors
+        if result.get("error"):
             return CandidateProfile(
-                name=result.get("name", "Unknown"),
-                education=result.get("education", []),
-                work_experience=result.get("work_experience", []),
-                skills=result.get("skills", []),
-                certifications=result.get("certifications", [])
+                name="Unknown",
+                education=[],
+                work_experience=[],
+                skills=[],
+                certifications=[]
             )
+        
+        return CandidateProfile(
+            name=result.get("name", "Unknown"),
+            education=result.get("education", []),
+            work_experience=result.get("work_experience", []),
+            skills=result.get("skills", []),
+            certifications=result.get("certifications", [])
+        )
 
 class MatchingAgent:
     """Agent for comparing job descriptions with candidate profiles and calculating match scores using semantic embeddings"""
     
     def __init__(self):
-        self.workflow = create_matching_workflow()
+        self.workflow = _MATCH_WORKFLOW
     
     def calculate_match(self, job_summary: JobSummary, candidate_profile: CandidateProfile) -> MatchResult:
         """
@@ -751,6 +1130,408 @@ class MatchingAgent:
         # Run the workflow
         result = self.workflow.invoke(initial_state)
         
+        return self._match_results(job_summary, [candidate_profile], [result])[0]
+    
+    async def acalculate_match(self, job_summary: JobSummary, candidate_profile: CandidateProfile) -> MatchResult:
+        """Async variant of calculate_match"""
+        result = await self.workflow.ainvoke({
+            "job_summary": job_summary,
+            "candidate_profile": candidate_profile
+        })
+        # Skill matching embeds the skills, which blocks, so it runs in a worker thread
+        return (await asyncio.to_thread(self._match_results, job_summary, [candidate_profile], [result]))[0]
+    
+    def prepare_job(self, job_summary: JobSummary) -> PreparedJob:
+        """
+        Precompute the job-invariant parts of matching: the job embedding and the prompt fields
+        
+        Args:
+            job_summary: JobSummary object with job details
+            
+        Returns:
+            PreparedJob to pass to score_candidate for each candidate
+        """
+        from utils import generate_embedding
+        return PreparedJob(
+            job_summary=job_summary,
+            embedding=generate_embedding(_job_embedding_text(job_summary)),
+            prompt_fields=_job_prompt_fields(job_summary)
+        )
+    
+    def score_candidate(self, prepared_job: PreparedJob, candidate_profile: CandidateProfile) -> MatchResult:
+        """
+        Calculate the match score of a candidate against a prepared job
+        
+        Args:
+            prepared_job: Result of prepare_job
+            candidate_profile: CandidateProfile object with candidate details
+            
+        Returns:
+            MatchResult with score and match details
+        """
+        result = self.workflow.invoke({
+            "job_summary": prepared_job.job_summary,
+            "candidate_profile": candidate_profile,
+            "prepared_job": prepared_job
+        })
+        return self._match_results(prepared_job.job_summary, [candidate_profile], [result])[0]
+    
+    async def ascore_candidate(self, prepared_job: PreparedJob, candidate_profile: CandidateProfile) -> MatchResult:
+        """Async variant of score_candidate"""
+        result = await self._aworkflow_result(prepared_job, candidate_profile)
+        return (await asyncio.to_thread(
+            self._match_results, prepared_job.job_summary, [candidate_profile], [result]
+        ))[0]
+    
+    async def _aworkflow_result(self, prepared_job: PreparedJob, candidate_profile: CandidateProfile) -> Dict[str, Any]:
+        """Run the matching workflow for one candidate against a prepared job"""
+        return await self.workflow.ainvoke({
+            "job_summary": prepared_job.job_summary,
+            "candidate_profile": candidate_profile,
+            "prepared_job": prepared_job
+        })
+    
+    async def acalculate_matches(self, job_summary: JobSummary,
+                                 candidate_profiles: List[CandidateProfile]) -> List[MatchResult]:
+        """
+        Score many candidates against one job with concurrent workflow runs
+        
+        Args:
+            job_summary: Job details
+            candidate_profiles: Candidates to score
+            
+        Returns:
+            List of MatchResult objects in the same order as the candidates
+        """
+        # The job is embedded and formatted once, not once per candidate
+        prepared_job = await asyncio.to_thread(self.prepare_job, job_summary)
+        
+        # Bound the number of in-flight requests to what Ollama serves in parallel
+        semaphore = asyncio.Semaphore(RECRUIT_CONCURRENCY)
+        
+        async def score(candidate_profile: CandidateProfile) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._aworkflow_result(prepared_job, candidate_profile)
+        
+        results = await asyncio.gather(*[score(candidate_profile) for candidate_profile in candidate_profiles])
+        # Skills of every candidate are matched in one batch once the workflow runs finish
+        return await asyncio.to_thread(self._match_results, job_summary, candidate_profiles, results)
+    
+    def batch_calculate_match(self, pairs: List[Tuple[JobSummary, CandidateProfile]]) -> List[MatchResult]:
+        """
+        Calculate match scores for several job/candidate pairs concurrently
+        
+        Args:
+            pairs: List of (JobSummary, CandidateProfile) pairs
+            
+        Returns:
+            List of MatchResult objects in the same order as the input
+        """
+        initial_states = [
+            {"job_summary": job_summary, "candidate_profile": candidate_profile}
+            for job_summary, candidate_profile in pairs
+        ]
+        
+        # Fan the workflow runs out to Ollama
+        results = self.workflow.batch(initial_states, config={"max_concurrency": RECRUIT_CONCURRENCY})
+        
+        # Skills are matched once per distinct job, for all of its candidates together
+        pair_indices: Dict[int, List[int]] = {}
+        for i, (job_summary, _) in enumerate(pairs):
+            pair_indices.setdefault(id(job_summary), []).append(i)
+        
+        match_results: List[Optional[MatchResult]] = [None] * len(pairs)
+        for indices in pair_indices.values():
+            converted = self._match_results(
+                pairs[indices[0]][0], [pairs[i][1] for i in indices], [results[i] for i in indices]
+            )
+            for i, match_result in zip(indices, converted):
+                match_results[i] = match_result
+        return match_results
+    
+    def calculate_match_batch(self, job_summary: JobSummary, candidate_profiles: List[CandidateProfile]) -> List[MatchResult]:
+        """
+        Score many candidates against one job using batched prompts
+        
+        Candidates are sent MATCH_BATCH_SIZE at a time, so N candidates cost
+        ceil(N / MATCH_BATCH_SIZE) model calls instead of N.
+        
+        Args:
+            job_summary: JobSummary object with job details
+            candidate_profiles: Candidates to score
+            
+        Returns:
+            List of MatchResult objects in the same order as the candidates
+        """
+        # Semantic scores for every candidate come from one matrix product
+        semantic_scores = [
+            None if np.isnan(score) else float(score) * 100
+            for score in self.semantic_scores(job_summary, candidate_profiles)
+        ]
+        
+        # Skill matches for every candidate come from one matrix product as well
+        skill_matches = self.skill_matches(job_summary, candidate_profiles)
+        
+        results = []
+        for start in range(0, len(candidate_profiles), MATCH_BATCH_SIZE):
+            end = start + MATCH_BATCH_SIZE
+            results.extend(self._calculate_match_chunk(
+                job_summary, candidate_profiles[start:end], semantic_scores[start:end], skill_matches[start:end]
+            ))
+        return results
+    
+    def _calculate_match_chunk(self, job_summary: JobSummary, candidate_profiles: List[CandidateProfile],
+                               semantic_scores: List[Optional[float]],
+                               skill_matches: List[Optional[Dict[str, Any]]]) -> List[MatchResult]:
+        """Score one batch of candidates in a single model call"""
+        input_data = {
+            **_job_prompt_fields(job_summary),
+            "candidates": "\n\n".join(
+                _candidate_block(i + 1, profile, score)
+                for i, (profile, score) in enumerate(zip(candidate_profiles, semantic_scores))
+            )
+        }
+        
+        try:
+            breakdowns = _MATCH_BATCH_CHAIN.invoke(input_data).results
+            if len(breakdowns) != len(candidate_profiles):
+                raise ValueError("response does not contain one result per candidate")
+        except NODE_ERRORS as e:
+            # Fall back to one call per candidate
+            logger.warning(f"Batch match failed, scoring candidates individually: {str(e)}")
+            return [self.calculate_match(job_summary, profile) for profile in candidate_profiles]
+        
+        return [
+            self._to_match_result(_match_update(breakdown, score), skill_match)
+            for breakdown, score, skill_match in zip(breakdowns, semantic_scores, skill_matches)
+        ]
+    
+    def rank(self, job_summary: JobSummary, candidate_profiles: List[CandidateProfile],
+             top_k: int = MATCH_EXPLAIN_TOP_K) -> List[Tuple[int, MatchResult]]:
+        """
+        Rank candidates for a job, generating the full breakdown only for the top candidates
+        
+        Every candidate gets a score: the semantic score where embeddings are available,
+        otherwise a score-only model call. The breakdown prompt then runs for the
+        top_k candidates only.
+        
+        Args:
+            job_summary: JobSummary object with job details
+            candidate_profiles: Candidates to rank
+            top_k: Number of top candidates to explain
+            
+        Returns:
+            List of (candidate index, MatchResult) pairs sorted by descending score;
+            results past top_k carry only the score and the skills match
+        """
+        semantic_scores = [
+            None if np.isnan(score) else float(score) * 100
+            for score in self.semantic_scores(job_summary, candidate_profiles)
+        ]
+        
+        # Candidates without a semantic score fall back to the score-only prompt
+        scores = [0.0 if score is None else score / 100 for score in semantic_scores]
+        unscored = [i for i, score in enumerate(semantic_scores) if score is None]
+        if unscored:
+            for i, score in zip(unscored, _score_only(job_summary, [candidate_profiles[i] for i in unscored])):
+                scores[i] = score
+        
+        order = sorted(range(len(candidate_profiles)), key=lambda i: scores[i], reverse=True)
+        skill_matches = self.skill_matches(job_summary, candidate_profiles)
+        
+        ranked = []
+        for position, i in enumerate(order):
+            if position < top_k:
+                state = {"job_summary": job_summary, "candidate_profile": candidate_profiles[i]}
+                # _explain falls back to a default breakdown on model errors
+                update = _match_update(_explain(state, semantic_scores[i]), semantic_scores[i])
+                # Keep the ranking score so the order stays consistent with the result
+                update["match_score"] = scores[i]
+            else:
+                update = {"match_score": scores[i]}
+            ranked.append((i, self._to_match_result(update, skill_matches[i])))
+        return ranked
+    
+    def semantic_scores(self, job_summary: JobSummary, candidate_profiles: List[CandidateProfile]) -> np.ndarray:
+        """
+        Calculate the semantic similarity of many candidates to one job
+        
+        Candidate embeddings are stacked into one L2-normalized matrix so all
+        scores come from a single matrix-vector product. Candidates embedded before
+        are read from the persistent embedding cache in one query.
+        
+        Args:
+            job_summary: JobSummary object with job details
+            candidate_profiles: Candidates to score
+            
+        Returns:
+            Array of similarity scores between 0 and 1, NaN where an embedding is unavailable
+        """
+        from utils import generate_embedding_matrix
+        
+        job_vector = generate_embedding_matrix([_job_embedding_text(job_summary)])[0]
+        candidate_matrix = generate_embedding_matrix([_candidate_embedding_text(profile) for profile in candidate_profiles])
+        
+        scores = np.full(len(candidate_profiles), np.nan, dtype=np.float32)
+        if not job_vector.any() or candidate_matrix.shape[1] != job_vector.shape[0]:
+            return scores
+        
+        # Rows of failed embeddings are all zeros
+        valid = candidate_matrix.any(axis=1)
+        similarities = self.calculate_similarity_matrix(job_vector[np.newaxis, :], candidate_matrix[valid])[0]
+        scores[valid] = np.clip(similarities, 0.0, 1.0)
+        return scores
+    
+    def skill_matches(self, job_summary: JobSummary,
+                      candidate_profiles: List[CandidateProfile]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Match each required skill of a job to the closest skill of every candidate
+        
+        Every skill is embedded once (repeats are served from the embedding cache), and the
+        similarities of all required skills to all candidates' skills come from one matrix product.
+        
+        Args:
+            job_summary: JobSummary object with job details
+            candidate_profiles: Candidates to compare
+            
+        Returns:
+            Per candidate, a dict with the skills score (0-1, the mean best similarity over the
+            required skills), the matched and the missing required skills; None where the
+            candidate lists no skills or embeddings are unavailable
+        """
+        from utils import generate_embedding_matrix
+        
+        required_skills = list(dict.fromkeys(job_summary.required_skills))
+        matches: List[Optional[Dict[str, Any]]] = [None] * len(candidate_profiles)
+        if not required_skills:
+            return matches
+        
+        # Column of each candidate skill in the skill matrix, candidate by candidate
+        skill_columns: Dict[str, int] = {}
+        columns, starts, matched_candidates = [], [], []
+        for i, candidate_profile in enumerate(candidate_profiles):
+            if not candidate_profile.skills:
+                continue
+            starts.append(len(columns))
+            matched_candidates.append(i)
+            columns.extend(skill_columns.setdefault(skill, len(skill_columns)) for skill in candidate_profile.skills)
+        if not columns:
+            return matches
+        
+        # One embedding request for the required skills and every distinct candidate skill
+        matrix = generate_embedding_matrix(required_skills + list(skill_columns))
+        if not matrix.any():
+            return matches
+        required_matrix, skill_matrix = matrix[:len(required_skills)], matrix[len(required_skills):]
+        
+        # (required skills, distinct skills) similarities, expanded to each candidate's skills in order,
+        # then the best similarity per required skill within each candidate's run of columns
+        similarities = np.clip(required_matrix @ skill_matrix.T, 0.0, 1.0)[:, columns]
+        best = np.maximum.reduceat(similarities, starts, axis=1)
+        
+        for column, i in enumerate(matched_candidates):
+            scores = best[:, column]
+            found = scores >= SKILL_MATCH_THRESHOLD
+            matches[i] = {
+                "score": round(float(scores.mean()), 4),
+                "matched_skills": [skill for skill, hit in zip(required_skills, found) if hit],
+                "missing_skills": [skill for skill, hit in zip(required_skills, found) if not hit]
+            }
+        return matches
+    
+    @staticmethod
+    def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+        """
+        Indices of the k highest scores, best first
+        
+        Partitions the scores in O(N) and sorts only the k selected entries,
+        instead of sorting all N.
+        
+        Args:
+            scores: Score array, e.g. one row of calculate_similarity_matrix
+            k: Number of indices to return
+            
+        Returns:
+            int array of at most k indices into scores, by descending score
+        """
+        scores = np.asarray(scores)
+        if k <= 0:
+            return np.empty(0, dtype=np.intp)
+        if k >= len(scores):
+            return np.argsort(-scores, kind="stable")
+        top = np.argpartition(-scores, k - 1)[:k]
+        return top[np.argsort(-scores[top], kind="stable")]
+    
+    def calculate_similarity_matrix(self, job_vecs: np.ndarray, cand_vecs: np.ndarray) -> np.ndarray:
+        """
+        Calculate cosine similarity between every job and every candidate embedding
+        
+        Embeddings are L2-normalized when they are generated and stored, so cosine
+        similarity is a plain dot product with no per-call norms. Uses SimSIMD when
+        installed, then Numba, then numpy.
+        
+        Args:
+            job_vecs: Unit-length (or zero) job embeddings, shape (n_jobs, dim)
+            cand_vecs: Unit-length (or zero) candidate embeddings, shape (n_candidates, dim)
+            
+        Returns:
+            float32 array of shape (n_jobs, n_candidates); zero vectors have similarity 0
+        """
+        return _dot_matrix(np.asarray(job_vecs, dtype=np.float32), np.asarray(cand_vecs, dtype=np.float32))
+    
+    def candidate_embedding(self, candidate_profile: CandidateProfile) -> np.ndarray:
+        """
+        Compute a candidate's normalized embedding for storage, e.g. at ingest time
+        
+        Args:
+            candidate_profile: CandidateProfile object with candidate details
+            
+        Returns:
+            float16 embedding vector, all zeros if the embedding is unavailable
+        """
+        return self.profile_embeddings([candidate_profile])[0]
+    
+    def profile_embeddings(self, candidate_profiles: List[CandidateProfile]) -> np.ndarray:
+        """
+        Compute normalized embeddings for several candidates with one embedding request
+        
+        Args:
+            candidate_profiles: Candidates to embed
+            
+        Returns:
+            float16 array with one row per candidate, all zeros where the embedding is unavailable
+        """
+        from utils import generate_embedding_matrix
+        texts = [_candidate_embedding_text(profile) for profile in candidate_profiles]
+        return generate_embedding_matrix(texts).astype(EMBEDDING_STORAGE_DTYPE)
+    
+    def job_embedding(self, job_summary: JobSummary) -> np.ndarray:
+        """
+        Compute a job's normalized embedding for storage, e.g. at ingest time
+        
+        Args:
+            job_summary: JobSummary object with job details
+            
+        Returns:
+            float16 embedding vector, all zeros if the embedding is unavailable
+        """
+        from utils import generate_embedding_matrix
+        return generate_embedding_matrix([_job_embedding_text(job_summary)])[0].astype(EMBEDDING_STORAGE_DTYPE)
+    
+    def _match_results(self, job_summary: JobSummary, candidate_profiles: List[CandidateProfile],
+                       results: List[Dict[str, Any]]) -> List[MatchResult]:
+        """Create MatchResult objects for one job's candidates, with the embedding-based skills match"""
+        skill_matches = self.skill_matches(job_summary, candidate_profiles)
+        return [self._to_match_result(result, skill_match) for result, skill_match in zip(results, skill_matches)]
+    
+    @staticmethod
+    def _to_match_result(result: Dict[str, Any], skill_match: Optional[Dict[str, Any]] = None) -> MatchResult:
+        """
+        Create a MatchResult object from a workflow result
+        
+        Every scoring path converts its results here, so skill_match, the entry for the
+        candidate from skill_matches, replaces the model's skills score consistently.
+        """
         # Check for errors
         if result.get("error"):
             return MatchResult(
@@ -761,7 +1542,7 @@ class MatchingAgent:
                 explanation="Error analyzing match"
             )
         
-        # Create MatchResult object from workflow result
+        result = _with_skill_match(result, skill_match)
         return MatchResult(
             score=result.get("match_score", 0.0),
             skills_match=result.get("skills_match", {}),
@@ -770,19 +1551,34 @@ class MatchingAgent:
             explanation=result.get("explanation", "")
         )
     
-    def generate_embeddings(self, text: str) -> List[float]:
+    def generate_embeddings(self, text: str) -> Optional[List[float]]:
         """
         Generate embeddings for the provided text using Ollama's nomic embeddings model
         
+        Repeated texts are served from the in-memory and SQLite embedding caches.
+        
         Args:
             text: Text to embed
             
         Returns:
-            List of floats representing the embedding vector
+            List of floats representing the embedding vector, or None if it is unavailable
         """
         from utils import generate_embedding
         return generate_embedding(text)
     
+    def generate_embeddings_batch(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """
+        Generate embeddings for several texts with batched Ollama requests
+        
+        Args:
+            texts: Texts to embed
+            
+        Returns:
+            One embedding (or None on error) per text, in the same order as the input
+        """
+        from utils import generate_embeddings_batch
+        return generate_embeddings_batch(texts)
+    
     def calculate_similarity(self, vec1: List[float], vec2: List[float]) -> float:
         """
         Calculate cosine similarity between two embedding vectors
@@ -801,7 +1597,7 @@ class SchedulingAgent:
     """Agent for scheduling interviews and generating personalized interview requests"""
     
     def __init__(self):
-        self.workflow = create_scheduling_workflow()
+        self.workflow = _SCHEDULING_WORKFLOW
     
     def generate_interview_slots(self, n_slots: int = 3, start_date: Optional[datetime] = None) -> List[Dict[str, Any]]:
         """Generate possible interview time slots"""
@@ -832,10 +1628,85 @@ class SchedulingAgent:
         # Run the workflow
         result = self.workflow.invoke(initial_state)
         
-        # Create InterviewSchedule object
+        return self._to_interview_schedule(interview_slots, result)
+    
+    async def acreate_interview_request(self, job_summary: JobSummary, candidate_profile: CandidateProfile, 
+                                        match_result: MatchResult, interview_slots: List[Dict[str, Any]]) -> InterviewSchedule:
+        """Async variant of create_interview_request"""
+        result = await self.workflow.ainvoke({
+            "job_summary": job_summary,
+            "candidate_profile": candidate_profile,
+            "match_result": match_result,
+            "interview_slots": interview_slots
+        })
+        return self._to_interview_schedule(interview_slots, result)
+    
+    async def acreate_interview_requests(self, job_summary: JobSummary,
+                                         candidates: List[Tuple[CandidateProfile, MatchResult]],
+                                         interview_slots: List[Dict[str, Any]]) -> List[InterviewSchedule]:
+        """
+        Generate interview requests for several candidates of one job concurrently
+        
+        Args:
+            job_summary: Job details
+            candidates: (CandidateProfile, MatchResult) pair for each candidate
+            interview_slots: Available interview slots
+            
+        Returns:
+            List of InterviewSchedule objects in the same order as the candidates
+        """
+        semaphore = asyncio.Semaphore(RECRUIT_CONCURRENCY)
+        
+        async def request(candidate_profile: CandidateProfile, match_result: MatchResult) -> InterviewSchedule:
+            async with semaphore:
+                return await self.acreate_interview_request(job_summary, candidate_profile, match_result, interview_slots)
+        
+        return await asyncio.gather(*[request(profile, match_result) for profile, match_result in candidates])
+    
+    def stream_email(self, job_summary: JobSummary, candidate_profile: CandidateProfile, 
+                     match_result: MatchResult, interview_slots: List[Dict[str, Any]]) -> Iterator[str]:
+        """
+        Stream a personalized interview request email as it is generated
+        
+        Args:
+            job_summary: Job details
+            candidate_profile: Candidate details
+            match_result: Match analysis results
+            interview_slots: Available interview slots
+            
+        Returns:
+            Iterator over chunks of the email text
+        """
+        state = {
+            "job_summary": job_summary,
+            "candidate_profile": candidate_profile,
+            "match_result": match_result,
+            "interview_slots": interview_slots
+        }
+        return _EMAIL_CHAIN.stream(_email_input(state))
+    
+    @staticmethod
+    def _to_interview_schedule(interview_slots: List[Dict[str, Any]], result: Dict[str, Any]) -> InterviewSchedule:
+        """Create an InterviewSchedule object from a workflow result"""
         return InterviewSchedule(
             candidate_id=-1,  # Will be replaced with actual ID
             job_id=-1,        # Will be replaced with actual ID
             suggested_slots=interview_slots,
             email_template=result.get("email_template", "")
-        ) 
\ No newline at end of file
+        )
+
+async def score_candidates_async(job_summary: JobSummary, candidate_profiles: List[CandidateProfile],
+                                 agent: Optional[MatchingAgent] = None) -> List[MatchResult]:
+    """
+    Score many candidates against one job concurrently
+    
+    Args:
+        job_summary: Job details
+        candidate_profiles: Candidates to score
+        agent: MatchingAgent to use (a new one is created if omitted)
+        
+    Returns:
+        List of MatchResult objects in the same order as the candidates
+    """
+    agent = agent or MatchingAgent()
+    return await agent.acalculate_matches(job_summary, candidate_profiles)
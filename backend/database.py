@@ -1,257 +1,860 @@
+import os
 import sqlite3
-from datetime import datetime
-from typing import Dict, List, Optional, Any
+import threading
+import queue
+from contextlib import contextmanager
+import numpy as np
+import orjson
+import zstandard
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Any, Tuple, Iterator
+
+# Rows fetched per round-trip when iterating over a whole table
+ITER_BATCH_SIZE = 1000
+
+# Read connections kept open for concurrent readers
+READ_POOL_SIZE = int(os.environ.get("DB_READ_POOL_SIZE", "8"))
+
+# Page cache per connection in KiB, so hot tables stay in memory between queries
+CACHE_SIZE_KB = int(os.environ.get("DB_CACHE_SIZE_KB", "65536"))
+
+# A LIMIT of -1 makes SQLite return every row
+NO_LIMIT = -1
+
+# PRAGMA user_version from which interview times are stored as epoch seconds
+_SCHEMA_EPOCH_INTERVIEW_TIMES = 1
+
+# Read queries are module constants so sqlite3's per-connection statement cache
+# reuses their prepared statements instead of parsing and planning them on every call
+_SQL_GET_JOB = "SELECT * FROM job_descriptions WHERE id = ?"
+_SQL_ITER_JOBS = "SELECT * FROM job_descriptions ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?"
+_SQL_GET_CANDIDATE = "SELECT * FROM candidates WHERE id = ?"
+# The IDs are bound as one JSON array, so any number of them uses the same prepared statement
+_SQL_GET_CANDIDATES = "SELECT * FROM candidates WHERE id IN (SELECT value FROM json_each(?))"
+_SQL_ITER_CANDIDATES = "SELECT * FROM candidates ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?"
+_SQL_ITER_READY_CANDIDATES = """
+    SELECT * FROM candidates WHERE processing_status = 'ready'
+    ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?
+"""
+_SQL_CANDIDATE_EMBEDDING_VERSIONS = "SELECT id, version FROM candidates WHERE embedding IS NOT NULL"
+_SQL_GET_CANDIDATE_EMBEDDINGS = """
+    SELECT id, version, embedding, embedding_scale, embedding_compressed FROM candidates
+    WHERE embedding IS NOT NULL AND id IN (SELECT value FROM json_each(?))
+"""
+_SQL_MATCHES_BY_JOB = """
+    SELECT ms.*, c.name AS candidate_name, c.email AS candidate_email
+    FROM match_scores ms
+    JOIN candidates c ON ms.candidate_id = c.id
+    WHERE ms.job_id = ?
+    ORDER BY ms.score DESC, ms.id
+    LIMIT ? OFFSET ?
+"""
+_SQL_TOP_MATCHES = """
+    SELECT ms.*, c.name AS candidate_name, c.email AS candidate_email
+    FROM match_scores ms
+    JOIN candidates c ON ms.candidate_id = c.id
+    WHERE ms.job_id = ? AND ms.skills_score >= ?
+    ORDER BY ms.score DESC, ms.id
+    LIMIT ? OFFSET ?
+"""
+_SQL_MATCHES_BY_CANDIDATE = """
+    SELECT ms.*, jd.title AS job_title
+    FROM match_scores ms
+    JOIN job_descriptions jd ON ms.job_id = jd.id
+    WHERE ms.candidate_id = ?
+    ORDER BY ms.score DESC, ms.id
+    LIMIT ? OFFSET ?
+"""
+_SQL_MATCH_SUMMARY = "SELECT COUNT(*) AS total, AVG(score) AS average FROM match_scores WHERE job_id = ?"
+_SQL_TOP_CANDIDATES = """
+    SELECT c.id AS candidate_id, c.name AS candidate_name, ms.score
+    FROM match_scores ms
+    JOIN candidates c ON ms.candidate_id = c.id
+    WHERE ms.job_id = ?
+    ORDER BY ms.score DESC, ms.id
+    LIMIT ?
+"""
+_SQL_MATCH_FOR_PAIR = """
+    SELECT ms.*, jd.title AS job_title, c.name AS candidate_name, c.email AS candidate_email
+    FROM match_scores ms
+    JOIN job_descriptions jd ON ms.job_id = jd.id
+    JOIN candidates c ON ms.candidate_id = c.id
+    WHERE ms.job_id = ? AND ms.candidate_id = ?
+"""
+_SQL_INTERVIEWS_BY_JOB = """
+    SELECT i.*, c.name AS candidate_name, c.email AS candidate_email,
+           jd.title AS job_title
+    FROM interviews i
+    JOIN candidates c ON i.candidate_id = c.id
+    JOIN job_descriptions jd ON i.job_id = jd.id
+    WHERE i.job_id = ?
+    ORDER BY i.scheduled_time
+"""
+_SQL_GET_INTERVIEW = """
+    SELECT i.*, c.name AS candidate_name, c.email AS candidate_email,
+           jd.title AS job_title
+    FROM interviews i
+    JOIN candidates c ON i.candidate_id = c.id
+    JOIN job_descriptions jd ON i.job_id = jd.id
+    WHERE i.id = ?
+"""
+_SQL_INTERVIEWS_BY_CANDIDATE = """
+    SELECT i.*, jd.title AS job_title
+    FROM interviews i
+    JOIN job_descriptions jd ON i.job_id = jd.id
+    WHERE i.candidate_id = ?
+    ORDER BY i.scheduled_time
+"""
+# The CV is not parsed yet, so the row starts out 'processing' until update_candidate_profile marks it 'ready'
+_SQL_UPSERT_CANDIDATE = """
+    INSERT INTO candidates (name, email, phone, cv_path, processing_status) VALUES (?, ?, ?, ?, 'processing')
+    ON CONFLICT(email) DO UPDATE SET
+        name = excluded.name, phone = excluded.phone, cv_path = excluded.cv_path,
+        processing_status = 'processing', version = version + 1
+    RETURNING id
+"""
+_SQL_UPSERT_PROCESSED_CANDIDATE = """
+    INSERT INTO candidates
+    (name, email, phone, cv_path, education, work_experience, skills, certifications,
+     embedding, embedding_scale, embedding_compressed)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 1)
+    ON CONFLICT(email) DO UPDATE SET
+        name = excluded.name, phone = excluded.phone, cv_path = excluded.cv_path,
+        education = excluded.education, work_experience = excluded.work_experience,
+        skills = excluded.skills, certifications = excluded.certifications,
+        embedding = excluded.embedding, embedding_scale = excluded.embedding_scale,
+        embedding_compressed = excluded.embedding_compressed, processing_status = 'ready',
+        version = version + 1
+    RETURNING id
+"""
+_SQL_UPSERT_MATCH_SCORE = """
+    INSERT INTO match_scores
+    (job_id, candidate_id, score, skills_match, experience_match, education_match)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(job_id, candidate_id) DO UPDATE SET
+        score = excluded.score, skills_match = excluded.skills_match,
+        experience_match = excluded.experience_match, education_match = excluded.education_match,
+        created_at = CURRENT_TIMESTAMP
+    RETURNING id
+"""
+_SQL_GET_CACHED_EMBEDDING = "SELECT vector FROM embedding_cache WHERE hash = ?"
+# Near-duplicate candidates come from the indexed SimHash bands; only those rows are compared bit by bit
+_SQL_NEAREST_CACHED_EMBEDDINGS = """
+    SELECT text, vector, distance FROM (
+        SELECT text, vector, hamming(simhash, ?) AS distance FROM embedding_cache
+        WHERE hash IN (
+            SELECT hash FROM embedding_cache WHERE model = ? AND simhash_band0 = ?
+            UNION SELECT hash FROM embedding_cache WHERE model = ? AND simhash_band1 = ?
+            UNION SELECT hash FROM embedding_cache WHERE model = ? AND simhash_band2 = ?
+            UNION SELECT hash FROM embedding_cache WHERE model = ? AND simhash_band3 = ?
+        )
+    )
+    WHERE distance <= ?
+    ORDER BY distance
+    LIMIT ?
+"""
+_SQL_ADD_CACHED_EMBEDDING = (
+    "INSERT OR REPLACE INTO embedding_cache (hash, model, dim, vector, simhash, text) VALUES (?, ?, ?, ?, ?, ?)"
+)
+
+def _match_score_row(job_id: int, candidate_id: int, score: float, skills_match: Dict[str, Any],
+                     experience_match: Dict[str, Any], education_match: Dict[str, Any]) -> Tuple:
+    """Build a match_scores row, serializing each breakdown once as compact JSON"""
+    return (
+        job_id, candidate_id, score,
+        orjson.dumps(skills_match).decode(),
+        orjson.dumps(experience_match).decode(),
+        orjson.dumps(education_match).decode()
+    )
+
+# zstd level 1 compressors are not thread-safe, so each thread keeps its own pair
+_zstd = threading.local()
+
+def compress_embedding(embedding: Optional[bytes]) -> Optional[bytes]:
+    """Compress stored embedding bytes with zstd level 1"""
+    if embedding is None:
+        return None
+    if not hasattr(_zstd, "compressor"):
+        _zstd.compressor = zstandard.ZstdCompressor(level=1)
+    return _zstd.compressor.compress(embedding)
+
+def _decompress_embedding(embedding: bytes) -> bytes:
+    """Decompress embedding bytes written by compress_embedding"""
+    if not hasattr(_zstd, "decompressor"):
+        _zstd.decompressor = zstandard.ZstdDecompressor()
+    return _zstd.decompressor.decompress(embedding)
+
+def decode_embedding(embedding: bytes, scale: Optional[float], compressed: bool = False) -> np.ndarray:
+    """
+    Decode an embedding stored in the database to float32
+    
+    Args:
+        embedding: Stored vector bytes
+        scale: int8 quantization scale; None for vectors stored before quantization (float16)
+        compressed: Whether the bytes are zstd-compressed; rows stored before compression are raw
+        
+    Returns:
+        float32 embedding vector
+    """
+    if compressed:
+        embedding = _decompress_embedding(embedding)
+    if scale is None:
+        return np.frombuffer(embedding, dtype=np.float16).astype(np.float32)
+    return np.frombuffer(embedding, dtype=np.int8) * np.float32(scale)
+
+def to_epoch(value: datetime) -> int:
+    """Unix epoch seconds of a datetime, taking naive datetimes as UTC"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+def from_epoch(value: int) -> datetime:
+    """Naive UTC datetime of stored epoch seconds, only for callers that need a datetime"""
+    return datetime.fromtimestamp(value, tz=timezone.utc).replace(tzinfo=None)
+
+# The 64-bit SimHash is split into this many 16-bit bands, each an indexed column. Two hashes within
+# SIMHASH_BANDS - 1 bits of each other agree on at least one whole band, so a band match finds them all.
+SIMHASH_BANDS = 4
+
+def _simhash_bands(simhash: int) -> List[int]:
+    """The 16-bit bands of a signed 64-bit SimHash, as computed by the simhash_band columns"""
+    return [(simhash >> (16 * band)) & 0xFFFF for band in range(SIMHASH_BANDS)]
+
+def _hamming(left: int, right: int) -> int:
+    """Number of differing bits between two 64-bit SimHashes, registered as the SQL function hamming()"""
+    return bin((left ^ right) & 0xFFFFFFFFFFFFFFFF).count("1")
+
+def _connect(db_path: str) -> sqlite3.Connection:
+    """Open a connection that may be handed between threads, with the WAL PRAGMAs applied"""
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    # WAL lets readers proceed while a write is in progress
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    # A negative cache_size is in KiB rather than pages
+    conn.execute(f"PRAGMA cache_size=-{CACHE_SIZE_KB}")
+    conn.execute("PRAGMA mmap_size=268435456")
+    conn.create_function("hamming", 2, _hamming, deterministic=True)
+    return conn
+
+class _ConnectionPool:
+    """Fixed-size pool of read connections, opened on demand"""
+    
+    def __init__(self, db_path: str, size: int):
+        self.db_path = db_path
+        self.size = size
+        self._idle: "queue.Queue[sqlite3.Connection]" = queue.Queue(maxsize=size)
+        self._opened = 0
+        self._lock = threading.Lock()
+    
+    @contextmanager
+    def acquire(self) -> Iterator[sqlite3.Connection]:
+        """Check out a connection, waiting for one to be returned when all are in use"""
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                opened = self._opened < self.size
+                if opened:
+                    self._opened += 1
+            conn = _connect(self.db_path) if opened else self._idle.get()
+        
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+class _EmbeddingMatrix:
+    """
+    Unit-length float32 embeddings of one dimension in one growable matrix, one row per ID
+    
+    Rows handed out by snapshot() are never written again: appends go past them, and
+    replacing or removing a row first copies the arrays.
+    """
+    
+    def __init__(self, dim: int):
+        self.dim = dim
+        self.ids = np.empty(0, dtype=np.int64)
+        self.matrix = np.empty((0, dim), dtype=np.float32)
+        self.count = 0
+        # Sum of the rows, so their mean is available without touching the matrix
+        self.total = np.zeros(dim, dtype=np.float64)
+        self.rows: Dict[int, int] = {}
+        # Row version last loaded per ID, including IDs whose embedding has another dimension
+        self.versions: Dict[int, int] = {}
+    
+    def put(self, row_id: int, vector: np.ndarray):
+        """Add or replace the embedding of an ID, normalized so similarity is a plain dot product"""
+        row = self.rows.get(row_id)
+        if row is None:
+            if self.count == len(self.ids):
+                # Double the capacity so appends are amortized O(dim)
+                capacity = max(64, 2 * len(self.ids))
+                self.ids = np.resize(self.ids, capacity)
+                self.matrix = np.concatenate([self.matrix, np.empty((capacity - len(self.matrix), self.dim), dtype=np.float32)])
+            row = self.count
+            self.count += 1
+            self.rows[row_id] = row
+            self.ids[row] = row_id
+        else:
+            self.matrix = self.matrix.copy()
+            self.total -= self.matrix[row]
+        
+        norm = np.linalg.norm(vector)
+        self.matrix[row] = vector / norm if norm > 0 else 0.0
+        self.total += self.matrix[row]
+    
+    def remove(self, row_id: int):
+        """Drop the embedding of an ID by moving the last row into its place"""
+        row = self.rows.pop(row_id, None)
+        if row is None:
+            return
+        
+        self.ids, self.matrix = self.ids.copy(), self.matrix.copy()
+        self.total -= self.matrix[row]
+        last = self.count - 1
+        if row != last:
+            self.ids[row] = self.ids[last]
+            self.matrix[row] = self.matrix[last]
+            self.rows[int(self.ids[row])] = row
+        self.count = last
+    
+    def snapshot(self) -> Tuple[np.ndarray, np.ndarray]:
+        """The current IDs and rows"""
+        return self.ids[:self.count], self.matrix[:self.count]
+    
+    def mean(self) -> Optional[np.ndarray]:
+        """Mean of the rows, None when there are none"""
+        if self.count == 0:
+            return None
+        return (self.total / self.count).astype(np.float32)
 
 class Database:
     def __init__(self, db_path: str = "recruitment.db"):
         self.db_path = db_path
+        # Reads share a pool of connections; WAL lets them run alongside the single writer
+        self._pool = _ConnectionPool(db_path, READ_POOL_SIZE)
+        self._writer = _connect(db_path)
+        self._write_lock = threading.Lock()
+        # Candidate embeddings decoded once and kept per dimension, refreshed from the row versions
+        self._embedding_matrices: Dict[int, _EmbeddingMatrix] = {}
+        self._embedding_matrix_lock = threading.Lock()
         self.initialize_db()
-        
-    def get_connection(self):
-        """Create and return a database connection"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+    
+    @contextmanager
+    def reader(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a read connection from the pool"""
+        with self._pool.acquire() as conn:
+            yield conn
+    
+    @contextmanager
+    def writer(self) -> Iterator[sqlite3.Connection]:
+        """Use the writer connection, one thread at a time"""
+        with self._write_lock:
+            yield self._writer
     
     def initialize_db(self):
         """Initialize the database with required tables"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        # Create JobDescriptions table
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS job_descriptions (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            title TEXT NOT NULL,
-            original_description TEXT NOT NULL,
-            summarized_description TEXT,
-            required_skills TEXT,
-            required_experience TEXT,
-            responsibilities TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-        ''')
-        
-        # Create Candidates table
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS candidates (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            email TEXT UNIQUE,
-            phone TEXT,
-            education TEXT,
-            work_experience TEXT,
-            skills TEXT,
-            certifications TEXT,
-            cv_path TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-        ''')
-        
-        # Create MatchScores table
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS match_scores (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            job_id INTEGER NOT NULL,
-            candidate_id INTEGER NOT NULL,
-            score REAL NOT NULL,
-            skills_match TEXT,
-            experience_match TEXT,
-            education_match TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (job_id) REFERENCES job_descriptions (id),
-            FOREIGN KEY (candidate_id) REFERENCES candidates (id)
-        )
-        ''')
-        
-        # Create Interviews table
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS interviews (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            job_id INTEGER NOT NULL,
-            candidate_id INTEGER NOT NULL,
-            scheduled_time TIMESTAMP,
-            duration_minutes INTEGER DEFAULT 60,
-            interview_link TEXT,
-            status TEXT DEFAULT 'scheduled',
-            notes TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (job_id) REFERENCES job_descriptions (id),
-            FOREIGN KEY (candidate_id) REFERENCES candidates (id)
-        )
-        ''')
-        
-        conn.commit()
-        conn.close()
+        with self.writer() as conn:
+            cursor = conn.cursor()
+            
+            # Create JobDescriptions table
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS job_descriptions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                title TEXT NOT NULL,
+                original_description TEXT NOT NULL,
+                summarized_description TEXT,
+                required_skills TEXT,
+                required_experience TEXT,
+                responsibilities TEXT,
+                embedding BLOB,
+                embedding_scale REAL,
+                embedding_compressed INTEGER DEFAULT 0,
+                processing_status TEXT DEFAULT 'ready',
+                version INTEGER DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            ''')
+            
+            # Create Candidates table
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS candidates (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                email TEXT UNIQUE,
+                phone TEXT,
+                education TEXT,
+                work_experience TEXT,
+                skills TEXT,
+                certifications TEXT,
+                cv_path TEXT,
+                embedding BLOB,
+                embedding_scale REAL,
+                embedding_compressed INTEGER DEFAULT 0,
+                processing_status TEXT DEFAULT 'ready',
+                version INTEGER DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            ''')
+            
+            # Add the embedding columns to tables created before they existed
+            self._add_missing_column(cursor, "job_descriptions", "embedding", "BLOB")
+            self._add_missing_column(cursor, "candidates", "embedding", "BLOB")
+            self._add_missing_column(cursor, "job_descriptions", "embedding_scale", "REAL")
+            self._add_missing_column(cursor, "candidates", "embedding_scale", "REAL")
+            self._add_missing_column(cursor, "job_descriptions", "embedding_compressed", "INTEGER DEFAULT 0")
+            self._add_missing_column(cursor, "candidates", "embedding_compressed", "INTEGER DEFAULT 0")
+            self._add_missing_column(cursor, "job_descriptions", "processing_status", "TEXT DEFAULT 'ready'")
+            self._add_missing_column(cursor, "candidates", "processing_status", "TEXT DEFAULT 'ready'")
+            # Bumped whenever a row's profile changes, so caches keyed on (id, version) never serve stale data
+            self._add_missing_column(cursor, "job_descriptions", "version", "INTEGER DEFAULT 0")
+            self._add_missing_column(cursor, "candidates", "version", "INTEGER DEFAULT 0")
+            
+            # Create MatchScores table
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS match_scores (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                job_id INTEGER NOT NULL,
+                candidate_id INTEGER NOT NULL,
+                score REAL NOT NULL,
+                skills_match TEXT,
+                experience_match TEXT,
+                education_match TEXT,
+                skills_score REAL GENERATED ALWAYS AS (json_extract(skills_match, '$.score')) VIRTUAL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (job_id) REFERENCES job_descriptions (id),
+                FOREIGN KEY (candidate_id) REFERENCES candidates (id)
+            )
+            ''')
+            
+            # Add the generated skills score column to match tables created before it existed
+            self._add_missing_column(
+                cursor, "match_scores", "skills_score",
+                "REAL GENERATED ALWAYS AS (json_extract(skills_match, '$.score')) VIRTUAL"
+            )
+            
+            # Create Interviews table
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS interviews (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                job_id INTEGER NOT NULL,
+                candidate_id INTEGER NOT NULL,
+                scheduled_time INTEGER,
+                duration_minutes INTEGER DEFAULT 60,
+                interview_link TEXT,
+                status TEXT DEFAULT 'scheduled',
+                notes TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (job_id) REFERENCES job_descriptions (id),
+                FOREIGN KEY (candidate_id) REFERENCES candidates (id)
+            )
+            ''')
+            
+            # Interview times are stored as epoch seconds; ISO text from older databases is converted once.
+            # Values strftime cannot parse are left as they are instead of becoming NULL
+            if cursor.execute("PRAGMA user_version").fetchone()[0] < _SCHEMA_EPOCH_INTERVIEW_TIMES:
+                cursor.execute(
+                    "UPDATE interviews SET scheduled_time = CAST(strftime('%s', scheduled_time) AS INTEGER) "
+                    "WHERE typeof(scheduled_time) = 'text' AND strftime('%s', scheduled_time) IS NOT NULL"
+                )
+                cursor.execute(f"PRAGMA user_version = {_SCHEMA_EPOCH_INTERVIEW_TIMES}")
+            
+            # One match row per job and candidate, so re-scoring upserts; databases from before the
+            # unique index may hold repeats, which are dropped once, just before the index is created
+            if not self._index_exists(cursor, "idx_match_job_candidate"):
+                cursor.execute(
+                    "DELETE FROM match_scores WHERE id NOT IN "
+                    "(SELECT MAX(id) FROM match_scores GROUP BY job_id, candidate_id)"
+                )
+                cursor.execute("CREATE UNIQUE INDEX idx_match_job_candidate ON match_scores(job_id, candidate_id)")
+            
+            # Indexes for the per-job and per-candidate listings, matching their ORDER BY
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_match_job_score ON match_scores(job_id, score DESC)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_match_cand_score ON match_scores(candidate_id, score DESC)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_match_job_skills ON match_scores(job_id, skills_score)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_interviews_job_time ON interviews(job_id, scheduled_time)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_interviews_cand_time ON interviews(candidate_id, scheduled_time)")
+            # Newest-first pages of jobs and candidates read the index instead of sorting the table
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_created ON job_descriptions(created_at DESC, id DESC)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_candidates_created ON candidates(created_at DESC, id DESC)")
+            
+            # Create EmbeddingCache table
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS embedding_cache (
+                hash BLOB PRIMARY KEY,
+                model TEXT NOT NULL,
+                dim INTEGER NOT NULL,
+                vector BLOB NOT NULL,
+                simhash INTEGER,
+                text TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            ''')
+            
+            # Near-duplicate lookup columns for caches created before the fuzzy layer
+            self._add_missing_column(cursor, "embedding_cache", "simhash", "INTEGER")
+            self._add_missing_column(cursor, "embedding_cache", "text", "TEXT")
+            
+            # Virtual columns are computed on read, so existing rows need no backfill; the indexes store them
+            for band in range(SIMHASH_BANDS):
+                self._add_missing_column(
+                    cursor, "embedding_cache", f"simhash_band{band}",
+                    f"INTEGER GENERATED ALWAYS AS ((simhash >> {16 * band}) & 65535) VIRTUAL"
+                )
+                cursor.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_embedding_cache_band{band} "
+                    f"ON embedding_cache(model, simhash_band{band})"
+                )
+            
+            conn.commit()
+    
+    @staticmethod
+    def _index_exists(cursor: sqlite3.Cursor, name: str) -> bool:
+        """Whether an index with this name exists"""
+        return cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?", (name,)).fetchone() is not None
+    
+    @staticmethod
+    def _add_missing_column(cursor: sqlite3.Cursor, table: str, column: str, column_type: str):
+        """Add a column to an existing table unless it is already there"""
+        columns = [row["name"] for row in cursor.execute(f"PRAGMA table_xinfo({table})")]
+        if column not in columns:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+    
+    def _iter_rows(self, query: str, params: Tuple = ()) -> Iterator[Dict]:
+        """Run a query and yield its rows as dicts, ITER_BATCH_SIZE rows at a time"""
+        # The reader stays checked out until the iteration finishes or the generator is closed
+        with self.reader() as conn:
+            cursor = conn.execute(query, params)
+            
+            while True:
+                rows = cursor.fetchmany(ITER_BATCH_SIZE)
+                if not rows:
+                    break
+                for row in rows:
+                    yield dict(row)
     
     # Job Description methods
     def add_job_description(self, title: str, description: str) -> int:
-        """Add a job description to the database and return its ID"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute(
-            "INSERT INTO job_descriptions (title, original_description) VALUES (?, ?)",
-            (title, description)
-        )
-        job_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
-        
-        return job_id
-    
-    def update_job_summary(self, job_id: int, summary: str, skills: str, experience: str, responsibilities: str) -> bool:
-        """Update job description with summarized information"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute(
-            """UPDATE job_descriptions 
-               SET summarized_description = ?, required_skills = ?, 
-                   required_experience = ?, responsibilities = ?
-               WHERE id = ?""",
-            (summary, skills, experience, responsibilities, job_id)
-        )
-        
-        success = cursor.rowcount > 0
-        conn.commit()
-        conn.close()
-        return success
+        """Add a job description to the database and return its ID; it is 'processing' until update_job_summary"""
+        with self.writer() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(
+                "INSERT INTO job_descriptions (title, original_description, processing_status) VALUES (?, ?, 'processing')",
+                (title, description)
+            )
+            job_id = cursor.lastrowid
+            conn.commit()
+            
+            return job_id
+    
+    def update_job_summary(self, job_id: int, summary: str, skills: str, experience: str, responsibilities: str,
+                           embedding: Optional[bytes] = None, embedding_scale: Optional[float] = None) -> bool:
+        """Update job description with summarized information and its int8 embedding vector and scale, stored zstd-compressed"""
+        with self.writer() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(
+                """UPDATE job_descriptions 
+                   SET summarized_description = ?, required_skills = ?, 
+                       required_experience = ?, responsibilities = ?, embedding = ?, embedding_scale = ?,
+                       embedding_compressed = 1, processing_status = 'ready', version = version + 1
+                   WHERE id = ?""",
+                (summary, skills, experience, responsibilities, compress_embedding(embedding), embedding_scale, job_id)
+            )
+            
+            success = cursor.rowcount > 0
+            conn.commit()
+            return success
+    
+    def set_job_status(self, job_id: int, status: str) -> bool:
+        """Set the processing status of a job description: 'processing', 'ready' or 'failed'"""
+        with self.writer() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("UPDATE job_descriptions SET processing_status = ? WHERE id = ?", (status, job_id))
+            
+            success = cursor.rowcount > 0
+            conn.commit()
+            return success
     
     def get_job_description(self, job_id: int) -> Optional[Dict]:
         """Retrieve a job description by ID"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("SELECT * FROM job_descriptions WHERE id = ?", (job_id,))
-        row = cursor.fetchone()
-        conn.close()
+        with self.reader() as conn:
+            row = conn.execute(_SQL_GET_JOB, (job_id,)).fetchone()
         
         if row:
             return dict(row)
         return None
     
-    def get_all_job_descriptions(self) -> List[Dict]:
-        """Retrieve all job descriptions"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("SELECT * FROM job_descriptions ORDER BY created_at DESC")
-        rows = cursor.fetchall()
-        conn.close()
-        
-        return [dict(row) for row in rows]
+    def iter_job_descriptions(self, limit: int = NO_LIMIT, offset: int = 0) -> Iterator[Dict]:
+        """Iterate over job descriptions, newest first, without loading the whole table"""
+        return self._iter_rows(_SQL_ITER_JOBS, (limit, offset))
+    
+    def get_all_job_descriptions(self, limit: int = NO_LIMIT, offset: int = 0) -> List[Dict]:
+        """Retrieve job descriptions newest first, all of them unless a limit is given"""
+        return list(self.iter_job_descriptions(limit, offset))
     
     # Candidate methods
     def add_candidate(self, name: str, email: str, phone: str, cv_path: str) -> int:
-        """Add a candidate to the database and return their ID"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute(
-            "INSERT INTO candidates (name, email, phone, cv_path) VALUES (?, ?, ?, ?)",
-            (name, email, phone, cv_path)
-        )
-        candidate_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        """Add a candidate to the database, or update the one with the same email, and return their ID"""
+        with self.writer() as conn:
+            candidate_id = conn.execute(_SQL_UPSERT_CANDIDATE, (name, email, phone, cv_path)).fetchone()[0]
+            conn.commit()
         
         return candidate_id
     
+    def add_candidates_bulk(self, rows: List[Tuple]) -> List[int]:
+        """
+        Add several processed candidates in one transaction and return their IDs
+        
+        Each row is (name, email, phone, cv_path, education, work_experience, skills,
+        certifications, embedding, embedding_scale); embeddings are stored zstd-compressed.
+        A row whose email already exists updates that candidate.
+        """
+        if not rows:
+            return []
+        
+        with self.writer() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                # executemany cannot return rows, so each upsert runs on its own inside the transaction
+                candidate_ids = [
+                    cursor.execute(
+                        _SQL_UPSERT_PROCESSED_CANDIDATE, (*row[:8], compress_embedding(row[8]), row[9])
+                    ).fetchone()[0]
+                    for row in rows
+                ]
+                conn.commit()
+            except sqlite3.Error:
+                conn.rollback()
+                raise
+        
+        return candidate_ids
+    
     def update_candidate_profile(self, candidate_id: int, education: str, work_experience: str, 
-                                skills: str, certifications: str) -> bool:
-        """Update candidate with extracted information"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute(
-            """UPDATE candidates 
-               SET education = ?, work_experience = ?, skills = ?, certifications = ?
-               WHERE id = ?""",
-            (education, work_experience, skills, certifications, candidate_id)
-        )
+                                skills: str, certifications: str, embedding: Optional[bytes] = None,
+                                embedding_scale: Optional[float] = None) -> bool:
+        """Update candidate with extracted information and its int8 embedding vector and scale, stored zstd-compressed"""
+        with self.writer() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(
+                """UPDATE candidates 
+                   SET education = ?, work_experience = ?, skills = ?, certifications = ?,
+                       embedding = ?, embedding_scale = ?, embedding_compressed = 1,
+                       processing_status = 'ready', version = version + 1
+                   WHERE id = ?""",
+                (education, work_experience, skills, certifications, compress_embedding(embedding),
+                 embedding_scale, candidate_id)
+            )
+            
+            success = cursor.rowcount > 0
+            conn.commit()
+        
+        return success
+    
+    def set_candidate_status(self, candidate_id: int, status: str) -> bool:
+        """Set the processing status of a candidate: 'processing', 'ready' or 'failed'"""
+        with self.writer() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("UPDATE candidates SET processing_status = ? WHERE id = ?", (status, candidate_id))
+            
+            success = cursor.rowcount > 0
+            conn.commit()
         
-        success = cursor.rowcount > 0
-        conn.commit()
-        conn.close()
         return success
     
     def get_candidate(self, candidate_id: int) -> Optional[Dict]:
         """Retrieve a candidate by ID"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("SELECT * FROM candidates WHERE id = ?", (candidate_id,))
-        row = cursor.fetchone()
-        conn.close()
+        # Always read from the database: rows change from background tasks in other worker processes
+        with self.reader() as conn:
+            row = conn.execute(_SQL_GET_CANDIDATE, (candidate_id,)).fetchone()
         
         if row:
             return dict(row)
         return None
     
-    def get_all_candidates(self) -> List[Dict]:
-        """Retrieve all candidates"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+    def get_candidates(self, candidate_ids: List[int]) -> List[Dict]:
+        """Retrieve the candidates with the given IDs in one query, in the order of the IDs; unknown IDs are skipped"""
+        with self.reader() as conn:
+            rows = conn.execute(_SQL_GET_CANDIDATES, (orjson.dumps(candidate_ids),)).fetchall()
         
-        cursor.execute("SELECT * FROM candidates ORDER BY created_at DESC")
-        rows = cursor.fetchall()
-        conn.close()
+        by_id = {row["id"]: dict(row) for row in rows}
+        return [by_id[candidate_id] for candidate_id in candidate_ids if candidate_id in by_id]
+    
+    def iter_candidates(self, limit: int = NO_LIMIT, offset: int = 0) -> Iterator[Dict]:
+        """Iterate over candidates, newest first, without loading the whole table"""
+        return self._iter_rows(_SQL_ITER_CANDIDATES, (limit, offset))
+    
+    def get_all_candidates(self, limit: int = NO_LIMIT, offset: int = 0) -> List[Dict]:
+        """Retrieve candidates newest first, all of them unless a limit is given"""
+        return list(self.iter_candidates(limit, offset))
+    
+    def get_ready_candidates(self, limit: int = NO_LIMIT, offset: int = 0) -> List[Dict]:
+        """Retrieve processed candidates newest first, skipping those still processing or failed"""
+        return list(self._iter_rows(_SQL_ITER_READY_CANDIDATES, (limit, offset)))
+    
+    def load_candidate_embedding_matrix(self, dim: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get every stored candidate embedding of the given dimension as one contiguous matrix
         
-        return [dict(row) for row in rows]
+        The matrix is kept in memory. Each call reads only the row versions and decodes
+        the embeddings of candidates added or changed since the last call, including
+        changes made by other processes.
+        
+        Args:
+            dim: Embedding dimension; rows from a model with another dimension are skipped
+            
+        Returns:
+            Tuple of (int64 candidate IDs, float32 matrix of shape (len(ids), dim) with unit-length rows)
+        """
+        with self._embedding_matrix_lock:
+            return self._refresh_embedding_matrix(dim).snapshot()
+    
+    def candidate_embedding_mean(self, dim: int) -> Optional[np.ndarray]:
+        """
+        Get the mean of every stored candidate embedding of the given dimension, each normalized first
+        
+        Its dot product with a unit-length vector is that vector's mean cosine similarity to all candidates.
+        
+        Args:
+            dim: Embedding dimension; rows from a model with another dimension are skipped
+            
+        Returns:
+            float32 mean vector, or None if no candidate has an embedding of this dimension
+        """
+        with self._embedding_matrix_lock:
+            return self._refresh_embedding_matrix(dim).mean()
+    
+    def _refresh_embedding_matrix(self, dim: int) -> _EmbeddingMatrix:
+        """Bring the in-memory candidate embeddings of a dimension up to date; call with the matrix lock held"""
+        matrix = self._embedding_matrices.setdefault(dim, _EmbeddingMatrix(dim))
+        
+        with self.reader() as conn:
+            versions = dict(conn.execute(_SQL_CANDIDATE_EMBEDDING_VERSIONS).fetchall())
+            changed = [
+                candidate_id for candidate_id, version in versions.items()
+                if matrix.versions.get(candidate_id) != version
+            ]
+            rows = conn.execute(_SQL_GET_CANDIDATE_EMBEDDINGS, (orjson.dumps(changed),)).fetchall() if changed else []
+        
+        for candidate_id in [candidate_id for candidate_id in matrix.versions if candidate_id not in versions]:
+            matrix.remove(candidate_id)
+            del matrix.versions[candidate_id]
+        
+        for row in rows:
+            vector = decode_embedding(row["embedding"], row["embedding_scale"], row["embedding_compressed"])
+            if vector.shape[0] == dim:
+                matrix.put(row["id"], vector)
+            else:
+                matrix.remove(row["id"])
+            matrix.versions[row["id"]] = row["version"]
+        
+        return matrix
     
     # Match Score methods
     def add_match_score(self, job_id: int, candidate_id: int, score: float, 
-                        skills_match: str, experience_match: str, education_match: str) -> int:
-        """Add a match score between a job and a candidate"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute(
-            """INSERT INTO match_scores 
-               (job_id, candidate_id, score, skills_match, experience_match, education_match) 
-               VALUES (?, ?, ?, ?, ?, ?)""",
-            (job_id, candidate_id, score, skills_match, experience_match, education_match)
-        )
-        match_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+                        skills_match: Dict[str, Any], experience_match: Dict[str, Any],
+                        education_match: Dict[str, Any]) -> int:
+        """
+        Add or replace the match score between a job and a candidate and return its ID
         
-        return match_id
+        The breakdowns are stored as compact JSON.
+        """
+        with self.writer() as conn:
+            match_id = conn.execute(
+                _SQL_UPSERT_MATCH_SCORE,
+                _match_score_row(job_id, candidate_id, score, skills_match, experience_match, education_match)
+            ).fetchone()[0]
+            conn.commit()
+            
+            return match_id
     
-    def get_match_scores_by_job(self, job_id: int) -> List[Dict]:
-        """Get all candidate matches for a specific job"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+    def add_match_scores_bulk(self, rows: List[Tuple]) -> List[int]:
+        """
+        Add or replace several match scores in one transaction and return their IDs
         
-        cursor.execute("""
-            SELECT ms.*, c.name AS candidate_name, c.email AS candidate_email
-            FROM match_scores ms
-            JOIN candidates c ON ms.candidate_id = c.id
-            WHERE ms.job_id = ?
-            ORDER BY ms.score DESC
-        """, (job_id,))
+        Each row is (job_id, candidate_id, score, skills_match, experience_match, education_match),
+        with the breakdowns as dicts.
+        """
+        if not rows:
+            return []
         
-        rows = cursor.fetchall()
-        conn.close()
+        with self.writer() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                # executemany cannot return rows, so each upsert runs on its own inside the transaction
+                match_ids = [
+                    cursor.execute(_SQL_UPSERT_MATCH_SCORE, _match_score_row(*row)).fetchone()[0]
+                    for row in rows
+                ]
+                conn.commit()
+            except sqlite3.Error:
+                conn.rollback()
+                raise
+            
+            return match_ids
+    
+    def get_match_scores_by_job(self, job_id: int, limit: int = NO_LIMIT, offset: int = 0) -> List[Dict]:
+        """Get the candidate matches for a specific job, best first, all of them unless a limit is given"""
+        with self.reader() as conn:
+            rows = conn.execute(_SQL_MATCHES_BY_JOB, (job_id, limit, offset)).fetchall()
         
         return [dict(row) for row in rows]
     
-    def get_match_scores_by_candidate(self, candidate_id: int) -> List[Dict]:
-        """Get all job matches for a specific candidate"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+    def get_match_statistics(self, job_id: int, top_n: int = 5) -> Dict[str, Any]:
+        """
+        Summarize the matches of a job without loading them
+        
+        Args:
+            job_id: Job description ID
+            top_n: Number of best candidates to return
+            
+        Returns:
+            Dict with the match count "total", the mean score "average" (0 without matches)
+            and "top_candidates", the top_n candidate IDs, names and scores, best first
+        """
+        with self.reader() as conn:
+            summary = conn.execute(_SQL_MATCH_SUMMARY, (job_id,)).fetchone()
+            top_rows = conn.execute(_SQL_TOP_CANDIDATES, (job_id, top_n)).fetchall()
+        
+        return {
+            "total": summary["total"],
+            "average": summary["average"] or 0,
+            "top_candidates": [dict(row) for row in top_rows]
+        }
+    
+    def get_match_for_pair(self, job_id: int, candidate_id: int) -> Optional[Dict]:
+        """Get the match between a job and a candidate, with the job title and candidate name"""
+        # Served by the unique (job_id, candidate_id) index
+        with self.reader() as conn:
+            row = conn.execute(_SQL_MATCH_FOR_PAIR, (job_id, candidate_id)).fetchone()
         
-        cursor.execute("""
-            SELECT ms.*, jd.title AS job_title
-            FROM match_scores ms
-            JOIN job_descriptions jd ON ms.job_id = jd.id
-            WHERE ms.candidate_id = ?
-            ORDER BY ms.score DESC
-        """, (candidate_id,))
+        if row:
+            return dict(row)
+        return None
+    
+    def get_top_matches(self, job_id: int, min_skill_score: float,
+                        limit: int = NO_LIMIT, offset: int = 0) -> List[Dict]:
+        """Get the matches for a job whose skills score is at least min_skill_score, best first"""
+        # The skills score is filtered in SQL through the generated column, not in Python
+        with self.reader() as conn:
+            rows = conn.execute(_SQL_TOP_MATCHES, (job_id, min_skill_score, limit, offset)).fetchall()
         
-        rows = cursor.fetchall()
-        conn.close()
+        return [dict(row) for row in rows]
+    
+    def get_match_scores_by_candidate(self, candidate_id: int, limit: int = NO_LIMIT, offset: int = 0) -> List[Dict]:
+        """Get the job matches for a specific candidate, best first, all of them unless a limit is given"""
+        with self.reader() as conn:
+            rows = conn.execute(_SQL_MATCHES_BY_CANDIDATE, (candidate_id, limit, offset)).fetchall()
         
         return [dict(row) for row in rows]
     
@@ -260,77 +863,163 @@ class Database:
                           scheduled_time: datetime, duration_minutes: int, 
                           interview_link: str) -> int:
         """Schedule an interview between a job and a candidate"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute(
-            """INSERT INTO interviews 
-               (job_id, candidate_id, scheduled_time, duration_minutes, interview_link) 
-               VALUES (?, ?, ?, ?, ?)""",
-            (job_id, candidate_id, scheduled_time.isoformat(), duration_minutes, interview_link)
-        )
+        with self.writer() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(
+                """INSERT INTO interviews 
+                   (job_id, candidate_id, scheduled_time, duration_minutes, interview_link) 
+                   VALUES (?, ?, ?, ?, ?)""",
+                (job_id, candidate_id, to_epoch(scheduled_time), duration_minutes, interview_link)
+            )
+            
+            interview_id = cursor.lastrowid
+            conn.commit()
+            
+            return interview_id
+    
+    def schedule_interviews_bulk(self, rows: List[Tuple]) -> List[int]:
+        """
+        Schedule several interviews in one transaction and return their IDs
         
-        interview_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        Each row is (job_id, candidate_id, scheduled_time, duration_minutes, interview_link).
+        """
+        if not rows:
+            return []
         
-        return interview_id
+        with self.writer() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                cursor.executemany(
+                    """INSERT INTO interviews 
+                       (job_id, candidate_id, scheduled_time, duration_minutes, interview_link) 
+                       VALUES (?, ?, ?, ?, ?)""",
+                    [
+                        (job_id, candidate_id, to_epoch(scheduled_time), duration_minutes, interview_link)
+                        for job_id, candidate_id, scheduled_time, duration_minutes, interview_link in rows
+                    ]
+                )
+                # The write lock is held throughout, so the new IDs are the consecutive ones ending at the last
+                last_id = cursor.execute("SELECT last_insert_rowid()").fetchone()[0]
+                conn.commit()
+            except sqlite3.Error:
+                conn.rollback()
+                raise
+            
+            return list(range(last_id - len(rows) + 1, last_id + 1))
     
     def update_interview_status(self, interview_id: int, status: str, notes: Optional[str] = None) -> bool:
         """Update the status of an interview"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        if notes:
-            cursor.execute(
-                "UPDATE interviews SET status = ?, notes = ? WHERE id = ?",
-                (status, notes, interview_id)
-            )
-        else:
-            cursor.execute(
-                "UPDATE interviews SET status = ? WHERE id = ?",
-                (status, interview_id)
-            )
+        with self.writer() as conn:
+            cursor = conn.cursor()
+            
+            if notes:
+                cursor.execute(
+                    "UPDATE interviews SET status = ?, notes = ? WHERE id = ?",
+                    (status, notes, interview_id)
+                )
+            else:
+                cursor.execute(
+                    "UPDATE interviews SET status = ? WHERE id = ?",
+                    (status, interview_id)
+                )
+            
+            success = cursor.rowcount > 0
+            conn.commit()
+            return success
+    
+    def get_interview(self, interview_id: int) -> Optional[Dict]:
+        """Retrieve an interview by ID, with its job title and candidate name"""
+        with self.reader() as conn:
+            row = conn.execute(_SQL_GET_INTERVIEW, (interview_id,)).fetchone()
         
-        success = cursor.rowcount > 0
-        conn.commit()
-        conn.close()
-        return success
+        if row:
+            return dict(row)
+        return None
     
     def get_interviews_by_job(self, job_id: int) -> List[Dict]:
         """Get all interviews for a specific job"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT i.*, c.name AS candidate_name, c.email AS candidate_email,
-                   jd.title AS job_title
-            FROM interviews i
-            JOIN candidates c ON i.candidate_id = c.id
-            JOIN job_descriptions jd ON i.job_id = jd.id
-            WHERE i.job_id = ?
-            ORDER BY i.scheduled_time
-        """, (job_id,))
-        
-        rows = cursor.fetchall()
-        conn.close()
+        with self.reader() as conn:
+            rows = conn.execute(_SQL_INTERVIEWS_BY_JOB, (job_id,)).fetchall()
         
         return [dict(row) for row in rows]
     
     def get_interviews_by_candidate(self, candidate_id: int) -> List[Dict]:
         """Get all interviews for a specific candidate"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        with self.reader() as conn:
+            rows = conn.execute(_SQL_INTERVIEWS_BY_CANDIDATE, (candidate_id,)).fetchall()
+        
+        return [dict(row) for row in rows]
+    
+    # Embedding cache methods
+    def get_cached_embedding(self, key: bytes) -> Optional[bytes]:
+        """Retrieve a cached embedding vector by its hash key"""
+        with self.reader() as conn:
+            row = conn.execute(_SQL_GET_CACHED_EMBEDDING, (key,)).fetchone()
         
-        cursor.execute("""
-            SELECT i.*, jd.title AS job_title
-            FROM interviews i
-            JOIN job_descriptions jd ON i.job_id = jd.id
-            WHERE i.candidate_id = ?
-            ORDER BY i.scheduled_time
-        """, (candidate_id,))
+        if row:
+            return row["vector"]
+        return None
+    
+    def add_cached_embedding(self, key: bytes, model: str, dim: int, vector: bytes,
+                             simhash: Optional[int] = None, text: Optional[str] = None) -> None:
+        """Store an embedding vector under its hash key, with the text and SimHash for near-duplicate lookups"""
+        with self.writer() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(_SQL_ADD_CACHED_EMBEDDING, (key, model, dim, vector, simhash, text))
+            
+            conn.commit()
+    
+    def get_cached_embeddings(self, keys: List[bytes]) -> Dict[bytes, bytes]:
+        """Retrieve several cached embedding vectors, keyed on their hash key"""
+        with self.reader() as conn:
+            cursor = conn.cursor()
+            
+            vectors = {}
+            # Stay below SQLite's limit on query parameters
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                cursor.execute(
+                    f"SELECT hash, vector FROM embedding_cache WHERE hash IN ({', '.join('?' * len(chunk))})",
+                    chunk
+                )
+                vectors.update((row["hash"], row["vector"]) for row in cursor.fetchall())
+            
+            return vectors
+    
+    def add_cached_embeddings(self, rows: List[Tuple[bytes, str, int, bytes, Optional[int], Optional[str]]]) -> None:
+        """Store several (hash key, model, dim, vector, simhash, text) embedding rows"""
+        with self.writer() as conn:
+            cursor = conn.cursor()
+            
+            cursor.executemany(_SQL_ADD_CACHED_EMBEDDING, rows)
+            
+            conn.commit()
+    
+    def find_similar_cached_embeddings(self, model: str, simhash: int, max_distance: int,
+                                       limit: int = 8) -> List[Dict]:
+        """
+        Find cached embeddings whose text SimHash is within max_distance bits of simhash
         
-        rows = cursor.fetchall()
-        conn.close()
+        Only rows sharing a SimHash band are compared, which finds every match
+        as long as max_distance is below SIMHASH_BANDS.
         
-        return [dict(row) for row in rows] 
\ No newline at end of file
+        Args:
+            model: Embedding model the vectors must come from
+            simhash: Signed 64-bit SimHash of the text being looked up
+            max_distance: Largest accepted Hamming distance in bits
+            limit: Maximum number of rows to return
+            
+        Returns:
+            Rows with the cached text and vector, nearest first
+        """
+        with self.reader() as conn:
+            band_params = [value for band in _simhash_bands(simhash) for value in (model, band)]
+            rows = conn.execute(
+                _SQL_NEAREST_CACHED_EMBEDDINGS, (simhash, *band_params, max_distance, limit)
+            ).fetchall()
+        
+        return [dict(row) for row in rows]
@@ -1,10 +1,18 @@
 import os
-import json
+import anyio
+import asyncio
+import orjson
+import secrets
+import threading
+from collections import OrderedDict
+from cachetools import TTLCache
+from contextlib import asynccontextmanager
+import numpy as np
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any, Tuple
 
-from fastapi import FastAPI, File, Form, UploadFile, HTTPException, Depends, Query, Body
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, File, Form, UploadFile, HTTPException, Depends, Query, Body, BackgroundTasks
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 
@@ -13,29 +21,68 @@ from agents import (
     RecruitingAgent, 
     MatchingAgent, 
     SchedulingAgent,
+    RECRUIT_CONCURRENCY,
     JobSummary,
     CandidateProfile,
     MatchResult
 )
-from database import Database
+from database import Database, decode_embedding, from_epoch, to_epoch
 from utils import (
     setup_file_storage, 
-    save_uploaded_file, 
+    asave_upload,
+    UploadTooLargeError,
     read_file, 
     parse_datetime, 
     format_datetime,
     log_event,
-    serialize_model
+    serialize_model,
+    quantize_int8,
+    mean_cosine_similarity,
+    close_http_clients,
+    use_database
 )
 
 # Setup directories
 setup_file_storage()
 
+# JobSummary and CandidateProfile models kept across requests, keyed on (kind, row id, row version);
+# an update bumps the version, so stale entries are never hit and age out of the LRU
+MODEL_CACHE_SIZE = 1024
+_model_cache: "OrderedDict[Tuple[str, int, int], Any]" = OrderedDict()
+_model_cache_lock = threading.Lock()
+
+# GET /jobs/{id} and /candidates/{id} responses served from memory for RESPONSE_CACHE_TTL seconds;
+# each worker has its own cache, so other workers see a change within the TTL
+RESPONSE_CACHE_TTL = float(os.environ.get("RESPONSE_CACHE_TTL", "5"))
+_response_cache: "TTLCache[Tuple[str, int], Dict[str, Any]]" = TTLCache(maxsize=2048, ttl=RESPONSE_CACHE_TTL)
+_response_cache_lock = threading.Lock()
+_response_cache_stats = {"hits": 0, "misses": 0}
+
+# Default and largest page size of the list endpoints
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Worker threads for blocking database and agent calls made from the endpoints
+THREADPOOL_SIZE = int(os.environ.get("THREADPOOL_SIZE", "100"))
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Raise the threadpool limit so concurrent requests are not capped at anyio's default of 40 threads,
+    and close the shared Ollama HTTP clients on shutdown
+    """
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+    yield
+    await close_http_clients()
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Recruitment Automation API",
     description="API for multi-agent recruitment automation system",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    # Responses are encoded with orjson instead of the standard library json
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -47,8 +94,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize database
+# Initialize database; the embedding cache shares it instead of opening its own connections
 db = Database()
+use_database(db)
 
 # Initialize agents
 jd_agent = JobDescriptionAgent()
@@ -96,6 +144,19 @@ class MatchScoreResponse(BaseModel):
     education_match: Dict[str, Any]
     explanation: str
 
+class MatchBatchRequest(BaseModel):
+    job_id: int
+    candidate_ids: List[int] = Field(..., min_length=1)
+
+class ShortlistEntry(BaseModel):
+    candidate_id: int
+    candidate_name: str
+    score: float
+
+class ProcessingStatusResponse(BaseModel):
+    id: int
+    status: str
+
 class InterviewRequest(BaseModel):
     job_id: int
     candidate_id: int
@@ -115,6 +176,348 @@ class InterviewResponse(BaseModel):
     status: str
     email_template: Optional[str] = None
 
+# ---- Helpers ----
+
+def _cached_model(key: Tuple[str, int, int], build: Callable[[], Any]) -> Any:
+    """Return the agent model cached under key, building and caching it on a miss"""
+    with _model_cache_lock:
+        model = _model_cache.get(key)
+        if model is not None:
+            _model_cache.move_to_end(key)
+            return model
+    
+    model = build()
+    with _model_cache_lock:
+        _model_cache[key] = model
+        if len(_model_cache) > MODEL_CACHE_SIZE:
+            _model_cache.popitem(last=False)
+    return model
+
+def cached_response(key: Tuple[str, int]) -> Optional[Dict[str, Any]]:
+    """Look up a cached detail response, counting the hit or miss"""
+    with _response_cache_lock:
+        response = _response_cache.get(key)
+        _response_cache_stats["hits" if response is not None else "misses"] += 1
+    return response
+
+def cache_response(key: Tuple[str, int], response: Dict[str, Any]):
+    """Cache a detail response for RESPONSE_CACHE_TTL seconds"""
+    with _response_cache_lock:
+        _response_cache[key] = response
+
+def forget_responses(*keys: Tuple[str, int]):
+    """Drop the cached detail responses of changed records"""
+    with _response_cache_lock:
+        for key in keys:
+            _response_cache.pop(key, None)
+
+def job_summary_from_row(job: Dict[str, Any]) -> JobSummary:
+    """Convert a job description row to the agent model, reusing the one built for the same row version"""
+    return _cached_model(("job", job["id"], job["version"]), lambda: _job_summary_from_row(job))
+
+def candidate_profile_from_row(candidate: Dict[str, Any]) -> CandidateProfile:
+    """Convert a candidate row to the agent model, reusing the one built for the same row version"""
+    return _cached_model(("candidate", candidate["id"], candidate["version"]), lambda: _candidate_profile_from_row(candidate))
+
+def _job_summary_from_row(job: Dict[str, Any]) -> JobSummary:
+    """Convert a job description row to the agent model"""
+    return JobSummary(
+        title=job["title"],
+        summary=job["summarized_description"] or "",
+        required_skills=orjson.loads(job["required_skills"] or "[]"),
+        required_experience=job["required_experience"] or "",
+        responsibilities=orjson.loads(job["responsibilities"] or "[]")
+    )
+
+def _candidate_profile_from_row(candidate: Dict[str, Any]) -> CandidateProfile:
+    """Convert a candidate row to the agent model"""
+    return CandidateProfile(
+        name=candidate["name"],
+        education=orjson.loads(candidate["education"] or "[]"),
+        work_experience=orjson.loads(candidate["work_experience"] or "[]"),
+        skills=orjson.loads(candidate["skills"] or "[]"),
+        certifications=orjson.loads(candidate["certifications"] or "[]")
+    )
+
+def match_result_from_row(match: Dict[str, Any]) -> MatchResult:
+    """Convert a match score row to the agent model"""
+    return MatchResult(
+        score=match["score"],
+        skills_match=orjson.loads(match["skills_match"] or "{}"),
+        experience_match=orjson.loads(match["experience_match"] or "{}"),
+        education_match=orjson.loads(match["education_match"] or "{}"),
+        explanation="Match found"
+    )
+
+# Read endpoints return these dicts in an ORJSONResponse; the rows come from our own database,
+# so the response models only document the shape and are not validated per row
+
+def job_response_from_row(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a job description row to a JobDescriptionResponse dict, decoding each JSON column once"""
+    return {
+        "id": job["id"],
+        "title": job["title"],
+        "summary": job["summarized_description"] or "",
+        "required_skills": orjson.loads(job["required_skills"] or "[]"),
+        "required_experience": job["required_experience"] or "",
+        "responsibilities": orjson.loads(job["responsibilities"] or "[]")
+    }
+
+def candidate_response_from_row(candidate: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a candidate row to a CandidateResponse dict, decoding each JSON column once"""
+    return {
+        "id": candidate["id"],
+        "name": candidate["name"],
+        "email": candidate["email"],
+        "education": orjson.loads(candidate["education"] or "[]"),
+        "work_experience": orjson.loads(candidate["work_experience"] or "[]"),
+        "skills": orjson.loads(candidate["skills"] or "[]"),
+        "certifications": orjson.loads(candidate["certifications"] or "[]")
+    }
+
+def match_response_from_row(match: Dict[str, Any], job_title: str, candidate_name: str) -> Dict[str, Any]:
+    """Convert a match score row to a MatchScoreResponse dict; the explanation is not stored in the database"""
+    return {
+        "id": match["id"],
+        "job_id": match["job_id"],
+        "job_title": job_title,
+        "candidate_id": match["candidate_id"],
+        "candidate_name": candidate_name,
+        "score": match["score"],
+        "skills_match": orjson.loads(match["skills_match"] or "{}"),
+        "experience_match": orjson.loads(match["experience_match"] or "{}"),
+        "education_match": orjson.loads(match["education_match"] or "{}"),
+        "explanation": ""
+    }
+
+def interview_response_from_row(interview: Dict[str, Any], candidate_name: str) -> Dict[str, Any]:
+    """Convert an interview row to an InterviewResponse dict without an email template"""
+    return {
+        "id": interview["id"],
+        "job_id": interview["job_id"],
+        "job_title": interview["job_title"],
+        "candidate_id": interview["candidate_id"],
+        "candidate_name": candidate_name,
+        "scheduled_time": from_epoch(interview["scheduled_time"]).isoformat(),
+        "duration_minutes": interview["duration_minutes"],
+        "interview_link": interview["interview_link"],
+        "status": interview["status"],
+        "email_template": None
+    }
+
+def interview_slot(scheduled_time: datetime) -> Dict[str, str]:
+    """Generate a single interview slot from a scheduled time"""
+    return {
+        "datetime": scheduled_time.isoformat(),
+        "display": scheduled_time.strftime("%A, %B %d, %Y at %I:%M %p")
+    }
+
+def stored_embedding(embedding: np.ndarray) -> Tuple[Optional[bytes], Optional[float]]:
+    """L2-normalize and quantize an embedding vector for storage as (int8 bytes, scale), (None, None) if it is unavailable"""
+    vector = np.asarray(embedding, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    # Zero vectors mark failed embeddings and cannot be normalized
+    if norm == 0:
+        return None, None
+    return quantize_int8(vector / norm)
+
+async def save_cv(cv_file: UploadFile) -> str:
+    """Stream an uploaded CV to disk, rejecting files over the upload size limit with 413"""
+    try:
+        return await asave_upload(cv_file, "uploads/cvs")
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+def accepted(record_id: int) -> JSONResponse:
+    """202 response for a record that is still being processed in the background"""
+    return JSONResponse({"id": record_id, "status": "processing"}, status_code=202)
+
+async def score_candidates_for_job(job: Dict[str, Any], candidates: List[Dict[str, Any]]) -> List[MatchScoreResponse]:
+    """Score candidate rows against a job row with batched prompts, store the scores in one transaction, best first"""
+    match_results = await anyio.to_thread.run_sync(
+        matching_agent.calculate_match_batch,
+        job_summary_from_row(job),
+        [candidate_profile_from_row(candidate) for candidate in candidates]
+    )
+    
+    match_rows = [
+        (
+            job["id"],
+            candidate["id"],
+            match_result.score,
+            match_result.skills_match,
+            match_result.experience_match,
+            match_result.education_match
+        )
+        for candidate, match_result in zip(candidates, match_results)
+    ]
+    match_ids = await anyio.to_thread.run_sync(db.add_match_scores_bulk, match_rows)
+    
+    responses = [
+        MatchScoreResponse(
+            id=match_id,
+            job_id=job["id"],
+            job_title=job["title"],
+            candidate_id=candidate["id"],
+            candidate_name=candidate["name"],
+            score=match_result.score,
+            skills_match=match_result.skills_match,
+            experience_match=match_result.experience_match,
+            education_match=match_result.education_match,
+            explanation=match_result.explanation
+        )
+        for match_id, candidate, match_result in zip(match_ids, candidates, match_results)
+    ]
+    return sorted(responses, key=lambda response: response.score, reverse=True)
+
+def new_interview_link() -> str:
+    """Create a random, unguessable meeting link; links built from IDs and times collide and can be guessed"""
+    return f"https://meet.example.com/{secrets.token_urlsafe(9)}"
+
+async def schedule_interviews(requests: List[InterviewRequest]) -> List[InterviewResponse]:
+    """
+    Validate, store and write emails for interview requests
+    
+    The interviews are stored in one transaction; an email template is generated, concurrently,
+    for each interview whose job and candidate have a match score.
+    """
+    # Get jobs and candidates, each once
+    jobs = {}
+    for job_id in dict.fromkeys(request.job_id for request in requests):
+        jobs[job_id] = await anyio.to_thread.run_sync(db.get_job_description, job_id)
+    candidate_ids = list(dict.fromkeys(request.candidate_id for request in requests))
+    candidates = {
+        candidate["id"]: candidate
+        for candidate in await anyio.to_thread.run_sync(db.get_candidates, candidate_ids)
+    }
+    
+    for request in requests:
+        if not jobs[request.job_id]:
+            raise HTTPException(status_code=404, detail=f"Job description with ID {request.job_id} not found")
+        if request.candidate_id not in candidates:
+            raise HTTPException(status_code=404, detail=f"Candidate with ID {request.candidate_id} not found")
+    
+    # Get the match scores if available
+    matches = await anyio.to_thread.run_sync(
+        lambda: [db.get_match_for_pair(request.job_id, request.candidate_id) for request in requests]
+    )
+    
+    # Parse scheduled times and create interview links where none are provided
+    scheduled_times = [parse_datetime(request.slot_datetime) for request in requests]
+    interview_links = [request.interview_link or new_interview_link() for request in requests]
+    
+    # Schedule interviews
+    interview_ids = await anyio.to_thread.run_sync(db.schedule_interviews_bulk, [
+        (request.job_id, request.candidate_id, scheduled_time, request.duration_minutes, interview_link)
+        for request, scheduled_time, interview_link in zip(requests, scheduled_times, interview_links)
+    ])
+    
+    # Generate personalized email templates where we have match data
+    semaphore = asyncio.Semaphore(RECRUIT_CONCURRENCY)
+    
+    async def email_template(request: InterviewRequest, match: Optional[Dict[str, Any]],
+                             scheduled_time: datetime) -> Optional[str]:
+        if not match:
+            return None
+        async with semaphore:
+            interview_schedule = await scheduling_agent.acreate_interview_request(
+                job_summary_from_row(jobs[request.job_id]),
+                candidate_profile_from_row(candidates[request.candidate_id]),
+                match_result_from_row(match),
+                [interview_slot(scheduled_time)]
+            )
+        return interview_schedule.email_template
+    
+    email_templates = await asyncio.gather(*[
+        email_template(request, match, scheduled_time)
+        for request, match, scheduled_time in zip(requests, matches, scheduled_times)
+    ])
+    
+    # Respond from the requests instead of reading the new interviews back
+    return [
+        InterviewResponse(
+            id=interview_id,
+            job_id=request.job_id,
+            job_title=jobs[request.job_id]["title"],
+            candidate_id=request.candidate_id,
+            candidate_name=candidates[request.candidate_id]["name"],
+            # Normalized the same way as the stored epoch seconds
+            scheduled_time=from_epoch(to_epoch(scheduled_time)).isoformat(),
+            duration_minutes=request.duration_minutes,
+            interview_link=interview_link,
+            status="scheduled",
+            email_template=template
+        )
+        for interview_id, request, scheduled_time, interview_link, template
+        in zip(interview_ids, requests, scheduled_times, interview_links, email_templates)
+    ]
+
+def sse_event(data: str, event: Optional[str] = None) -> str:
+    """Format a Server-Sent Events message, one data line per line of text"""
+    message = f"event: {event}\n" if event else ""
+    message += "".join(f"data: {line}\n" for line in data.split("\n"))
+    return message + "\n"
+
+# ---- Ingest ----
+
+def process_job(job_id: int, title: str, description: str) -> JobSummary:
+    """
+    Summarize a stored job description, embed it and save the result
+    
+    Runs in a worker thread, either awaited by the request or as a background task.
+    The job's processing status becomes 'ready', or 'failed' if any step raises.
+    """
+    try:
+        job_summary = jd_agent.process_jd(title, description)
+        
+        # Embed the job once at ingest so matching does not have to
+        embedding = matching_agent.job_embedding(job_summary)
+        
+        db.update_job_summary(
+            job_id,
+            job_summary.summary,
+            orjson.dumps(job_summary.required_skills).decode(),
+            job_summary.required_experience,
+            orjson.dumps(job_summary.responsibilities).decode(),
+            *stored_embedding(embedding)
+        )
+    except Exception:
+        db.set_job_status(job_id, "failed")
+        raise
+    finally:
+        forget_responses(("job", job_id))
+    
+    return job_summary
+
+def process_candidate(candidate_id: int, cv_path: str) -> CandidateProfile:
+    """
+    Parse a stored candidate's CV, embed the profile and save the result
+    
+    Runs in a worker thread, either awaited by the request or as a background task.
+    The candidate's processing status becomes 'ready', or 'failed' if any step raises.
+    """
+    try:
+        candidate_profile = recruiting_agent.process_cv_file(cv_path)
+        
+        # Embed the candidate once at ingest so matching does not have to
+        embedding = matching_agent.candidate_embedding(candidate_profile)
+        
+        db.update_candidate_profile(
+            candidate_id,
+            orjson.dumps(candidate_profile.education).decode(),
+            orjson.dumps(candidate_profile.work_experience).decode(),
+            orjson.dumps(candidate_profile.skills).decode(),
+            orjson.dumps(candidate_profile.certifications).decode(),
+            *stored_embedding(embedding)
+        )
+    except Exception:
+        db.set_candidate_status(candidate_id, "failed")
+        raise
+    finally:
+        forget_responses(("candidate", candidate_id))
+    
+    return candidate_profile
+
 # ---- API Endpoints ----
 
 @app.get("/")
@@ -124,8 +527,8 @@ async def root():
 
 # Job Description Endpoints
 
-@app.post("/jobs", response_model=JobDescriptionResponse)
-async def create_job_description(job_data: JobDescriptionRequest):
+@app.post("/jobs", response_model=JobDescriptionResponse, responses={202: {"model": ProcessingStatusResponse}})
+async def create_job_description(job_data: JobDescriptionRequest, background_tasks: BackgroundTasks, wait: bool = True):
     """
     Create a new job description and process it
     
@@ -134,82 +537,79 @@ async def create_job_description(job_data: JobDescriptionRequest):
     2. Processes the description with the JobDescriptionAgent
     3. Updates the record with the processed information
     4. Returns the processed job description
+    
+    With wait=false it responds 202 right after step 1 and processes the description in the
+    background; poll GET /jobs/{job_id}/status until it is 'ready'.
     """
     # Log the incoming request
     log_event("job_description_received", {"title": job_data.title})
     
     # Add job description to database
-    job_id = db.add_job_description(job_data.title, job_data.description)
-    
-    # Process with agent
-    job_summary = jd_agent.process_jd(job_data.title, job_data.description)
-    
-    # Update database with processed information
-    db.update_job_summary(
-        job_id, 
-        job_summary.summary,
-        json.dumps(job_summary.required_skills),
-        job_summary.required_experience,
-        json.dumps(job_summary.responsibilities)
-    )
+    job_id = await anyio.to_thread.run_sync(db.add_job_description, job_data.title, job_data.description)
     
-    # Get the updated job description
-    job = db.get_job_description(job_id)
+    if not wait:
+        # Sync background tasks run in the threadpool once the response is sent
+        background_tasks.add_task(process_job, job_id, job_data.title, job_data.description)
+        return accepted(job_id)
     
-    # Convert database format to response model
+    # Process with agent, embed and store the result
+    job_summary = await anyio.to_thread.run_sync(process_job, job_id, job_data.title, job_data.description)
+    
+    # Respond with the processed job directly instead of reading back and re-decoding the stored row
     return JobDescriptionResponse(
-        id=job["id"],
-        title=job["title"],
-        summary=job["summarized_description"],
-        required_skills=json.loads(job["required_skills"] or "[]"),
-        required_experience=job["required_experience"] or "",
-        responsibilities=json.loads(job["responsibilities"] or "[]")
+        id=job_id,
+        title=job_data.title,
+        summary=job_summary.summary,
+        required_skills=job_summary.required_skills,
+        required_experience=job_summary.required_experience,
+        responsibilities=job_summary.responsibilities
     )
 
 @app.get("/jobs", response_model=List[JobDescriptionResponse])
-async def get_all_jobs():
-    """Get all job descriptions"""
-    jobs = db.get_all_job_descriptions()
+async def get_all_jobs(limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), offset: int = Query(0, ge=0)):
+    """Get a page of job descriptions, newest first"""
+    jobs = await anyio.to_thread.run_sync(db.get_all_job_descriptions, limit, offset)
     
     # Convert database format to response models
-    return [
-        JobDescriptionResponse(
-            id=job["id"],
-            title=job["title"],
-            summary=job["summarized_description"] or "",
-            required_skills=json.loads(job["required_skills"] or "[]"),
-            required_experience=job["required_experience"] or "",
-            responsibilities=json.loads(job["responsibilities"] or "[]")
-        )
-        for job in jobs
-    ]
+    return ORJSONResponse([job_response_from_row(job) for job in jobs])
 
 @app.get("/jobs/{job_id}", response_model=JobDescriptionResponse)
 async def get_job_description(job_id: int):
     """Get a specific job description by ID"""
-    job = db.get_job_description(job_id)
+    response = cached_response(("job", job_id))
+    
+    if response is None:
+        job = await anyio.to_thread.run_sync(db.get_job_description, job_id)
+        
+        if not job:
+            raise HTTPException(status_code=404, detail=f"Job description with ID {job_id} not found")
+        
+        # Convert database format to response model
+        response = job_response_from_row(job)
+        cache_response(("job", job_id), response)
+    
+    return ORJSONResponse(response)
+
+@app.get("/jobs/{job_id}/status", response_model=ProcessingStatusResponse)
+async def get_job_status(job_id: int):
+    """Get the processing status of a job description: 'processing', 'ready' or 'failed'"""
+    job = await anyio.to_thread.run_sync(db.get_job_description, job_id)
     
     if not job:
         raise HTTPException(status_code=404, detail=f"Job description with ID {job_id} not found")
     
-    # Convert database format to response model
-    return JobDescriptionResponse(
-        id=job["id"],
-        title=job["title"],
-        summary=job["summarized_description"] or "",
-        required_skills=json.loads(job["required_skills"] or "[]"),
-        required_experience=job["required_experience"] or "",
-        responsibilities=json.loads(job["responsibilities"] or "[]")
-    )
+    return ProcessingStatusResponse(id=job_id, status=job["processing_status"])
 
 # Candidate Endpoints
 
-@app.post("/candidates", response_model=CandidateResponse)
+@app.post("/candidates", response_model=CandidateResponse, responses={202: {"model": ProcessingStatusResponse}})
 async def create_candidate(
+    background_tasks: BackgroundTasks,
     name: str = Form(...),
     email: str = Form(...),
     phone: str = Form(...),
-    cv_file: UploadFile = File(...)
+    cv_file: UploadFile = File(...),
+    wait: bool = True
 ):
     """
     Create a new candidate profile by uploading a CV
@@ -219,77 +619,123 @@ async def create_candidate(
     2. Creates a new candidate record
     3. Processes the CV with the RecruitingAgent
     4. Updates the record with the extracted information
-    5. Returns the processed candidate profile
+    5. Stores the candidate's embedding for matching
+    6. Returns the processed candidate profile
+    
+    With wait=false it responds 202 right after step 2 and processes the CV in the background;
+    poll GET /candidates/{candidate_id}/status until it is 'ready'.
     """
     # Save uploaded CV
-    cv_path = save_uploaded_file(await cv_file.read(), "uploads/cvs", cv_file.filename)
+    cv_path = await save_cv(cv_file)
     
     # Add candidate to database
-    candidate_id = db.add_candidate(name, email, phone, cv_path)
-    
-    # Process CV with agent
-    candidate_profile = recruiting_agent.process_cv_file(cv_path)
+    candidate_id = await anyio.to_thread.run_sync(db.add_candidate, name, email, phone, cv_path)
+    # A known email updates the existing candidate
+    forget_responses(("candidate", candidate_id))
     
-    # Update database with extracted information
-    db.update_candidate_profile(
-        candidate_id,
-        json.dumps(candidate_profile.education),
-        json.dumps(candidate_profile.work_experience),
-        json.dumps(candidate_profile.skills),
-        json.dumps(candidate_profile.certifications)
-    )
+    if not wait:
+        # Sync background tasks run in the threadpool once the response is sent
+        background_tasks.add_task(process_candidate, candidate_id, cv_path)
+        return accepted(candidate_id)
     
-    # Get the updated candidate profile
-    candidate = db.get_candidate(candidate_id)
+    # Process CV with agent, embed and store the result
+    candidate_profile = await anyio.to_thread.run_sync(process_candidate, candidate_id, cv_path)
     
-    # Convert database format to response model
+    # Respond with the extracted profile directly instead of reading back and re-decoding the stored row
     return CandidateResponse(
-        id=candidate["id"],
-        name=candidate["name"],
-        email=candidate["email"],
-        education=json.loads(candidate["education"] or "[]"),
-        work_experience=json.loads(candidate["work_experience"] or "[]"),
-        skills=json.loads(candidate["skills"] or "[]"),
-        certifications=json.loads(candidate["certifications"] or "[]")
+        id=candidate_id,
+        name=name,
+        email=email,
+        education=candidate_profile.education,
+        work_experience=candidate_profile.work_experience,
+        skills=candidate_profile.skills,
+        certifications=candidate_profile.certifications
     )
 
-@app.get("/candidates", response_model=List[CandidateResponse])
-async def get_all_candidates():
-    """Get all candidate profiles"""
-    candidates = db.get_all_candidates()
+@app.post("/candidates/batch", response_model=List[CandidateResponse])
+async def create_candidates_batch(
+    names: List[str] = Form(...),
+    emails: List[str] = Form(...),
+    phones: List[str] = Form(...),
+    cv_files: List[UploadFile] = File(...)
+):
+    """
+    Create several candidate profiles at once; the n-th name, email and phone belong to the n-th CV
+    
+    The CVs are processed concurrently and all candidates are inserted in a single transaction.
+    """
+    if not len(names) == len(emails) == len(phones) == len(cv_files):
+        raise HTTPException(status_code=422, detail="names, emails, phones and cv_files must have the same length")
+    
+    # Save uploaded CVs
+    cv_paths = [await save_cv(cv_file) for cv_file in cv_files]
+    
+    # Process CVs and embed the candidates with one batch each
+    candidate_profiles = await anyio.to_thread.run_sync(recruiting_agent.batch_process_cv_files, cv_paths)
+    embeddings = await anyio.to_thread.run_sync(matching_agent.profile_embeddings, candidate_profiles)
+    
+    candidate_rows = [
+        (
+            name, email, phone, cv_path,
+            orjson.dumps(profile.education).decode(),
+            orjson.dumps(profile.work_experience).decode(),
+            orjson.dumps(profile.skills).decode(),
+            orjson.dumps(profile.certifications).decode(),
+            *stored_embedding(embedding)
+        )
+        for name, email, phone, cv_path, profile, embedding
+        in zip(names, emails, phones, cv_paths, candidate_profiles, embeddings)
+    ]
+    candidate_ids = await anyio.to_thread.run_sync(db.add_candidates_bulk, candidate_rows)
+    forget_responses(*(("candidate", candidate_id) for candidate_id in candidate_ids))
     
-    # Convert database format to response models
     return [
         CandidateResponse(
-            id=candidate["id"],
-            name=candidate["name"],
-            email=candidate["email"],
-            education=json.loads(candidate["education"] or "[]"),
-            work_experience=json.loads(candidate["work_experience"] or "[]"),
-            skills=json.loads(candidate["skills"] or "[]"),
-            certifications=json.loads(candidate["certifications"] or "[]")
+            id=candidate_id,
+            name=name,
+            email=email,
+            education=profile.education,
+            work_experience=profile.work_experience,
+            skills=profile.skills,
+            certifications=profile.certifications
         )
-        for candidate in candidates
+        for candidate_id, name, email, profile in zip(candidate_ids, names, emails, candidate_profiles)
     ]
 
+@app.get("/candidates", response_model=List[CandidateResponse])
+async def get_all_candidates(limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), offset: int = Query(0, ge=0)):
+    """Get a page of candidate profiles, newest first"""
+    candidates = await anyio.to_thread.run_sync(db.get_all_candidates, limit, offset)
+    
+    # Convert database format to response models
+    return ORJSONResponse([candidate_response_from_row(candidate) for candidate in candidates])
+
 @app.get("/candidates/{candidate_id}", response_model=CandidateResponse)
 async def get_candidate(candidate_id: int):
     """Get a specific candidate profile by ID"""
-    candidate = db.get_candidate(candidate_id)
+    response = cached_response(("candidate", candidate_id))
+    
+    if response is None:
+        candidate = await anyio.to_thread.run_sync(db.get_candidate, candidate_id)
+        
+        if not candidate:
+            raise HTTPException(status_code=404, detail=f"Candidate with ID {candidate_id} not found")
+        
+        # Convert database format to response model
+        response = candidate_response_from_row(candidate)
+        cache_response(("candidate", candidate_id), response)
+    
+    return ORJSONResponse(response)
+
+@app.get("/candidates/{candidate_id}/status", response_model=ProcessingStatusResponse)
+async def get_candidate_status(candidate_id: int):
+    """Get the processing status of a candidate: 'processing', 'ready' or 'failed'"""
+    candidate = await anyio.to_thread.run_sync(db.get_candidate, candidate_id)
     
     if not candidate:
         raise HTTPException(status_code=404, detail=f"Candidate with ID {candidate_id} not found")
     
-    # Convert database format to response model
-    return CandidateResponse(
-        id=candidate["id"],
-        name=candidate["name"],
-        email=candidate["email"],
-        education=json.loads(candidate["education"] or "[]"),
-        work_experience=json.loads(candidate["work_experience"] or "[]"),
-        skills=json.loads(candidate["skills"] or "[]"),
-        certifications=json.loads(candidate["certifications"] or "[]")
-    )
+    return ProcessingStatusResponse(id=candidate_id, status=candidate["processing_status"])
 
 # Match Score Endpoints
 
@@ -305,8 +751,8 @@ async def calculate_match_score(job_id: int, candidate_id: int):
     4. Returns the match result
     """
     # Get job and candidate
-    job = db.get_job_description(job_id)
-    candidate = db.get_candidate(candidate_id)
+    job = await anyio.to_thread.run_sync(db.get_job_description, job_id)
+    candidate = await anyio.to_thread.run_sync(db.get_candidate, candidate_id)
     
     if not job:
         raise HTTPException(status_code=404, detail=f"Job description with ID {job_id} not found")
@@ -314,106 +760,161 @@ async def calculate_match_score(job_id: int, candidate_id: int):
         raise HTTPException(status_code=404, detail=f"Candidate with ID {candidate_id} not found")
     
     # Convert database format to agent models
-    job_summary = JobSummary(
-        title=job["title"],
-        summary=job["summarized_description"] or "",
-        required_skills=json.loads(job["required_skills"] or "[]"),
-        required_experience=job["required_experience"] or "",
-        responsibilities=json.loads(job["responsibilities"] or "[]")
-    )
-    
-    candidate_profile = CandidateProfile(
-        name=candidate["name"],
-        education=json.loads(candidate["education"] or "[]"),
-        work_experience=json.loads(candidate["work_experience"] or "[]"),
-        skills=json.loads(candidate["skills"] or "[]"),
-        certifications=json.loads(candidate["certifications"] or "[]")
-    )
+    job_summary = job_summary_from_row(job)
+    candidate_profile = candidate_profile_from_row(candidate)
     
     # Calculate match score
-    match_result = matching_agent.calculate_match(job_summary, candidate_profile)
+    match_result = await anyio.to_thread.run_sync(matching_agent.calculate_match, job_summary, candidate_profile)
     
     # Store match score in database
-    match_id = db.add_match_score(
+    match_id = await anyio.to_thread.run_sync(
+        db.add_match_score,
         job_id,
         candidate_id,
         match_result.score,
-        json.dumps(match_result.skills_match),
-        json.dumps(match_result.experience_match),
-        json.dumps(match_result.education_match)
+        match_result.skills_match,
+        match_result.experience_match,
+        match_result.education_match
     )
     
-    # Get the match from database with additional information
-    matches = db.get_match_scores_by_job(job_id)
-    match = next((m for m in matches if m["id"] == match_id), None)
-    
-    # Convert database format to response model
+    # Respond with the computed result directly instead of reading back and re-decoding the stored row
     return MatchScoreResponse(
-        id=match["id"],
-        job_id=match["job_id"],
+        id=match_id,
+        job_id=job_id,
         job_title=job["title"],
-        candidate_id=match["candidate_id"],
-        candidate_name=match["candidate_name"],
-        score=match["score"],
-        skills_match=json.loads(match["skills_match"] or "{}"),
-        experience_match=json.loads(match["experience_match"] or "{}"),
-        education_match=json.loads(match["education_match"] or "{}"),
+        candidate_id=candidate_id,
+        candidate_name=candidate["name"],
+        score=match_result.score,
+        skills_match=match_result.skills_match,
+        experience_match=match_result.experience_match,
+        education_match=match_result.education_match,
         explanation=match_result.explanation
     )
 
-@app.get("/match/job/{job_id}", response_model=List[MatchScoreResponse])
-async def get_matches_by_job(job_id: int):
-    """Get all matches for a specific job"""
-    job = db.get_job_description(job_id)
+@app.post("/match/job/{job_id}", response_model=List[MatchScoreResponse])
+async def calculate_match_scores_for_job(
+    job_id: int,
+    limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0)
+):
+    """
+    Calculate and store match scores between a job and a page of candidates
+    
+    Only candidates whose CV has been processed are scored, newest first, so one request
+    runs a bounded number of prompts. Candidates are scored with batched prompts and the
+    scores are stored in a single transaction.
+    """
+    job = await anyio.to_thread.run_sync(db.get_job_description, job_id)
     
     if not job:
         raise HTTPException(status_code=404, detail=f"Job description with ID {job_id} not found")
     
-    matches = db.get_match_scores_by_job(job_id)
+    candidates = await anyio.to_thread.run_sync(db.get_ready_candidates, limit, offset)
+    return await score_candidates_for_job(job, candidates)
+
+@app.post("/match/batch", response_model=List[MatchScoreResponse])
+async def calculate_match_scores_batch(batch: MatchBatchRequest):
+    """
+    Calculate and store match scores between a job and the given candidates
+    
+    Like POST /match for each candidate, but the candidates are embedded and compared with one
+    matrix product, scored with batched prompts, and stored in a single transaction.
+    """
+    job = await anyio.to_thread.run_sync(db.get_job_description, batch.job_id)
     
-    # Convert database format to response models
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job description with ID {batch.job_id} not found")
+    
+    # Duplicate IDs are scored once
+    candidate_ids = list(dict.fromkeys(batch.candidate_ids))
+    candidates = await anyio.to_thread.run_sync(db.get_candidates, candidate_ids)
+    
+    if len(candidates) != len(candidate_ids):
+        missing = sorted(set(candidate_ids) - {candidate["id"] for candidate in candidates})
+        raise HTTPException(status_code=404, detail=f"Candidates with IDs {missing} not found")
+    
+    return await score_candidates_for_job(job, candidates)
+
+@app.get("/match/job/{job_id}/shortlist", response_model=List[ShortlistEntry])
+async def get_shortlist(job_id: int, top_k: int = Query(10, ge=1)):
+    """
+    Rank all candidates for a job by semantic similarity
+    
+    Uses the embeddings stored when the job and candidates were created, so no
+    model is called for candidates that already have one.
+    """
+    job = await anyio.to_thread.run_sync(db.get_job_description, job_id)
+    
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job description with ID {job_id} not found")
+    
+    if job["embedding"]:
+        job_vector = decode_embedding(job["embedding"], job["embedding_scale"], job["embedding_compressed"])
+    else:
+        job_vector = (await anyio.to_thread.run_sync(matching_agent.job_embedding, job_summary_from_row(job))).astype(np.float32)
+        if not job_vector.any():
+            raise HTTPException(status_code=503, detail="Job embedding is unavailable")
+    
+    # All comparable candidate embeddings arrive as one contiguous matrix
+    candidate_ids, candidate_matrix = await anyio.to_thread.run_sync(db.load_candidate_embedding_matrix, job_vector.shape[0])
+    similarities = await anyio.to_thread.run_sync(
+        matching_agent.calculate_similarity_matrix, job_vector[np.newaxis, :], candidate_matrix
+    )
+    scores = np.clip(similarities[0], 0.0, 1.0)
+    
+    top = matching_agent.top_k_indices(scores, top_k)
+    # One query for the names; candidates deleted since the matrix was loaded are left out
+    top_ids = [int(candidate_ids[i]) for i in top]
+    names = {
+        candidate["id"]: candidate["name"]
+        for candidate in await anyio.to_thread.run_sync(db.get_candidates, top_ids)
+    }
     return [
-        MatchScoreResponse(
-            id=match["id"],
-            job_id=match["job_id"],
-            job_title=job["title"],
-            candidate_id=match["candidate_id"],
-            candidate_name=match["candidate_name"],
-            score=match["score"],
-            skills_match=json.loads(match["skills_match"] or "{}"),
-            experience_match=json.loads(match["experience_match"] or "{}"),
-            education_match=json.loads(match["education_match"] or "{}"),
-            explanation=""  # Not stored in database
+        ShortlistEntry(
+            candidate_id=candidate_id,
+            candidate_name=names[candidate_id],
+            score=float(scores[i])
         )
-        for match in matches
+        for i, candidate_id in zip(top, top_ids) if candidate_id in names
     ]
 
+@app.get("/match/job/{job_id}", response_model=List[MatchScoreResponse])
+async def get_matches_by_job(
+    job_id: int,
+    min_skill_score: Optional[float] = Query(None, ge=0, le=1),
+    limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0)
+):
+    """Get a page of matches for a specific job, best first, optionally only those with a skills score of at least min_skill_score"""
+    job = await anyio.to_thread.run_sync(db.get_job_description, job_id)
+    
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job description with ID {job_id} not found")
+    
+    if min_skill_score is None:
+        matches = await anyio.to_thread.run_sync(db.get_match_scores_by_job, job_id, limit, offset)
+    else:
+        matches = await anyio.to_thread.run_sync(db.get_top_matches, job_id, min_skill_score, limit, offset)
+    
+    # Convert database format to response models
+    return ORJSONResponse([match_response_from_row(match, job["title"], match["candidate_name"]) for match in matches])
+
 @app.get("/match/candidate/{candidate_id}", response_model=List[MatchScoreResponse])
-async def get_matches_by_candidate(candidate_id: int):
-    """Get all matches for a specific candidate"""
-    candidate = db.get_candidate(candidate_id)
+async def get_matches_by_candidate(
+    candidate_id: int,
+    limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0)
+):
+    """Get a page of matches for a specific candidate, best first"""
+    candidate = await anyio.to_thread.run_sync(db.get_candidate, candidate_id)
     
     if not candidate:
         raise HTTPException(status_code=404, detail=f"Candidate with ID {candidate_id} not found")
     
-    matches = db.get_match_scores_by_candidate(candidate_id)
+    matches = await anyio.to_thread.run_sync(db.get_match_scores_by_candidate, candidate_id, limit, offset)
     
     # Convert database format to response models
-    return [
-        MatchScoreResponse(
-            id=match["id"],
-            job_id=match["job_id"],
-            job_title=match["job_title"],
-            candidate_id=match["candidate_id"],
-            candidate_name=candidate["name"],
-            score=match["score"],
-            skills_match=json.loads(match["skills_match"] or "{}"),
-            experience_match=json.loads(match["experience_match"] or "{}"),
-            education_match=json.loads(match["education_match"] or "{}"),
-            explanation=""  # Not stored in database
-        )
-        for match in matches
-    ]
+    return ORJSONResponse([match_response_from_row(match, match["job_title"], candidate["name"]) for match in matches])
 
 # Interview Endpoints
 
@@ -428,246 +929,150 @@ async def schedule_interview(interview_data: InterviewRequest):
     3. Generates a personalized email template
     4. Returns the interview details
     """
-    # Get job and candidate
-    job = db.get_job_description(interview_data.job_id)
-    candidate = db.get_candidate(interview_data.candidate_id)
+    return (await schedule_interviews([interview_data]))[0]
+
+@app.post("/interviews/batch", response_model=List[InterviewResponse])
+async def schedule_interviews_batch(interviews: List[InterviewRequest] = Body(..., min_length=1)):
+    """
+    Schedule several interviews at once
+    
+    The interviews are stored in a single transaction and their emails are generated concurrently.
+    """
+    return await schedule_interviews(interviews)
+
+@app.get("/interviews/email/stream")
+async def stream_interview_email(job_id: int, candidate_id: int, slot_datetime: str):
+    """
+    Stream a personalized interview request email as Server-Sent Events
+    
+    Each generated chunk is sent as a message as soon as the model produces
+    it; a final "done" event marks the end of the email.
+    """
+    job = await anyio.to_thread.run_sync(db.get_job_description, job_id)
+    candidate = await anyio.to_thread.run_sync(db.get_candidate, candidate_id)
     
     if not job:
-        raise HTTPException(status_code=404, detail=f"Job description with ID {interview_data.job_id} not found")
+        raise HTTPException(status_code=404, detail=f"Job description with ID {job_id} not found")
     if not candidate:
-        raise HTTPException(status_code=404, detail=f"Candidate with ID {interview_data.candidate_id} not found")
-    
-    # Get the match score if available
-    matches = db.get_match_scores_by_job(interview_data.job_id)
-    match = next((m for m in matches if m["candidate_id"] == interview_data.candidate_id), None)
-    
-    # Parse scheduled time
-    scheduled_time = parse_datetime(interview_data.slot_datetime)
-    
-    # Create interview link if not provided
-    interview_link = interview_data.interview_link
-    if not interview_link:
-        interview_link = f"https://meet.example.com/{job['id']}-{candidate['id']}-{scheduled_time.strftime('%Y%m%d%H%M')}"
-    
-    # Schedule interview
-    interview_id = db.schedule_interview(
-        interview_data.job_id,
-        interview_data.candidate_id,
-        scheduled_time,
-        interview_data.duration_minutes,
-        interview_link
-    )
+        raise HTTPException(status_code=404, detail=f"Candidate with ID {candidate_id} not found")
     
-    # Generate personalized email template if we have match data
-    email_template = None
-    if match:
-        # Convert database format to agent models
-        job_summary = JobSummary(
-            title=job["title"],
-            summary=job["summarized_description"] or "",
-            required_skills=json.loads(job["required_skills"] or "[]"),
-            required_experience=job["required_experience"] or "",
-            responsibilities=json.loads(job["responsibilities"] or "[]")
-        )
-        
-        candidate_profile = CandidateProfile(
-            name=candidate["name"],
-            education=json.loads(candidate["education"] or "[]"),
-            work_experience=json.loads(candidate["work_experience"] or "[]"),
-            skills=json.loads(candidate["skills"] or "[]"),
-            certifications=json.loads(candidate["certifications"] or "[]")
-        )
-        
-        match_result = MatchResult(
-            score=match["score"],
-            skills_match=json.loads(match["skills_match"] or "{}"),
-            experience_match=json.loads(match["experience_match"] or "{}"),
-            education_match=json.loads(match["education_match"] or "{}"),
-            explanation="Match found"
-        )
-        
-        # Generate a single slot from the scheduled time
-        slot = {
-            "datetime": scheduled_time.isoformat(),
-            "display": scheduled_time.strftime("%A, %B %d, %Y at %I:%M %p")
-        }
-        
-        interview_schedule = scheduling_agent.create_interview_request(
-            job_summary, 
-            candidate_profile, 
-            match_result, 
-            [slot]
-        )
-        
-        email_template = interview_schedule.email_template
+    match = await anyio.to_thread.run_sync(db.get_match_for_pair, job_id, candidate_id)
     
-    # Get all interviews for the job
-    interviews = db.get_interviews_by_job(interview_data.job_id)
-    interview = next((i for i in interviews if i["id"] == interview_id), None)
+    if not match:
+        raise HTTPException(status_code=404, detail=f"No match score found for job {job_id} and candidate {candidate_id}")
     
-    # Convert database format to response model
-    return InterviewResponse(
-        id=interview["id"],
-        job_id=interview["job_id"],
-        job_title=interview["job_title"],
-        candidate_id=interview["candidate_id"],
-        candidate_name=interview["candidate_name"],
-        scheduled_time=interview["scheduled_time"],
-        duration_minutes=interview["duration_minutes"],
-        interview_link=interview["interview_link"],
-        status=interview["status"],
-        email_template=email_template
+    chunks = scheduling_agent.stream_email(
+        job_summary_from_row(job),
+        candidate_profile_from_row(candidate),
+        match_result_from_row(match),
+        [interview_slot(parse_datetime(slot_datetime))]
     )
+    
+    def events():
+        for chunk in chunks:
+            yield sse_event(chunk)
+        yield sse_event("", event="done")
+    
+    # A sync generator is iterated in the threadpool, keeping the event loop free
+    return StreamingResponse(events(), media_type="text/event-stream")
 
 @app.get("/interviews/job/{job_id}", response_model=List[InterviewResponse])
 async def get_interviews_by_job(job_id: int):
     """Get all interviews for a specific job"""
-    job = db.get_job_description(job_id)
+    job = await anyio.to_thread.run_sync(db.get_job_description, job_id)
     
     if not job:
         raise HTTPException(status_code=404, detail=f"Job description with ID {job_id} not found")
     
-    interviews = db.get_interviews_by_job(job_id)
+    interviews = await anyio.to_thread.run_sync(db.get_interviews_by_job, job_id)
     
     # Convert database format to response models
-    return [
-        InterviewResponse(
-            id=interview["id"],
-            job_id=interview["job_id"],
-            job_title=interview["job_title"],
-            candidate_id=interview["candidate_id"],
-            candidate_name=interview["candidate_name"],
-            scheduled_time=interview["scheduled_time"],
-            duration_minutes=interview["duration_minutes"],
-            interview_link=interview["interview_link"],
-            status=interview["status"],
-            email_template=None
-        )
-        for interview in interviews
-    ]
+    return ORJSONResponse([interview_response_from_row(interview, interview["candidate_name"]) for interview in interviews])
 
 @app.get("/interviews/candidate/{candidate_id}", response_model=List[InterviewResponse])
 async def get_interviews_by_candidate(candidate_id: int):
     """Get all interviews for a specific candidate"""
-    candidate = db.get_candidate(candidate_id)
+    candidate = await anyio.to_thread.run_sync(db.get_candidate, candidate_id)
     
     if not candidate:
         raise HTTPException(status_code=404, detail=f"Candidate with ID {candidate_id} not found")
     
-    interviews = db.get_interviews_by_candidate(candidate_id)
+    interviews = await anyio.to_thread.run_sync(db.get_interviews_by_candidate, candidate_id)
     
     # Convert database format to response models
-    return [
-        InterviewResponse(
-            id=interview["id"],
-            job_id=interview["job_id"],
-            job_title=interview["job_title"],
-            candidate_id=interview["candidate_id"],
-            candidate_name=candidate["name"],
-            scheduled_time=interview["scheduled_time"],
-            duration_minutes=interview["duration_minutes"],
-            interview_link=interview["interview_link"],
-            status=interview["status"],
-            email_template=None
-        )
-        for interview in interviews
-    ]
+    return ORJSONResponse([interview_response_from_row(interview, candidate["name"]) for interview in interviews])
 
 @app.patch("/interviews/{interview_id}", response_model=InterviewResponse)
 async def update_interview_status(interview_id: int, status: str, notes: Optional[str] = None):
     """Update the status of an interview"""
-    # Get interview data before update
-    job_id = None
-    candidate_id = None
-    
-    interviews_data = None
-    for job in db.get_all_job_descriptions():
-        interviews = db.get_interviews_by_job(job["id"])
-        interview = next((i for i in interviews if i["id"] == interview_id), None)
-        if interview:
-            job_id = interview["job_id"]
-            candidate_id = interview["candidate_id"]
-            interviews_data = interviews
-            break
-    
-    if not job_id or not candidate_id or not interviews_data:
+    interview = await anyio.to_thread.run_sync(db.get_interview, interview_id)
+    
+    if not interview:
         raise HTTPException(status_code=404, detail=f"Interview with ID {interview_id} not found")
     
     # Update status
-    success = db.update_interview_status(interview_id, status, notes)
+    success = await anyio.to_thread.run_sync(db.update_interview_status, interview_id, status, notes)
     
     if not success:
         raise HTTPException(status_code=500, detail="Failed to update interview status")
     
-    # Get updated interview
-    job = db.get_job_description(job_id)
-    candidate = db.get_candidate(candidate_id)
-    interviews = db.get_interviews_by_job(job_id)
-    interview = next((i for i in interviews if i["id"] == interview_id), None)
+    # The interview read before the update is current apart from its status
+    interview["status"] = status
     
     # Convert database format to response model
-    return InterviewResponse(
-        id=interview["id"],
-        job_id=interview["job_id"],
-        job_title=interview["job_title"],
-        candidate_id=interview["candidate_id"],
-        candidate_name=interview["candidate_name"],
-        scheduled_time=interview["scheduled_time"],
-        duration_minutes=interview["duration_minutes"],
-        interview_link=interview["interview_link"],
-        status=interview["status"],
-        email_template=None
-    )
+    return ORJSONResponse(interview_response_from_row(interview, interview["candidate_name"]))
 
 # --- Utility endpoints ---
 
+@app.get("/metrics")
+async def get_metrics():
+    """Hit and miss counts of this worker's detail response cache"""
+    with _response_cache_lock:
+        return {
+            "response_cache": {
+                **_response_cache_stats,
+                "size": len(_response_cache),
+                "ttl_seconds": RESPONSE_CACHE_TTL
+            }
+        }
+
 @app.get("/interview-slots", response_model=List[Dict[str, str]])
 async def get_interview_slots(n_slots: int = Query(3, gt=0, lt=10)):
     """Generate possible interview time slots"""
-    slots = scheduling_agent.generate_interview_slots(n_slots)
+    slots = await anyio.to_thread.run_sync(scheduling_agent.generate_interview_slots, n_slots)
     return [{"datetime": slot["datetime"], "display": slot["display"]} for slot in slots]
 
 @app.get("/match-stats/job/{job_id}")
 async def get_job_match_statistics(job_id: int):
     """Get match statistics for a job"""
-    job = db.get_job_description(job_id)
+    job = await anyio.to_thread.run_sync(db.get_job_description, job_id)
     
     if not job:
         raise HTTPException(status_code=404, detail=f"Job description with ID {job_id} not found")
     
-    matches = db.get_match_scores_by_job(job_id)
+    # Count, mean and top 5 are computed in SQL
+    stats = await anyio.to_thread.run_sync(db.get_match_statistics, job_id, 5)
     
-    if not matches:
-        return {
-            "job_id": job_id,
-            "job_title": job["title"],
-            "total_candidates": 0,
-            "average_score": 0,
-            "top_candidates": []
-        }
-    
-    # Calculate statistics
-    average_score = sum(match["score"] for match in matches) / len(matches)
-    
-    # Get top 5 candidates
-    top_candidates = sorted(matches, key=lambda x: x["score"], reverse=True)[:5]
+    # Mean similarity of the job to every candidate with an embedding, from one dot product with their mean
+    average_similarity = None
+    if job["embedding"]:
+        job_vector = decode_embedding(job["embedding"], job["embedding_scale"], job["embedding_compressed"])
+        candidate_mean = await anyio.to_thread.run_sync(db.candidate_embedding_mean, job_vector.shape[0])
+        if candidate_mean is not None:
+            average_similarity = mean_cosine_similarity(job_vector, candidate_mean)
     
     return {
         "job_id": job_id,
         "job_title": job["title"],
-        "total_candidates": len(matches),
-        "average_score": average_score,
-        "top_candidates": [
-            {
-                "candidate_id": match["candidate_id"],
-                "candidate_name": match["candidate_name"],
-                "score": match["score"]
-            }
-            for match in top_candidates
-        ]
+        "total_candidates": stats["total"],
+        "average_score": stats["average"],
+        "average_semantic_similarity": average_similarity,
+        "top_candidates": stats["top_candidates"]
     }
 
 # Main entry point
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
+    # Several workers need the app as an import string; uvloop and httptools are used when installed.
+    # In production run: gunicorn main:app -k uvicorn.workers.UvicornWorker -w $(nproc) --bind 0.0.0.0:8000
+    uvicorn.run("main:app", host="0.0.0.0", port=8000, workers=int(os.environ.get("WEB_CONCURRENCY", "1"))) 
\ No newline at end of file
@@ -1,12 +1,25 @@
+from __future__ import annotations
+
 import os
-import json
-import uuid
+import re
+import secrets
+import atexit
+import hashlib
+import difflib
+import functools
+import base64
+import contextlib
+import asyncio
 import logging
-import numpy as np
-import requests
+import threading
+import orjson
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Optional, Tuple, Union
+
+# numpy, requests, httpx and aiofiles are imported by the functions that use them,
+# so importing utils for its light helpers does not pay for them
 
 # Configure logging
 logging.basicConfig(
@@ -24,6 +37,88 @@ logger = logging.getLogger("recruitment_system")
 OLLAMA_API_BASE = os.environ.get("OLLAMA_API_BASE", "http://localhost:11434")
 EMBEDDING_MODEL = os.environ.get("EMBEDDING_MODEL", "nomic-embed-text")
 
+# Connections kept open to Ollama by the shared HTTP clients
+OLLAMA_MAX_CONNECTIONS = int(os.environ.get("OLLAMA_MAX_CONNECTIONS", "32"))
+
+# Seconds an embedding request may take; batched requests carry many texts, so allow for large payloads
+OLLAMA_TIMEOUT = float(os.environ.get("OLLAMA_TIMEOUT", "60"))
+
+# Texts sent per /api/embed request, and sub-batch requests in flight at once
+OLLAMA_BATCH_SIZE = int(os.environ.get("OLLAMA_BATCH_SIZE", "32"))
+OLLAMA_CONCURRENCY = int(os.environ.get("OLLAMA_CONCURRENCY", "4"))
+
+# Texts longer than this many characters are embedded in windows of this size, averaged into one vector
+EMBEDDING_CHUNK_CHARS = int(os.environ.get("EMBEDDING_CHUNK_CHARS", "4000"))
+
+# A batch is split in half and retried when Ollama answers 413, or an error body containing one of these;
+# other failures, such as a restarting server, are not the batch's size and fall back to one-by-one requests
+_BATCH_TOO_LARGE_MARKERS = ("too large", "context length", "exceeds")
+
+# Request bodies are encoded with orjson, so the content type is set by hand
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Attempts to reconnect when opening a connection to Ollama fails; requests already sent are not retried
+OLLAMA_CONNECT_RETRIES = 3
+
+# Seconds an idle pooled connection to Ollama is kept open
+OLLAMA_KEEPALIVE_EXPIRY = 30.0
+
+@functools.lru_cache(maxsize=1)
+def _http_session():
+    """Keep-alive session for blocking Ollama calls, shared by all threads so each call reuses a pooled connection"""
+    import requests
+    
+    session = requests.Session()
+    for prefix in ("http://", "https://"):
+        session.mount(prefix, requests.adapters.HTTPAdapter(
+            pool_maxsize=OLLAMA_MAX_CONNECTIONS, max_retries=OLLAMA_CONNECT_RETRIES
+        ))
+    # Scripts that import utils without running the app still release the pooled sockets
+    atexit.register(session.close)
+    return session
+
+# Near-duplicate texts reuse a cached embedding when their SimHashes differ in at most
+# FUZZY_CACHE_MAX_BITS bits and their edit distance is within FUZZY_CACHE_MAX_EDIT of the text length
+FUZZY_CACHE_MAX_BITS = int(os.environ.get("FUZZY_CACHE_MAX_BITS", "2"))
+FUZZY_CACHE_MAX_EDIT = float(os.environ.get("FUZZY_CACHE_MAX_EDIT", "0.05"))
+
+# Uploads are written to disk in chunks of this size and rejected once they exceed MAX_UPLOAD_BYTES
+UPLOAD_CHUNK_SIZE = 1 << 20
+MAX_UPLOAD_BYTES = int(os.environ.get("MAX_UPLOAD_BYTES", str(20 << 20)))
+
+# Embeddings persisted across restarts as float16 in the embedding_cache table of this database
+EMBEDDING_CACHE_DB = os.environ.get("EMBEDDING_CACHE_DB", "recruitment.db")
+
+# The application's Database, registered with use_database so the cache shares its single writer
+_app_db = None
+
+def use_database(database: Any) -> None:
+    """Keep the embedding cache in the application's Database when EMBEDDING_CACHE_DB is the same file"""
+    global _app_db
+    _app_db = database
+
+@functools.lru_cache(maxsize=1)
+def _own_embedding_db():
+    """Separate Database for an embedding cache kept in another file, opened on first use"""
+    from database import Database
+    return Database(EMBEDDING_CACHE_DB)
+
+def _embedding_db():
+    """Database holding the persistent embedding cache"""
+    # A second Database on the same file would bring its own writer and race the application's transactions
+    if _app_db is not None and os.path.abspath(_app_db.db_path) == os.path.abspath(EMBEDDING_CACHE_DB):
+        return _app_db
+    return _own_embedding_db()
+
+# Directories already created by this process, so uploads skip the makedirs syscalls
+_created_dirs = set()
+
+def _ensure_dir(directory: str):
+    """Create a directory once per process"""
+    if directory not in _created_dirs:
+        os.makedirs(directory, exist_ok=True)
+        _created_dirs.add(directory)
+
 def setup_file_storage():
     """Create necessary directories for file storage"""
     directories = [
@@ -33,13 +128,14 @@ def setup_file_storage():
     ]
     
     for directory in directories:
-        os.makedirs(directory, exist_ok=True)
+        _ensure_dir(directory)
         logger.info(f"Created directory: {directory}")
 
 def generate_unique_filename(original_filename: str) -> str:
     """Generate a unique filename to avoid collisions"""
     ext = os.path.splitext(original_filename)[1]
-    return f"{uuid.uuid4().hex}{ext}"
+    # 128 random bits straight from os.urandom as hex, without building a UUID object
+    return f"{secrets.token_hex(16)}{ext}"
 
 def save_uploaded_file(file_content: bytes, directory: str, original_filename: str) -> str:
     """
@@ -56,18 +152,64 @@ def save_uploaded_file(file_content: bytes, directory: str, original_filename: s
     filename = generate_unique_filename(original_filename)
     file_path = os.path.join(directory, filename)
     
-    os.makedirs(directory, exist_ok=True)
+    _ensure_dir(directory)
     
-    with open(file_path, "wb") as f:
-        f.write(file_content)
+    # Written in one call under a temporary name, then renamed, so a crash never leaves a partial file
+    temp_path = file_path + ".tmp"
+    Path(temp_path).write_bytes(file_content)
+    os.replace(temp_path, file_path)
+    
+    logger.info(f"Saved file to {file_path}")
+    return file_path
+
+class UploadTooLargeError(Exception):
+    """Raised when an uploaded file is larger than MAX_UPLOAD_BYTES"""
+
+async def asave_upload(upload: Any, directory: str, max_bytes: int = MAX_UPLOAD_BYTES) -> str:
+    """
+    Stream an uploaded file to the specified directory without holding it in memory
+    
+    Args:
+        upload: Uploaded file with a filename and an async read(size) method, such as FastAPI's UploadFile
+        directory: Target directory
+        max_bytes: Largest accepted file size
+        
+    Returns:
+        Path to the saved file
+    """
+    import aiofiles
+    
+    filename = generate_unique_filename(upload.filename or "")
+    file_path = os.path.join(directory, filename)
+    
+    _ensure_dir(directory)
+    
+    # Streamed under a temporary name and renamed once complete, so a failed upload never leaves a partial file
+    temp_path = file_path + ".tmp"
+    size = 0
+    try:
+        async with aiofiles.open(temp_path, "wb") as f:
+            while chunk := await upload.read(UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                # Stop at the first chunk past the limit
+                if size > max_bytes:
+                    raise UploadTooLargeError(f"{upload.filename} is larger than {max_bytes} bytes")
+                await f.write(chunk)
+    except BaseException:
+        # The file may never have been created; a failed cleanup must not replace the original error
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(temp_path)
+        raise
+    
+    os.replace(temp_path, file_path)
     
     logger.info(f"Saved file to {file_path}")
     return file_path
 
 def read_file(file_path: str) -> str:
     """Read the contents of a file"""
-    with open(file_path, "r", encoding="utf-8") as f:
-        return f.read()
+    # One read of the raw bytes and one decode, bypassing the text I/O layer
+    return Path(file_path).read_bytes().decode("utf-8", errors="replace")
 
 def format_datetime(dt: datetime) -> str:
     """Format a datetime object for display"""
@@ -83,11 +225,36 @@ def calculate_date_overlap(start1: datetime, end1: datetime, start2: datetime, e
     overlap_end = min(end1, end2)
     
     if overlap_start < overlap_end:
-        # Calculate the overlap in minutes
-        return (overlap_end - overlap_start).seconds // 60
+        # Calculate the overlap in minutes; total_seconds keeps the whole days that .seconds drops
+        return int((overlap_end - overlap_start).total_seconds()) // 60
     
     return 0  # No overlap
 
+def calculate_date_overlap_batched(starts1: Any, ends1: Any, starts2: Any, ends2: Any) -> np.ndarray:
+    """
+    Calculate the overlaps in minutes between many pairs of time periods at once
+    
+    Periods are given as epoch seconds, the form interview times are stored in. The arrays
+    broadcast against each other, so e.g. starts1[:, None] and starts2[None, :] compare every
+    period of one set with every period of another in one pass.
+    
+    Args:
+        starts1: Start times of the first periods, in epoch seconds
+        ends1: End times of the first periods, in epoch seconds
+        starts2: Start times of the second periods, in epoch seconds
+        ends2: End times of the second periods, in epoch seconds
+        
+    Returns:
+        int64 array of overlaps in minutes, 0 where periods do not overlap
+    """
+    import numpy as np
+    
+    overlap = (
+        np.minimum(np.asarray(ends1, dtype=np.int64), np.asarray(ends2, dtype=np.int64)) -
+        np.maximum(np.asarray(starts1, dtype=np.int64), np.asarray(starts2, dtype=np.int64))
+    )
+    return np.maximum(overlap, 0) // 60
+
 def parse_boolean(value: Any) -> bool:
     """Parse various boolean representations to a Python boolean"""
     if isinstance(value, bool):
@@ -102,58 +269,229 @@ def serialize_model(model: Any) -> Dict[str, Any]:
     
     This handles datetime conversion for JSON serialization
     """
-    if hasattr(model, "dict"):
-        data = model.dict()
-        # Handle datetime objects
-        for key, value in data.items():
-            if isinstance(value, datetime):
-                data[key] = value.isoformat()
-            elif isinstance(value, list) and value and isinstance(value[0], dict):
-                # Handle lists of objects
-                for i, item in enumerate(value):
-                    for k, v in item.items():
-                        if isinstance(v, datetime):
-                            value[i][k] = v.isoformat()
-    else:
-        # If not a Pydantic model, try to convert to dict
-        data = dict(model)
-    
-    return data
+    data = model.dict() if hasattr(model, "dict") else dict(model)
+    # One orjson round trip formats datetimes at any depth in C, instead of walking the fields in Python;
+    # non-string keys, such as int-keyed maps, are written as strings as in any JSON response
+    return orjson.loads(orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS))
 
 def extract_text_from_pdf(pdf_path: str) -> str:
+    """Extract text from a PDF file, page by page"""
+    import pdfplumber
+    
+    with pdfplumber.open(pdf_path) as pdf:
+        return "\n".join(page.extract_text() or "" for page in pdf.pages)
+
+def extract_text_from_docx(docx_path: str) -> str:
+    """Extract the paragraph text from a Word document"""
+    import docx
+    
+    document = docx.Document(docx_path)
+    return "\n".join(paragraph.text for paragraph in document.paragraphs)
+
+def extract_text_from_image(image_path: str, model: str) -> str:
+    """
+    Transcribe the text of a scanned or photographed document with an Ollama vision model
+    
+    Args:
+        image_path: Path to the image file
+        model: Vision model to use
+        
+    Returns:
+        Text read from the image
+    """
+    with open(image_path, "rb") as f:
+        image = base64.b64encode(f.read()).decode("ascii")
+    
+    response = _http_session().post(
+        f"{OLLAMA_API_BASE}/api/generate",
+        data=orjson.dumps({
+            "model": model,
+            "prompt": "Transcribe all text in this document image. Return only the text.",
+            "images": [image],
+            "stream": False,
+            "options": {"temperature": 0}
+        }),
+        headers=_JSON_HEADERS
+    )
+    response.raise_for_status()
+    return orjson.loads(response.content).get("response", "")
+
+def extract_text(file_path: str, vision_model: str) -> str:
     """
-    Extract text from a PDF file
+    Extract plain text from a CV file, dispatching on the file extension
     
-    In a real implementation, this would use a PDF extraction library.
-    For simplicity, we're returning a placeholder.
+    Args:
+        file_path: Path to a .txt, .docx, .pdf or image file
+        vision_model: Ollama vision model used for image files
+        
+    Returns:
+        Extracted text
     """
-    # This is a stub - in a real application, you would use PyPDF2, pdfplumber, or similar
-    return f"Placeholder text extracted from {pdf_path}"
+    suffix = Path(file_path).suffix.lower()
+    
+    if suffix == ".pdf":
+        return extract_text_from_pdf(file_path)
+    if suffix == ".docx":
+        return extract_text_from_docx(file_path)
+    if suffix in (".png", ".jpg", ".jpeg"):
+        return extract_text_from_image(file_path, vision_model)
+    
+    # Anything else is treated as plain text; undecodable bytes are replaced rather than failing the whole CV
+    return read_file(file_path)
+
+# One "@", a non-empty local part and a domain of at least two non-empty dot-separated labels
+_EMAIL_PATTERN = re.compile(r"[^@]+@[^@.]+(?:\.[^@.]+)+")
 
 def validate_email(email: str) -> bool:
     """Validate an email address format"""
-    # Simple validation using split - in a real app, use a regex or validation library
-    parts = email.split('@')
-    if len(parts) != 2:
-        return False
+    # Compiled once; a single C-level match instead of several splits per call
+    return _EMAIL_PATTERN.fullmatch(email) is not None
+
+def log_event(event_type: str, details: Dict[str, Any]):
+    """Log an event with details"""
+    logger.info(f"Event: {event_type} - {orjson.dumps(details).decode()}")
     
-    if not parts[0] or not parts[1]:
-        return False
+class EmbeddingError(Exception):
+    """Raised when the embedding API returns an error response"""
+    
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+def _prepare_embedding_text(text: str) -> str:
+    """Normalize whitespace before embedding"""
+    # Whitespace differences do not change the meaning, so they should not miss the cache
+    return " ".join(text.split())
+
+def _embedding_chunks(text: str) -> List[str]:
+    """Split already-normalized text into windows of at most EMBEDDING_CHUNK_CHARS, breaking between words"""
+    if len(text) <= EMBEDDING_CHUNK_CHARS:
+        return [text]
+    
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = start + EMBEDDING_CHUNK_CHARS
+        if end < len(text):
+            # Break at the last space in the window so no word is split across chunks
+            space = text.rfind(" ", start + 1, end)
+            if space > 0:
+                end = space
+        chunks.append(text[start:end].strip())
+        start = end
+    return [chunk for chunk in chunks if chunk]
+
+def _mean_embedding(vectors: List[Optional[np.ndarray]]) -> Optional[np.ndarray]:
+    """
+    Combine the embeddings of a text's chunks into one unit vector
+    
+    The mean of the normalized chunk vectors points where the average cosine
+    similarity to the chunks is highest, so it stands in for the whole text.
+    """
+    import numpy as np
+    
+    if any(vector is None for vector in vectors):
+        return None
+    if len(vectors) == 1:
+        return vectors[0]
+    
+    stacked = np.stack(vectors)
+    mean = (stacked / np.maximum(np.linalg.norm(stacked, axis=1, keepdims=True), 1e-12)).mean(axis=0)
+    return mean / max(float(np.linalg.norm(mean)), 1e-12)
+
+def _embedding_cache_key(text: str, model: str) -> bytes:
+    """Key of an embedding in the embedding_cache table"""
+    return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).digest()
+
+def _simhash(text: str) -> int:
+    """Signed 64-bit SimHash of the text's character 4-grams, so small edits flip few bits"""
+    import numpy as np
     
-    domain_parts = parts[1].split('.')
-    if len(domain_parts) < 2:
+    shingles = {text[i:i + 4] for i in range(max(len(text) - 3, 1))}
+    hashes = np.array(
+        [int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "little") for shingle in shingles],
+        dtype=np.uint64
+    )
+    # Each bit is set when most shingle hashes have it set
+    bits = (hashes[:, np.newaxis] >> np.arange(64, dtype=np.uint64)) & np.uint64(1)
+    value = sum(1 << int(i) for i in np.flatnonzero(bits.sum(axis=0) * 2 > len(hashes)))
+    # SQLite integers are signed
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+def _within_edit_distance(text: str, other: str, limit: int) -> bool:
+    """Whether two texts differ by at most limit characters, bounded from a word-level diff"""
+    if abs(len(text) - len(other)) > limit:
         return False
     
-    return all(part for part in domain_parts)
+    words, other_words = text.split(" "), other.split(" ")
+    distance = 0
+    for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(None, words, other_words, autojunk=False).get_opcodes():
+        if tag != "equal":
+            distance += max(len(" ".join(words[i1:i2])), len(" ".join(other_words[j1:j2])))
+            if distance > limit:
+                return False
+    return True
 
-def log_event(event_type: str, details: Dict[str, Any]):
-    """Log an event with details"""
-    logger.info(f"Event: {event_type} - {json.dumps(details)}")
+def _fuzzy_cached_embedding(text: str, model: str, simhash: int) -> Optional[np.ndarray]:
+    """Return the cached embedding of a near-duplicate of already-normalized text, if there is one"""
+    import numpy as np
+    
+    limit = int(len(text) * FUZZY_CACHE_MAX_EDIT)
+    for row in _embedding_db().find_similar_cached_embeddings(model, simhash, FUZZY_CACHE_MAX_BITS):
+        if row["text"] is not None and _within_edit_distance(text, row["text"], limit):
+            return np.frombuffer(row["vector"], dtype=np.float16).astype(np.float32)
+    return None
+
+@functools.lru_cache(maxsize=4096)
+def _cached_embedding(text: str, model: str) -> np.ndarray:
+    """
+    Return the embedding of already-normalized text, from memory, the SQLite cache or the Ollama API
+    
+    Failures raise instead of returning, so they are never memoized.
+    """
+    import numpy as np
     
+    cache_key = _embedding_cache_key(text, model)
+    cached = _embedding_db().get_cached_embedding(cache_key)
+    if cached is not None:
+        return np.frombuffer(cached, dtype=np.float16).astype(np.float32)
+    
+    simhash = _simhash(text)
+    embedding = _fuzzy_cached_embedding(text, model, simhash)
+    if embedding is not None:
+        # Store the reused vector under the exact key so the next lookup is an exact hit
+        _embedding_db().add_cached_embedding(
+            cache_key, model, len(embedding), embedding.astype(np.float16).tobytes(), simhash, text
+        )
+        return embedding
+    
+    # Call Ollama API to generate embeddings; /api/embed replaces the deprecated /api/embeddings
+    response = _http_session().post(
+        f"{OLLAMA_API_BASE}/api/embed",
+        data=orjson.dumps({"model": model, "input": text}),
+        headers=_JSON_HEADERS,
+        timeout=OLLAMA_TIMEOUT
+    )
+    
+    if response.status_code != 200:
+        raise EmbeddingError(response.text, response.status_code)
+    
+    embedding = np.asarray(orjson.loads(response.content)["embeddings"][0], dtype=np.float32)
+    # Persisted at half precision to halve the disk footprint
+    _embedding_db().add_cached_embedding(
+        cache_key, model, len(embedding), embedding.astype(np.float16).tobytes(), simhash, text
+    )
+    return embedding
+
 def generate_embedding(text: str, model: str = EMBEDDING_MODEL) -> Union[List[float], None]:
     """
     Generate text embedding using Ollama API
     
+    Embeddings are memoized in memory and in the database, keyed on the
+    whitespace-normalized text and the model, so each unique text is only embedded once.
+    Texts longer than EMBEDDING_CHUNK_CHARS are embedded chunk by chunk in one
+    batched request and the chunk vectors averaged.
+    
     Args:
         text: Text to embed
         model: Embedding model to use (default: nomic-embed-text)
@@ -162,34 +500,348 @@ def generate_embedding(text: str, model: str = EMBEDDING_MODEL) -> Union[List[fl
         List of floats representing the embedding, or None if there was an error
     """
     try:
-        # For very long texts, we truncate to avoid exceeding token limits
-        # This is a simplistic approach - in a production system, you might want
-        # to implement more sophisticated chunking and averaging
-        if len(text) > 8192:
-            text = text[:8192]
-            logger.warning("Text truncated to 8192 characters for embedding generation")
+        prepared = _prepare_embedding_text(text)
+        if len(prepared) > EMBEDDING_CHUNK_CHARS:
+            embedding = _embedding_vectors([prepared], model)[0]
+            return None if embedding is None else embedding.tolist()
+        return _cached_embedding(prepared, model).tolist()
+    
+    except EmbeddingError as e:
+        logger.error(f"Failed to generate embedding: {str(e)}")
+        return None
+    
+    except Exception as e:
+        # A random vector would silently skew match scores, so callers get None and fall back themselves
+        logger.error(f"Error generating embedding: {str(e)}")
+        return None
+
+def _lookup_embeddings(prepared: List[str], model: str) -> Tuple[Dict[str, bytes], Dict[str, np.ndarray]]:
+    """Look up the unique texts in one cache query, then near-duplicates, returning their cache keys and the vectors found"""
+    import numpy as np
+    
+    keys = {text: _embedding_cache_key(text, model) for text in dict.fromkeys(prepared)}
+    cached = _embedding_db().get_cached_embeddings(list(keys.values()))
+    vectors = {
+        text: np.frombuffer(cached[key], dtype=np.float16).astype(np.float32)
+        for text, key in keys.items() if key in cached
+    }
+    
+    reused = []
+    for text in keys:
+        if text in vectors:
+            continue
+        simhash = _simhash(text)
+        embedding = _fuzzy_cached_embedding(text, model, simhash)
+        if embedding is not None:
+            vectors[text] = embedding
+            reused.append((keys[text], model, len(embedding), embedding.astype(np.float16).tobytes(), simhash, text))
+    
+    # Near-duplicate hits are stored under their exact keys so the next lookup is an exact hit
+    if reused:
+        _embedding_db().add_cached_embeddings(reused)
+    return keys, vectors
+
+def _store_embed_response(response: Any, texts: List[str], keys: Dict[str, bytes], model: str) -> Dict[str, np.ndarray]:
+    """Parse an /api/embed response for texts and add the vectors to the embedding cache"""
+    import numpy as np
+    
+    if response.status_code != 200:
+        raise EmbeddingError(response.text, response.status_code)
+    _batch_succeeded(len(texts))
+    
+    # orjson parses the long float arrays several times faster than the standard library
+    embeddings = np.asarray(orjson.loads(response.content)["embeddings"], dtype=np.float32)
+    _embedding_db().add_cached_embeddings([
+        (keys[text], model, embedding.shape[0], embedding.astype(np.float16).tobytes(), _simhash(text), text)
+        for text, embedding in zip(texts, embeddings)
+    ])
+    return dict(zip(texts, embeddings))
+
+# Batch size Ollama is known to accept; shrinks when a batch is rejected as too large, so later calls
+# do not fail first, and grows back toward OLLAMA_BATCH_SIZE after _BATCH_GROW_AFTER full batches succeed
+_embed_batch_size = OLLAMA_BATCH_SIZE
+_embed_batch_successes = 0
+_embed_batch_lock = threading.Lock()
+_BATCH_GROW_AFTER = 16
+
+def _embedding_sub_batches(texts: List[str]) -> List[List[str]]:
+    """Split uncached texts into the sub-batches sent as separate /api/embed requests"""
+    with _embed_batch_lock:
+        size = _embed_batch_size
+    return [texts[start:start + size] for start in range(0, len(texts), size)]
+
+def _batch_succeeded(size: int) -> None:
+    """Count an accepted batch, doubling the batch size once enough full batches succeed"""
+    global _embed_batch_size, _embed_batch_successes
+    with _embed_batch_lock:
+        # Partial batches say nothing about whether the current size still fits
+        if size < _embed_batch_size or _embed_batch_size >= OLLAMA_BATCH_SIZE:
+            return
+        _embed_batch_successes += 1
+        if _embed_batch_successes >= _BATCH_GROW_AFTER:
+            _embed_batch_size = min(_embed_batch_size * 2, OLLAMA_BATCH_SIZE)
+            _embed_batch_successes = 0
+
+def _batch_rejected(size: int) -> None:
+    """Lower the batch size below a batch that was rejected as too large"""
+    global _embed_batch_size, _embed_batch_successes
+    with _embed_batch_lock:
+        if size <= _embed_batch_size:
+            _embed_batch_size = max((size + 1) // 2, 1)
+            _embed_batch_successes = 0
+
+def _batch_too_large(error: Exception) -> bool:
+    """Whether an embedding request failed because its batch was too large"""
+    if not isinstance(error, EmbeddingError):
+        return False
+    message = str(error).lower()
+    return error.status_code == 413 or any(marker in message for marker in _BATCH_TOO_LARGE_MARKERS)
+
+def _split_batch(error: Exception, texts: List[str]) -> Optional[Tuple[List[str], List[str]]]:
+    """
+    Halve a batch that failed for being too large, and lower the batch size of later calls
+    
+    Returns:
+        The two halves to retry, or None if the error is not about the batch size
+    """
+    if len(texts) < 2 or not _batch_too_large(error):
+        return None
+    
+    half = (len(texts) + 1) // 2
+    logger.warning(f"Embedding batch of {len(texts)} rejected with status {error.status_code}, retrying as batches of {half}")
+    _batch_rejected(len(texts))
+    return texts[:half], texts[half:]
+
+# Threads sending sub-batch requests; the work is waiting on Ollama, so the GIL is not a limit
+_embed_executor = ThreadPoolExecutor(max_workers=OLLAMA_CONCURRENCY, thread_name_prefix="embed")
+
+def _request_embeddings(texts: List[str], keys: Dict[str, bytes], model: str) -> Dict[str, Optional[np.ndarray]]:
+    """Embed uncached texts with one /api/embed request, split in half if too large, one by one if that fails"""
+    import numpy as np
+    
+    try:
+        # /api/embed accepts a list of inputs, so the texts share one round-trip
+        response = _http_session().post(
+            f"{OLLAMA_API_BASE}/api/embed",
+            data=orjson.dumps({"model": model, "input": texts}),
+            headers=_JSON_HEADERS,
+            timeout=OLLAMA_TIMEOUT
+        )
+        return _store_embed_response(response, texts, keys, model)
+    except Exception as e:
+        halves = _split_batch(e, texts)
+        if halves:
+            vectors = _request_embeddings(halves[0], keys, model)
+            vectors.update(_request_embeddings(halves[1], keys, model))
+            return vectors
         
-        # Call Ollama API to generate embeddings
-        response = requests.post(
-            f"{OLLAMA_API_BASE}/api/embeddings",
-            json={"model": model, "prompt": text}
+        logger.error(f"Batch embedding failed, embedding texts one by one: {str(e)}")
+        vectors = {}
+        for text in texts:
+            embedding = generate_embedding(text, model)
+            vectors[text] = None if embedding is None else np.asarray(embedding, dtype=np.float32)
+        return vectors
+
+def _embedding_vectors(texts: List[str], model: str) -> List[Optional[np.ndarray]]:
+    """Embed several texts with one cache query and one API request per OLLAMA_BATCH_SIZE misses, sent concurrently"""
+    # Long texts are embedded as their chunks, each cached on its own, so every chunk shares the batched requests
+    chunked = [_embedding_chunks(_prepare_embedding_text(text)) for text in texts]
+    keys, vectors = _lookup_embeddings([chunk for chunks in chunked for chunk in chunks], model)
+    
+    sub_batches = _embedding_sub_batches([text for text in keys if text not in vectors])
+    if len(sub_batches) == 1:
+        vectors.update(_request_embeddings(sub_batches[0], keys, model))
+    elif sub_batches:
+        for sub_vectors in _embed_executor.map(lambda batch: _request_embeddings(batch, keys, model), sub_batches):
+            vectors.update(sub_vectors)
+    
+    return [_mean_embedding([vectors[chunk] for chunk in chunks]) for chunks in chunked]
+
+_async_http: Optional[Tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]] = None
+
+def _async_client() -> httpx.AsyncClient:
+    """Keep-alive HTTP client for Ollama, shared by all coroutines on the running event loop"""
+    import httpx
+    
+    global _async_http
+    loop = asyncio.get_running_loop()
+    # Clients cannot be shared across event loops, so a new loop gets its own
+    if _async_http is None or _async_http[0] is not loop:
+        limits = httpx.Limits(
+            max_connections=OLLAMA_MAX_CONNECTIONS,
+            max_keepalive_connections=OLLAMA_MAX_CONNECTIONS,
+            keepalive_expiry=OLLAMA_KEEPALIVE_EXPIRY
+        )
+        client = httpx.AsyncClient(
+            transport=httpx.AsyncHTTPTransport(limits=limits, retries=OLLAMA_CONNECT_RETRIES),
+            timeout=httpx.Timeout(OLLAMA_TIMEOUT)
         )
+        _async_http = (loop, client)
+    return _async_http[1]
+
+async def close_http_clients() -> None:
+    """Close the shared Ollama HTTP clients; call once on application shutdown"""
+    global _async_http
+    if _http_session.cache_info().currsize:
+        _http_session().close()
+    if _async_http is not None and _async_http[0] is asyncio.get_running_loop():
+        await _async_http[1].aclose()
+    _async_http = None
+
+async def _aembedding_vectors(texts: List[str], model: str) -> List[Optional[np.ndarray]]:
+    """Async variant of _embedding_vectors that awaits the API request instead of blocking"""
+    import numpy as np
+    
+    chunked = [_embedding_chunks(_prepare_embedding_text(text)) for text in texts]
+    # The cache lookup reads SQLite and may write near-duplicate hits, so it runs off the event loop
+    keys, vectors = await asyncio.to_thread(
+        _lookup_embeddings, [chunk for chunks in chunked for chunk in chunks], model
+    )
+    
+    # Bound the sub-batch requests in flight, as the thread pool does for the blocking variant
+    semaphore = asyncio.Semaphore(OLLAMA_CONCURRENCY)
+    
+    async def embed_batch(batch: List[str]) -> Dict[str, Optional[np.ndarray]]:
+        try:
+            response = await _async_client().post(
+                f"{OLLAMA_API_BASE}/api/embed",
+                content=orjson.dumps({"model": model, "input": batch}),
+                headers=_JSON_HEADERS
+            )
+            return _store_embed_response(response, batch, keys, model)
+        except Exception as e:
+            # The halves are sent one after the other under the caller's semaphore slot
+            halves = _split_batch(e, batch)
+            if halves:
+                sub_vectors = await embed_batch(halves[0])
+                sub_vectors.update(await embed_batch(halves[1]))
+                return sub_vectors
+            
+            logger.error(f"Batch embedding failed, embedding texts one by one: {str(e)}")
+            sub_vectors = {}
+            for text in batch:
+                embedding = await asyncio.to_thread(generate_embedding, text, model)
+                sub_vectors[text] = None if embedding is None else np.asarray(embedding, dtype=np.float32)
+            return sub_vectors
+    
+    async def request_embeddings(batch: List[str]) -> Dict[str, Optional[np.ndarray]]:
+        async with semaphore:
+            return await embed_batch(batch)
+    
+    sub_batches = _embedding_sub_batches([text for text in keys if text not in vectors])
+    for sub_vectors in await asyncio.gather(*[request_embeddings(batch) for batch in sub_batches]):
+        vectors.update(sub_vectors)
+    
+    return [_mean_embedding([vectors[chunk] for chunk in chunks]) for chunks in chunked]
+
+async def agenerate_embedding(text: str, model: str = EMBEDDING_MODEL) -> Union[List[float], None]:
+    """Async variant of generate_embedding, sharing one keep-alive connection pool to Ollama"""
+    return (await agenerate_embeddings_batch([text], model))[0]
+
+async def agenerate_embeddings_batch(texts: List[str], model: str = EMBEDDING_MODEL) -> List[Union[List[float], None]]:
+    """Async variant of generate_embeddings_batch"""
+    return [
+        None if vector is None else vector.tolist()
+        for vector in await _aembedding_vectors(texts, model)
+    ]
+
+def generate_embeddings_batch(texts: List[str], model: str = EMBEDDING_MODEL) -> List[Union[List[float], None]]:
+    """
+    Generate embeddings for several texts with batched Ollama requests
+    
+    Duplicate and already-cached texts are filtered out first; only the remaining
+    texts are sent to the API, OLLAMA_BATCH_SIZE per request with up to
+    OLLAMA_CONCURRENCY requests in flight.
+    
+    Args:
+        texts: Texts to embed
+        model: Embedding model to use (default: nomic-embed-text)
         
-        if response.status_code != 200:
-            logger.error(f"Failed to generate embedding: {response.text}")
-            return None
+    Returns:
+        One embedding (or None on error) per text, in the same order as the input
+    """
+    return [
+        None if vector is None else vector.tolist()
+        for vector in _embedding_vectors(texts, model)
+    ]
+
+def generate_embedding_matrix(texts: List[str], model: str = EMBEDDING_MODEL) -> np.ndarray:
+    """
+    Generate L2-normalized embeddings for several texts as one matrix
+    
+    Args:
+        texts: Texts to embed
+        model: Embedding model to use (default: nomic-embed-text)
         
-        embedding = response.json().get("embedding")
-        return embedding
+    Returns:
+        float32 array of shape (len(texts), dim); rows of texts that failed to embed are all zeros
+    """
+    import numpy as np
     
-    except Exception as e:
-        logger.error(f"Error generating embedding: {str(e)}")
+    embeddings = _embedding_vectors(texts, model)
+    dim = next((len(embedding) for embedding in embeddings if embedding is not None), 0)
+    
+    matrix = np.zeros((len(texts), dim), dtype=np.float32)
+    for i, embedding in enumerate(embeddings):
+        if embedding is not None:
+            matrix[i] = embedding
+    
+    # Normalize once so cosine similarity reduces to a dot product
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+def quantize_int8(vector: np.ndarray) -> Tuple[bytes, float]:
+    """
+    Quantize a vector to int8 with a per-vector scale
+    
+    Args:
+        vector: Vector to quantize
+        
+    Returns:
+        Tuple of (int8 bytes, scale); vector ≈ int8 values * scale
+    """
+    import numpy as np
+    
+    vector = np.asarray(vector, dtype=np.float32)
+    scale = float(np.abs(vector).max(initial=0.0)) / 127
+    if scale == 0:
+        return np.zeros(vector.shape, dtype=np.int8).tobytes(), 0.0
+    return np.round(vector / scale).astype(np.int8).tobytes(), scale
+
+def mean_cosine_similarity(query: Any, corpus_mean_normed: np.ndarray) -> float:
+    """
+    Mean cosine similarity of a vector to every vector of a corpus, in O(dim)
+    
+    The mean of cosines equals the cosine numerator against the mean of the normalized
+    corpus vectors, so the per-vector dot products collapse into one.
+    
+    Args:
+        query: Vector to compare
+        corpus_mean_normed: Mean of the corpus vectors, each L2-normalized first
         
-        # Fallback to use mock embeddings for demo or testing
-        # In a real application, you would handle this error differently
-        logger.warning("Using fallback random embedding (this is only for demonstration)")
-        import numpy as np
-        return list(np.random.normal(0, 1, 768))  # Mock 768-dim embedding
+    Returns:
+        Mean cosine similarity between -1 and 1; 0 for a zero query
+    """
+    import numpy as np
+    
+    query = np.asarray(query, dtype=np.float32)
+    norm = np.linalg.norm(query)
+    if norm == 0:
+        return 0.0
+    return float(query @ corpus_mean_normed) / float(norm)
+
+# Per-thread float32 buffers reused by cosine_similarity; calls come from many worker threads, so they are not shared
+_scratch = threading.local()
+
+def _scratch_pair(dim: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Two float32 views of length dim on this thread's scratch buffer, grown when a longer vector arrives"""
+    import numpy as np
+    
+    buffer = getattr(_scratch, "buffer", None)
+    if buffer is None or buffer.shape[1] < dim:
+        buffer = _scratch.buffer = np.empty((2, max(dim, 768)), dtype=np.float32)
+    return buffer[0, :dim], buffer[1, :dim]
 
 def cosine_similarity(vec1: List[float], vec2: List[float]) -> float:
     """
@@ -202,21 +854,23 @@ def cosine_similarity(vec1: List[float], vec2: List[float]) -> float:
     Returns:
         Cosine similarity score between 0 and 1
     """
+    import numpy as np
+    
     try:
-        # Convert to numpy arrays for efficient computation
-        v1 = np.array(vec1)
-        v2 = np.array(vec2)
+        # copyto would broadcast a length-1 vector, so unequal lengths are rejected first
+        if len(vec1) != len(vec2):
+            raise ValueError(f"vectors have different lengths: {len(vec1)} and {len(vec2)}")
         
-        # Calculate cosine similarity
-        dot_product = np.dot(v1, v2)
-        norm_v1 = np.linalg.norm(v1)
-        norm_v2 = np.linalg.norm(v2)
+        # Copy into reused buffers instead of allocating two arrays per call
+        a, b = _scratch_pair(len(vec1))
+        np.copyto(a, vec1)
+        np.copyto(b, vec2)
         
-        # Handle zero division
-        if norm_v1 == 0 or norm_v2 == 0:
+        denominator = float(np.sqrt(np.dot(a, a) * np.dot(b, b)))
+        # A zero vector has similarity 0 instead of dividing by zero
+        if denominator == 0.0:
             return 0.0
-            
-        similarity = dot_product / (norm_v1 * norm_v2)
+        similarity = float(np.dot(a, b)) / denominator
         
         # Ensure result is between 0 and 1
         return max(0.0, min(1.0, similarity))
@@ -248,14 +902,16 @@ def combine_text_for_matching(job_summary_dict: Dict[str, Any], candidate_profil
     RESPONSIBILITIES: {', '.join(job_summary_dict.get('responsibilities', []))}
     """
     
-    # Format candidate information
-    education_text = ""
-    for edu in candidate_profile_dict.get('education', []):
-        education_text += f"{edu.get('degree', '')} in {edu.get('field', '')} from {edu.get('institution', '')}, "
+    # Format candidate information, joining the entries once instead of growing a string per entry
+    education_text = ", ".join(
+        f"{edu.get('degree', '')} in {edu.get('field', '')} from {edu.get('institution', '')}"
+        for edu in candidate_profile_dict.get('education', [])
+    )
     
-    work_exp_text = ""
-    for exp in candidate_profile_dict.get('work_experience', []):
-        work_exp_text += f"{exp.get('role', '')} at {exp.get('company', '')} for {exp.get('years', '')}, "
+    work_exp_text = ", ".join(
+        f"{exp.get('role', '')} at {exp.get('company', '')} for {exp.get('years', '')}"
+        for exp in candidate_profile_dict.get('work_experience', [])
+    )
     
     candidate_text = f"""
     CANDIDATE: {candidate_profile_dict.get('name', '')}
@@ -265,4 +921,4 @@ def combine_text_for_matching(job_summary_dict: Dict[str, Any], candidate_profil
     CERTIFICATIONS: {', '.join(candidate_profile_dict.get('certifications', []))}
     """
     
-    return job_text + candidate_text 
\ No newline at end of file
+    return job_text + candidate_text 